@@ -1,11 +1,20 @@
 from .core import global_symbols
 from .actions import Action, Ac, actions, global_actions
-from .domination import strictly_dominates, is_strictly_dominated, weakly_dominates, is_weakly_dominated, trust_based_reduced_tree, tbrt
+from .anonymous import AnonymousGame
+from .batch import evaluate, ResponsibilityTable, RespTable
+from .compiled import CompiledTree
+from .context import EvaluationContext
+from .domination import strictly_dominates, is_strictly_dominated, weakly_dominates, is_weakly_dominated, domination_matrices, trust_based_reduced_tree, tbrt, trust_based_reduced_mask
 from .functions import Function, Fct, AggregationFunction, AggF, ResponsibilityFunction, RespF, PointwiseResponsibilityFunction, PRF, BackwardResponsibilityFunction, BRF, ForwardResponsibilityFunction, FRF
 from .nodes import Node, InnerNode, LeafNode, PossibilityNode, PoN, ProbabilityNode, PrN, DecisionNode, DeN, OutcomeNode, OuN, InformationSet, InS, information_sets, inss, global_information_sets, global_inss
 from .outcomes import Outcome, Ou, outcomes, global_outcomes
+from .index import TreeIndex
+from .implicit import ImplicitTree
+from .parallel import evaluate_parallel, evaluate_trees
 from .players import Player, Pl, Group, Gr, players, global_players
 from .random import *
+from .repeated import RepeatedGame
 from .simultaneous import make_simultaneous_move
-from .solutions import PartialSolution, Scenario, Scen, Strategy, Strat
+from .solutions import PartialSolution, Scenario, Scen, Strategy, Strat, CompactSolution, CompactScenario, CompactStrategy, Constraint
 from .trees import Branch, Tree
+from .views import TreeView
@@ -0,0 +1,236 @@
+import itertools
+
+from .core import _AbstractObject
+from .players import Player, _get_group
+from .actions import Action
+from .outcomes import Outcome
+from . import nodes as nd
+from .simultaneous import make_simultaneous_move
+
+"""
+Symmetry-reduced evaluation of anonymous games, in which several players
+simultaneously choose from the same actions and the outcome only depends on
+how many players take each action, as in threshold public good games.
+
+Such a game corresponds to the tree generated by make_simultaneous_move, in
+which the players decide one after another in the given order, each without
+knowing the others' actions, i.e., each player's information set contains all
+nodes at the player's position. Since all quantities at a node only depend on
+the position and on the counts of the actions taken so far (a tuple with one
+entry per action), they are computed over such counts instead of over
+individual action profiles. With two actions, there are only n+1 counts
+instead of 2^n profiles, so games with hundreds of players can be analysed.
+
+All choices are made by players, so there are no possibility nodes, and
+scenarios consist of the choices of players outside the group.
+"""
+
+
+class AnonymousGame (_AbstractObject):
+    """An anonymous simultaneous move (see above).
+    @param players: list of Players, in the order in which the equivalent
+           tree lets them decide
+    @param actions: list of Actions available to every player
+    @param outcome: function mapping a tuple of counts (the numbers of players
+           taking each action, in the order of actions) to an Outcome
+    """
+
+    _i_players = None
+    @property
+    def players(self):
+        """list of Players"""
+        return self._i_players
+
+    _i_actions = None
+    @property
+    def actions(self):
+        """list of Actions"""
+        return self._i_actions
+
+    _i_outcome = None
+    @property
+    def outcome(self):
+        """function mapping a tuple of counts to an Outcome"""
+        return self._i_outcome
+
+    def validate(self):
+        self._i_players = list(self.players)
+        self._i_actions = list(self.actions)
+        assert len(self.players) > 0, "players must not be empty"
+        for pl in self.players:
+            assert isinstance(pl, Player)
+        assert len(set(self.players)) == len(self.players), "players must be distinct"
+        assert len(self.actions) > 0, "actions must not be empty"
+        for a in self.actions:
+            assert isinstance(a, Action)
+        assert callable(self.outcome), "outcome must be a function of counts"
+        self._a_position = {pl: p for p, pl in enumerate(self.players)}
+        self._a_badness = {}
+        self._a_counts = {}
+        self._a_min_badness = {}
+
+    def to_tree(self, name=None):
+        """Return the equivalent Tree (with 2^n leaves for two actions!),
+        e.g. to check results on small games"""
+        consequences = {}
+        for profile in itertools.product(self.actions, repeat=len(self.players)):
+            counts = tuple(profile.count(b) for b in self.actions)
+            consequences[profile] = nd.OutcomeNode("", ou=self.outcome(counts))
+        root = make_simultaneous_move(name or self.name, players=self.players,
+                                      consequences=consequences)
+        from .trees import Tree
+        return Tree(name or self.name, ro=root)
+
+    # helpers working on counts:
+
+    def _badness(self, counts):
+        """helper method: 1 if the outcome is unacceptable, else 0"""
+        value = self._a_badness.get(counts)
+        if value is None:
+            ou = self.outcome(counts)
+            assert isinstance(ou, Outcome)
+            value = self._a_badness[counts] = 0 if ou.is_acceptable else 1
+        return value
+
+    def _get_counts(self, total):
+        """helper method: list of all tuples of counts adding up to total"""
+        if total not in self._a_counts:
+            self._a_counts[total] = self._get_counts_of(total, len(self.actions))
+        return self._a_counts[total]
+
+    def _get_counts_of(self, total, m):
+        """helper method"""
+        if m == 1:
+            return [(total,)]
+        return [(first,) + rest for first in range(total + 1)
+                for rest in self._get_counts_of(total - first, m - 1)]
+
+    def _add(self, counts, more):
+        """helper method"""
+        return tuple(c + d for c, d in zip(counts, more))
+
+    def _unit(self, action):
+        """helper method: counts of a single action"""
+        return tuple(int(b == action) for b in self.actions)
+
+    def _min_badness(self, counts, n_free):
+        """helper method: minimal badness over all choices of n_free further
+        players, given the counts of the others' actions (memoized)"""
+        key = (counts, n_free)
+        value = self._a_min_badness.get(key)
+        if value is None:
+            value = self._a_min_badness[key] = min(
+                self._badness(self._add(counts, more)) for more in self._get_counts(n_free))
+        return value
+
+    def _get_position(self, player):
+        """helper method"""
+        assert player in self._a_position, "player must be one of the players"
+        return self._a_position[player]
+
+    def _get_node_counts(self, position, counts):
+        """helper method: the given counts, or all possible counts at position"""
+        if counts is not None:
+            counts = tuple(counts)
+            assert len(counts) == len(self.actions) and sum(counts) == position, \
+                "counts must be tuple of counts of the previous players' actions"
+            return [counts]
+        return self._get_counts(position)
+
+    # components of responsibility functions (see Branch), where a node is
+    # given by the deciding player and the counts of the previous players'
+    # actions, and None for these counts means the player's information set:
+
+    def get_guaranteed_likelihood(self, player=None, group=None, counts=None):
+        """Guaranteed likelihood of an unacceptable outcome (gamma, see Branch)
+        at the node of player after counts"""
+        group = _get_group(group=group)
+        p = self._get_position(player)
+        if counts is None:
+            assert group is not None and player in group, "counts required unless player is in group"
+        return min(self._min_badness(c, len(self.players) - p)
+                   for c in self._get_node_counts(p, counts))
+
+    gamma = get_guaranteed_likelihood
+
+    def _omega(self, position, counts, scenario):
+        """helper method: omega at a node at position (which may be 
+        len(players) for the leaves) after counts, ignoring the choices of 
+        previous players in scenario"""
+        n_free = len(self.players) - position
+        for pl, a in scenario.items():
+            if self._get_position(pl) >= position:
+                counts = self._add(counts, self._unit(a))
+                n_free -= 1
+        return self._min_badness(counts, n_free)
+
+    def get_optimal_avoidance_likelihood(self, player=None, counts=None, scenario=None):
+        """Minimal likelihood achievable given a scenario (omega, see Branch)
+        at the node of player after counts
+        @param scenario: dict of Action keyed by Player, fixing the choices of
+               some of the players from player on"""
+        p = self._get_position(player)
+        c, = self._get_node_counts(p, counts)
+        return self._omega(p, c, scenario or {})
+
+    omega = get_optimal_avoidance_likelihood
+
+    def Delta_omega(self, player=None, counts=None, scenario=None, action=None):
+        """Shortfall in minimizing likelihood due to taking action (see Branch)"""
+        p = self._get_position(player)
+        c, = self._get_node_counts(p, counts)
+        scenario = scenario or {}
+        return (self._omega(p + 1, self._add(c, self._unit(action)), scenario)
+                - self._omega(p, c, scenario))
+
+    def rho(self, group=None, player=None, action=None, counts=None):
+        """Risk taken by taking action at the node of player after counts
+        (see Branch), maximized over the information set if counts is None"""
+        group = _get_group(group=group)
+        assert group is not None
+        p = self._get_position(player)
+        if counts is None:
+            assert player in group, "counts required unless player is in group"
+        later = self.players[p + 1:]
+        n_group = sum(1 for pl in later if pl in group)
+        n_others = len(later) - n_group
+        values = [0]
+        for c in self._get_node_counts(p, counts):
+            # the choices of later players outside group form the scenario,
+            # only whose counts matter:
+            for s in self._get_counts(n_others):
+                cs = self._add(c, s)
+                after = self._min_badness(self._add(cs, self._unit(action)), n_group)
+                for b in self.actions:
+                    if b != action:
+                        values.append(after - self._min_badness(self._add(cs, self._unit(b)), n_group))
+        return max(values)
+
+    def rho_min(self, group=None, player=None, counts=None):
+        """Minimal risk (see Branch)"""
+        return min(self.rho(group=group, player=player, action=a, counts=counts) for a in self.actions)
+
+    def cooperatively_achievable_likelihood(self, player=None, counts=None, fixed_action=None):
+        """Likelihood of an unacceptable outcome at the node of player after
+        counts, minimized over all players' strategies in which player takes
+        the optional fixed_action (see Branch)"""
+        p = self._get_position(player)
+        c, = self._get_node_counts(p, counts)
+        if fixed_action is None:
+            return self._min_badness(c, len(self.players) - p)
+        return self._min_badness(self._add(c, self._unit(fixed_action)), len(self.players) - p - 1)
+
+    def cooperatively_achievable_worst_case_likelihood(self, player=None, fixed_action=None):
+        """Minimum over all players' strategies in which player takes the
+        optional fixed_action of the worst-case likelihood over the player's
+        information set (see Branch). Since each later player has a single
+        information set, a strategy fixes the counts of their actions."""
+        p = self._get_position(player)
+        fixed = self.actions if fixed_action is None else [fixed_action]
+        return min(max(self._badness(self._add(self._add(c, self._unit(a)), t))
+                       for c in self._get_counts(p))
+                   for a in fixed for t in self._get_counts(len(self.players) - p - 1))
+
+    def __repr__(self):
+        return ("AnonymousGame(" + self.name + ", " + str(len(self.players)) + " players, "
+                + str(len(self.actions)) + " actions)")
@@ -0,0 +1,131 @@
+import numpy as np
+import sympy as sp
+
+from .core import _AbstractObject
+from .players import Group, _get_group
+from .functions import PRF
+from .context import EvaluationContext
+from . import nodes as nd
+
+
+class ResponsibilityTable (_AbstractObject):
+    """Table of values of several PointwiseResponsibilityFunctions, as returned
+    by evaluate().
+    @param prfs: list of PRFs, one per column
+    @param rows: list of (group, node, action) triples, one per row
+    @param values: 2d array of values indexed by row and column (dtype float,
+           or object if some values are sympy expressions)
+    """
+
+    _i_prfs = None
+    @property
+    def prfs(self):
+        """list of PRFs, one per column"""
+        return self._i_prfs
+
+    _i_rows = None
+    @property
+    def rows(self):
+        """list of (group, node, action) triples, one per row"""
+        return self._i_rows
+
+    _i_values = None
+    @property
+    def values(self):
+        """2d array of values indexed by row and column"""
+        return self._i_values
+
+    def validate(self):
+        assert self.values.shape == (len(self.rows), len(self.prfs))
+        self._a_row_index = {(G.players, v, a): r for r, (G, v, a) in enumerate(self.rows)}
+
+    def get(self, prf=None, group=None, node=None, action=None):
+        """Return the value of prf for group at node when taking action"""
+        return self.values[self._a_row_index[(group.players, node, action)],
+                           self.prfs.index(prf)]
+
+    def column(self, prf):
+        """Return the vector of values of prf, in the order of rows"""
+        return self.values[:, self.prfs.index(prf)]
+
+    def to_records(self):
+        """Return the table as a list of dicts, one per row, with keys
+        "group", "node", "action", and the PRFs' names"""
+        return [{"group": G, "node": v, "action": a,
+                 **{prf.name: self.values[r, c] for c, prf in enumerate(self.prfs)}}
+                for r, (G, v, a) in enumerate(self.rows)]
+
+    def __repr__(self):
+        lines = ["\t".join(["group", "node", "action"] + [prf.name for prf in self.prfs])]
+        for r, (G, v, a) in enumerate(self.rows):
+            lines.append("\t".join([repr(G), repr(v), repr(a)]
+                                   + [str(x) for x in self.values[r]]))
+        return "\n".join(lines)
+
+RespTable = ResponsibilityTable
+"""Abbreviation for ResponsibilityTable"""
+
+
+def evaluate(tree, prfs, groups=None, nodes=None):
+    """Evaluate several PointwiseResponsibilityFunctions for all combinations of
+    groups, decision nodes, and actions at once.
+    @param tree: the Tree (or an EvaluationContext wrapping it)
+    @param prfs: iterable of PRFs
+    @param groups: optional iterable of Groups (or sets of players). For each
+           node, all groups containing the node's player are used. If None,
+           the singleton group of the node's player is used.
+    @param nodes: optional iterable of DecisionNodes (default: all)
+    @return: ResponsibilityTable
+
+    Arguments are validated once rather than in each PRF call, rows are
+    processed information set by information set, and all PRFs share one
+    EvaluationContext so that they reuse each other's intermediate results.
+    See also parallel.evaluate_parallel.
+    """
+    ctx = _get_context(tree)
+    prfs = _get_prfs(prfs)
+    rows = _schedule(ctx, groups=groups, nodes=nodes)
+    return _make_table(ctx, prfs, rows, _evaluate_rows(ctx, prfs, rows))
+
+def _get_context(tree):
+    """helper function"""
+    return tree if isinstance(tree, EvaluationContext) else EvaluationContext("ctx", tree=tree)
+
+def _get_prfs(prfs):
+    """helper function"""
+    prfs = list(prfs)
+    for prf in prfs:
+        assert isinstance(prf, PRF)
+    return prfs
+
+def _schedule(ctx, groups=None, nodes=None):
+    """Validate arguments and return the list of rows grouped by information set,
+    each row being a (group, node, action) triple"""
+    index = ctx.tree_index
+    nodes = list(ctx.get_decision_nodes()) if nodes is None else list(nodes)
+    for v in nodes:
+        assert isinstance(v, nd.DecisionNode) and v in index, "nodes must be decision nodes of the tree"
+    if groups is not None:
+        groups = [_get_group(group=G) for G in groups]
+    by_ins = {}
+    for v in nodes:
+        by_ins.setdefault(v.information_set, []).append(v)
+    rows = []
+    for ins, vs in by_ins.items():
+        Gs = ([Group("", players={ins.player})] if groups is None
+              else [G for G in groups if ins.player in G])
+        for G in Gs:
+            for v in vs:
+                for a in sorted(v.actions, key=lambda a: a.name):
+                    rows.append((G, v, a))
+    return rows
+
+def _evaluate_rows(ctx, prfs, rows):
+    """Return a list of lists of values, one list per row"""
+    return [[prf._i_function(ctx, G, v, a) for prf in prfs] for (G, v, a) in rows]
+
+def _make_table(ctx, prfs, rows, values):
+    """helper function"""
+    is_symbolic = any(isinstance(x, sp.Expr) and not x.is_number for row in values for x in row)
+    values = np.array(values, dtype=object if is_symbolic else np.float64).reshape((len(rows), len(prfs)))
+    return ResponsibilityTable("evaluation_of_" + ctx.tree.name, prfs=prfs, rows=rows, values=values)
@@ -0,0 +1,570 @@
+import itertools
+import numpy as np
+import sympy as sp
+
+from . import core
+from .core import _AbstractObject, Min, Max
+from . import nodes as nd
+
+"""
+Flat, array-based representation of a Branch for fast evaluation.
+
+Nodes are numbered in preorder, successors are stored in compressed sparse row
+(CSR) form: the edges of node k are offsets[k]...offsets[k+1]-1, edge e leads
+to node targets[e]. At decision nodes, the edges are ordered like the actions of
+the node's information set, so that the edge position equals the action index.
+
+Batches of partial solutions (scenarios, strategies, or combinations thereof)
+can be encoded as integer matrices of "choice codes" with one row per partial 
+solution and one column per information set, followed by one column per 
+possibility node (see encode()). An entry is the chosen action or 
+edge position, or -1 if unresolved. evaluate_batch() then evaluates all rows
+at once, visiting only the nodes reachable under each row's choices.
+"""
+
+# node type codes:
+OUTCOME = 0
+PROBABILITY = 1
+POSSIBILITY = 2
+DECISION = 3
+
+
+class CompiledTree (_AbstractObject):
+    """Compact NumPy-backed snapshot of a Branch, produced by Branch.compile().
+    @param branch: the Branch to compile
+
+    The snapshot reflects the branch at the time of compilation. Once the 
+    branch was changed (see core.register_mutation), is_stale is True and 
+    Branch.compile() compiles the branch anew.
+    @param share_subtrees: whether to identify structurally identical subtrees
+           by hashing, so that backward() evaluates each of them only once, as 
+           on a DAG with shared nodes (default: False)
+    """
+
+    _i_branch = None
+    @property
+    def branch(self):
+        """the compiled Branch"""
+        return self._i_branch
+
+    _i_share_subtrees = False
+    @property
+    def share_subtrees(self):
+        """bool"""
+        return self._i_share_subtrees
+
+    def __init__(self, name, **kwargs):
+        super(CompiledTree, self).__init__(name, **kwargs)
+        self._compile()
+
+    def validate(self):
+        assert self.branch is not None, "must specify a branch"
+
+    def _compile(self):
+        """number nodes in preorder and fill all arrays"""
+        self.generation = core.mutation_generation
+        """value of core.mutation_generation at compilation time"""
+        # preorder traversal without recursion:
+        nodes = []
+        stack = [self.branch.root]
+        while stack:
+            v = stack.pop()
+            nodes.append(v)
+            if isinstance(v, nd.InnerNode):
+                stack.extend(reversed(self._ordered_successors(v)))
+        self.nodes = nodes
+        """list of Nodes in preorder"""
+        self.index = index = {v: k for k, v in enumerate(nodes)}
+        """dict of node number keyed by Node"""
+        n = len(nodes)
+        self.node_type = node_type = np.zeros(n, dtype=np.int8)
+        self.parent = parent = np.full(n, -1, dtype=np.int64)
+        self.depth = depth = np.zeros(n, dtype=np.int64)
+        self.information_set_id = ins_id = np.full(n, -1, dtype=np.int64)
+        self.player_id = player_id = np.full(n, -1, dtype=np.int64)
+        self.outcome_id = outcome_id = np.full(n, -1, dtype=np.int64)
+        self.information_sets = []
+        """list of InformationSets, numbered in order of first occurrence"""
+        self.actions = []
+        """list of action lists, one per information set, in edge order"""
+        self.players = []
+        self.outcomes = []
+        ins_index, player_index, outcome_index = {}, {}, {}
+        offsets = [0]
+        targets = []
+        probabilities = []
+        self.is_symbolic = False
+        """whether some probabilities are sympy expressions"""
+        for k, v in enumerate(nodes):
+            if isinstance(v, nd.OutcomeNode):
+                node_type[k] = OUTCOME
+                if v.outcome not in outcome_index:
+                    outcome_index[v.outcome] = len(self.outcomes)
+                    self.outcomes.append(v.outcome)
+                outcome_id[k] = outcome_index[v.outcome]
+            elif isinstance(v, nd.ProbabilityNode):
+                node_type[k] = PROBABILITY
+            elif isinstance(v, nd.DecisionNode):
+                node_type[k] = DECISION
+                ins = v.information_set
+                if ins not in ins_index:
+                    ins_index[ins] = len(self.information_sets)
+                    self.information_sets.append(ins)
+                    self.actions.append(self._ordered_actions(ins))
+                ins_id[k] = ins_index[ins]
+                if v.player not in player_index:
+                    player_index[v.player] = len(self.players)
+                    self.players.append(v.player)
+                player_id[k] = player_index[v.player]
+            else:
+                node_type[k] = POSSIBILITY
+            if isinstance(v, nd.InnerNode):
+                for w in self._ordered_successors(v):
+                    c = index[w]
+                    parent[c] = k
+                    depth[c] = depth[k] + 1
+                    targets.append(c)
+                    p = self.branch.get_probabilities(v)[w] if node_type[k] == PROBABILITY else 0
+                    if isinstance(p, sp.Expr):
+                        self.is_symbolic = True
+                    probabilities.append(p)
+            offsets.append(len(targets))
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.targets = np.array(targets, dtype=np.int64)
+        self.probabilities = np.array(probabilities,
+                                      dtype=object if self.is_symbolic else np.float64)
+        """edge probabilities (zero at edges not leaving a ProbabilityNode)"""
+        self.information_set_index = ins_index
+        self.player_index = player_index
+        self.outcome_index = outcome_index
+        self.possibility_nodes = np.flatnonzero(node_type == POSSIBILITY)
+        """node numbers of possibility nodes, whose choice codes follow those 
+        of the information sets"""
+        self.code_column = np.full(n, -1, dtype=np.int64)
+        """choice code column of each possibility node (else -1)"""
+        self.code_column[self.possibility_nodes] = len(self.information_sets) + np.arange(len(self.possibility_nodes))
+        self._code_lookup = {ins: (i, {a: pos for pos, a in enumerate(self.actions[i])})
+                             for i, ins in enumerate(self.information_sets)}
+        """dict of (column, dict of code keyed by action or successor) 
+        keyed by InformationSet or Node"""
+        for k in self.possibility_nodes:
+            self._code_lookup[nodes[k]] = (self.code_column[k], {
+                nodes[self.targets[e]]: e - self.offsets[k] 
+                for e in range(self.offsets[k], self.offsets[k+1])})
+        self.badness = self.leaf_values()
+        """vector of 1 for unacceptable and 0 for acceptable outcome nodes (0 at inner nodes)"""
+        self._levels = self._get_levels()
+        self._find_shared_subtrees()
+        self.cache = {}
+        """dict of derived vectors computed by evaluation engines"""
+
+    @property
+    def is_stale(self):
+        """Whether some node of the branch was changed since compilation"""
+        if self.generation != core.mutation_generation:
+            changed = core.get_mutations(self.branch.root.root, self.generation)
+            if any(ob in self.index for ob in changed):
+                return True
+            # (only nodes outside the branch were changed):
+            self.generation = core.mutation_generation
+        return False
+
+    def _ordered_actions(self, ins):
+        """helper method"""
+        return sorted(self.branch.get_actions(ins), key=lambda a: a.name)
+
+    def _ordered_successors(self, v):
+        """helper method"""
+        if isinstance(v, nd.DecisionNode):
+            consequences = self.branch.get_consequences(v)
+            return [consequences[a] for a in self._ordered_actions(v.information_set)]
+        return list(self.branch.get_successors(v))
+
+    def _get_levels(self):
+        """group inner nodes by height for level-wise vectorized evaluation"""
+        n = len(self.nodes)
+        height = np.zeros(n, dtype=np.int64)
+        for k in range(n - 1, 0, -1):
+            p = self.parent[k]
+            height[p] = max(height[p], height[k] + 1)
+        self.height = height
+        size = np.ones(n, dtype=np.int64)
+        for k in range(n - 1, 0, -1):
+            size[self.parent[k]] += size[k]
+        self.subtree_end = np.arange(n) + size
+        """node number after the last node of each node's subtree"""
+        return self._get_levels_of(np.arange(n))
+
+    def _get_levels_of(self, ks):
+        """helper method: group the given node numbers by height, with their edges"""
+        levels = []
+        for h in range(1, self.height[ks].max() + 1 if len(ks) > 0 else 1):
+            level_nodes = ks[self.height[ks] == h]
+            starts = self.offsets[level_nodes]
+            stops = self.offsets[level_nodes + 1]
+            counts = stops - starts
+            edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            levels.append((level_nodes, edges, np.cumsum(counts) - counts))
+        return levels
+
+    def _find_shared_subtrees(self):
+        """number the classes of structurally identical subtrees bottom-up, 
+        hashing each node's type, outcome, player, probabilities, and its 
+        successors' classes"""
+        n = len(self.nodes)
+        if not self.share_subtrees:
+            self.shared_id = np.arange(n)
+            self.representatives = np.arange(n)
+            self._shared_levels = self._levels
+            return
+        node_type, outcome_id, player_id = (self.node_type.tolist(), self.outcome_id.tolist(), 
+                                            self.player_id.tolist())
+        offsets, targets, probabilities = self.offsets.tolist(), self.targets.tolist(), list(self.probabilities)
+        shared_id = [0] * n
+        classes = {}
+        representatives = []
+        # successors have larger node numbers than their predecessor:
+        for k in range(n - 1, -1, -1):
+            e0, e1 = offsets[k], offsets[k+1]
+            key = (node_type[k], outcome_id[k], player_id[k], tuple(probabilities[e0:e1]),
+                   tuple(shared_id[targets[e]] for e in range(e0, e1)))
+            c = classes.setdefault(key, len(classes))
+            if c == len(representatives):
+                representatives.append(k)
+            shared_id[k] = c
+        self.shared_id = np.array(shared_id, dtype=np.int64)
+        """class of structurally identical subtrees of each node"""
+        self.representatives = np.array(representatives, dtype=np.int64)
+        """one node number per class"""
+        self._shared_levels = self._get_levels_of(np.sort(self.representatives))
+
+    @property
+    def n_shared(self):
+        """number of classes of structurally identical subtrees, i.e., of nodes
+        of the DAG on which backward() operates"""
+        return len(self.representatives)
+
+    def _is_shareable(self, leaf_values, maximize, fixed):
+        """helper method: whether the arguments of backward() agree within all
+        classes of structurally identical subtrees"""
+        if not self.share_subtrees:
+            return True
+        rep = self.representatives[self.shared_id]
+        position = np.where(fixed >= 0, fixed - self.offsets[:-1], -1)
+        return (np.all(leaf_values == leaf_values[rep]) and np.all(maximize == maximize[rep])
+                and np.all(position == position[rep]))
+
+    # conversion helpers:
+
+    def leaf_values(self, attribute=None):
+        """Return a vector of outcome values at outcome nodes (zero at inner nodes):
+        1 for unacceptable and 0 for acceptable outcomes if attribute is None,
+        else the value of the outcome attribute (0 if missing).
+        On symbolic trees, badness values are exact ints (dtype object), so
+        that symbolic results do not contain float coefficients."""
+        exact = attribute is not None or self.is_symbolic
+        values = np.zeros(len(self.nodes), dtype=object if exact else np.float64)
+        for k in np.flatnonzero(self.node_type == OUTCOME):
+            ou = self.outcomes[self.outcome_id[k]]
+            values[k] = ((0 if ou.is_acceptable else 1) if attribute is None
+                         else getattr(ou, attribute, 0))
+        if attribute is not None and not any(isinstance(x, sp.Expr) for x in values):
+            values = values.astype(np.float64)
+        return values
+
+    def edge(self, node, successor):
+        """Return the edge number leading from node to successor"""
+        k = self.index[node]
+        for e in range(self.offsets[k], self.offsets[k+1]):
+            if self.nodes[self.targets[e]] == successor:
+                return e
+        raise KeyError(successor)
+
+    def get_fixed_edges(self, transitions):
+        """Convert a dict of transitions (as used in PartialSolution, Scenario,
+        and Strategy) into a vector holding for each node the chosen edge
+        or -1 if unresolved"""
+        fixed = np.full(len(self.nodes), -1, dtype=np.int64)
+        by_ins = {}
+        for source, target in transitions.items():
+            if isinstance(source, nd.InformationSet):
+                if source in self.information_set_index:
+                    by_ins[self.information_set_index[source]] = self.actions[
+                        self.information_set_index[source]].index(target)
+            elif source in self.index:
+                fixed[self.index[source]] = self.edge(source, target)
+        if by_ins:
+            ins_choice = np.full(len(self.information_sets) + 1, -1, dtype=np.int64)
+            for i, pos in by_ins.items():
+                ins_choice[i] = pos
+            # (information_set_id -1 of non-decision nodes picks the extra entry -1)
+            choice = ins_choice[self.information_set_id]
+            use = (fixed < 0) & (choice >= 0)
+            fixed[use] = self.offsets[:-1][use] + choice[use]
+        return fixed
+
+    @property
+    def n_codes(self):
+        """number of columns of choice codes"""
+        return len(self.information_sets) + len(self.possibility_nodes)
+
+    def encode(self, transitions, codes=None):
+        """Convert a dict of transitions (as used in PartialSolution, Scenario,
+        and Strategy) into a vector of choice codes, or write it into a given
+        row of a code matrix or list. Transitions at nodes outside the branch 
+        are ignored, those at decision nodes must be given via their 
+        information sets.
+        """
+        if codes is None:
+            codes = np.full(self.n_codes, -1, dtype=np.int64)
+        lookup = self._code_lookup
+        for source, target in transitions.items():
+            entry = lookup.get(source)
+            if entry is not None:
+                codes[entry[0]] = entry[1][target]
+            else:
+                assert not (isinstance(source, nd.DecisionNode) and source in self.index), \
+                    "transitions at decision nodes must be given via their information sets"
+        return codes
+
+    def encode_tuple(self, transitions):
+        """Like encode, but return a tuple of ints"""
+        return tuple(self.encode(transitions, codes=[-1] * self.n_codes))
+
+    def encode_many(self, transitions_list):
+        """Return a matrix of choice codes, one row per dict of transitions"""
+        transitions_list = list(transitions_list)
+        codes = np.full((len(transitions_list), self.n_codes), -1, dtype=np.int64)
+        for row, transitions in zip(codes, transitions_list):
+            self.encode(transitions, codes=row)
+        return codes
+
+    def decode(self, codes):
+        """Convert a vector (or tuple) of choice codes back into a dict of transitions"""
+        codes = np.asarray(codes)
+        transitions = {}
+        n_ins = len(self.information_sets)
+        for i in np.flatnonzero(codes[:n_ins] >= 0):
+            transitions[self.information_sets[i]] = self.actions[i][codes[i]]
+        for pos in np.flatnonzero(codes[n_ins:] >= 0):
+            k = self.possibility_nodes[pos]
+            transitions[self.nodes[k]] = self.nodes[self.targets[self.offsets[k] + codes[n_ins + pos]]]
+        return transitions
+
+    def group_mask(self, group):
+        """Return a bool vector that is True at the decision nodes of the group's players"""
+        in_group = np.array([pl in group for pl in self.players] + [False])
+        # (player_id -1 of non-decision nodes picks the extra entry False)
+        return in_group[self.player_id]
+
+    # evaluation routines:
+
+    def backward(self, leaf_values=None, maximize=None, fixed=None):
+        """Compute values for all nodes in one bottom-up pass: expectations at
+        probability nodes, the chosen successor's value where fixed, and the
+        minimum (or maximum where maximize is True) at all other inner nodes.
+        @param leaf_values: vector of values at outcome nodes (default: badness)
+        @param maximize: optional bool vector over nodes (default: all False)
+        @param fixed: optional vector of chosen edges or -1 (see get_fixed_edges)
+        @return: vector of values keyed by node number
+
+        If share_subtrees is True and the arguments agree within all classes 
+        of structurally identical subtrees, only one node per class is evaluated.
+        """
+        if leaf_values is None:
+            leaf_values = self.badness
+        n = len(self.nodes)
+        if maximize is None:
+            maximize = np.zeros(n, dtype=bool)
+        if fixed is None:
+            fixed = np.full(n, -1, dtype=np.int64)
+        if self._is_shareable(leaf_values, maximize, fixed):
+            slot, representatives, levels = self.shared_id, self.representatives, self._shared_levels
+        else:
+            slot, representatives, levels = np.arange(n), np.arange(n), self._levels
+        if self.is_symbolic or leaf_values.dtype == object:
+            return self._backward_symbolic(leaf_values, maximize, fixed, slot, representatives)
+        # values are stored per slot (class of shared subtrees, or node):
+        values = np.array(leaf_values[representatives], dtype=np.float64)
+        is_prob = self.node_type == PROBABILITY
+        for level_nodes, edges, starts in levels:
+            child_values = values[slot[self.targets[edges]]]
+            sums = np.add.reduceat(child_values * self.probabilities[edges], starts)
+            mins = np.minimum.reduceat(child_values, starts)
+            maxs = np.maximum.reduceat(child_values, starts)
+            result = np.where(is_prob[level_nodes], sums,
+                              np.where(maximize[level_nodes], maxs, mins))
+            f = fixed[level_nodes]
+            is_fixed = f >= 0
+            result[is_fixed] = values[slot[self.targets[f[is_fixed]]]]
+            values[slot[level_nodes]] = result
+        return values[slot]
+
+    def _backward_symbolic(self, leaf_values, maximize, fixed, slot=None, representatives=None):
+        """helper method for backward() in case of sympy expressions"""
+        if slot is None:
+            slot = representatives = np.arange(len(self.nodes))
+        values = np.array(leaf_values[representatives], dtype=object)
+        for k in sorted(representatives.tolist(), reverse=True):
+            if self.node_type[k] == OUTCOME:
+                continue
+            if fixed[k] >= 0:
+                values[slot[k]] = values[slot[self.targets[fixed[k]]]]
+                continue
+            edges = range(self.offsets[k], self.offsets[k+1])
+            if self.node_type[k] == PROBABILITY:
+                values[slot[k]] = sum(self.probabilities[e] * values[slot[self.targets[e]]] for e in edges)
+            else:
+                values[slot[k]] = (Max if maximize[k] else Min)([values[slot[self.targets[e]]] for e in edges])
+        return values[slot]
+
+    def _get_choices(self, codes, rows, ks):
+        """helper method: choice codes of the given rows at the given nodes"""
+        column = np.where(self.node_type[ks] == DECISION, self.information_set_id[ks], self.code_column[ks])
+        return np.where(column >= 0, codes[rows, np.maximum(column, 0)], -1)
+
+    def evaluate_batch(self, codes, at, leaf_values=None, maximize=None):
+        """Like backward(), but for many partial solutions at once.
+        @param codes: matrix of choice codes, one row per partial solution
+               (see encode)
+        @param at: list of node numbers whose values are returned
+        @return: matrix of values with one row per partial solution
+               and one column per node in at
+
+        Starting from the nodes in at, (row, node) pairs are expanded level by
+        level, following only the chosen edge where a row resolves a node, and
+        are then aggregated bottom-up. The cost is thus proportional to the 
+        number of nodes reachable under each row's choices.
+        """
+        codes = np.asarray(codes, dtype=np.int64).reshape((-1, self.n_codes))
+        at = np.asarray(at, dtype=np.int64)
+        n_rows = len(codes)
+        if leaf_values is None:
+            leaf_values = self.badness
+        if maximize is None:
+            maximize = np.zeros(len(self.nodes), dtype=bool)
+        if self.is_symbolic or leaf_values.dtype == object:
+            return np.array([self._backward_symbolic(leaf_values, maximize,
+                                                     self.get_fixed_edges(self.decode(row)))[at]
+                             for row in codes], dtype=object).reshape((n_rows, len(at)))
+        # top-down expansion:
+        rows, ks = np.repeat(np.arange(n_rows), len(at)), np.tile(at, n_rows)
+        layers = []
+        while len(ks) > 0:
+            choice = self._get_choices(codes, rows, ks)
+            starts = self.offsets[ks]
+            counts = self.offsets[ks + 1] - starts
+            is_chosen = choice >= 0
+            starts = np.where(is_chosen, starts + choice, starts)
+            counts = np.where(is_chosen, 1, counts)
+            edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            layers.append((ks, counts, edges))
+            rows, ks = np.repeat(rows, counts), self.targets[edges]
+        # bottom-up aggregation:
+        is_prob = self.node_type == PROBABILITY
+        values = np.zeros(0)
+        for ks, counts, edges in reversed(layers):
+            result = np.array(leaf_values[ks], dtype=np.float64)
+            has_children = counts > 0
+            if np.any(has_children):
+                firsts = (np.cumsum(counts) - counts)[has_children]
+                sums = np.add.reduceat(values * self.probabilities[edges], firsts)
+                mins = np.minimum.reduceat(values, firsts)
+                maxs = np.maximum.reduceat(values, firsts)
+                kh = ks[has_children]
+                # (a chosen edge is the only child, so min and max return its value)
+                result[has_children] = np.where(is_prob[kh], sums, np.where(maximize[kh], maxs, mins))
+            values = result
+        return values.reshape((n_rows, len(at)))
+
+    def get_likelihoods(self, node=None, codes=None, resolve=None):
+        """Vectorized equivalent of Branch.get_likelihood for a batch of 
+        partial solutions: the likelihood of an unacceptable outcome at node
+        for each row of a matrix of choice codes (see encode), resolving all 
+        decision and possibility nodes not resolved by a row by resolve 
+        (Min or Max)
+        @param node: a Node, or a list of Nodes
+        @return: vector of likelihoods, or matrix with one column per node
+        """
+        nodes = node if isinstance(node, (list, tuple)) else [node]
+        values = self.evaluate_batch(
+            codes, [self.index[c] for c in nodes],
+            maximize=np.full(len(self.nodes), resolve is Max))
+        return values if isinstance(node, (list, tuple)) else values[:, 0]
+
+    def get_expectation(self, node=None, transitions=None, attribute=None, resolve=None):
+        """Compiled equivalent of Branch._get_expectation: the expectation of an
+        outcome attribute (default: unacceptability) at node, assuming the given
+        transitions and resolving all other decision and possibility nodes
+        by resolve (Min or Max)"""
+        values = self.backward(
+            leaf_values=None if attribute is None else self.leaf_values(attribute),
+            maximize=np.full(len(self.nodes), resolve is Max),
+            fixed=self.get_fixed_edges(transitions if transitions is not None else {}))
+        return _scalar(values[self.index[node]])
+
+    def get_reach(self, node=None, fixed=None):
+        """Return the probability of reaching each node from node when all
+        decision and possibility nodes below node are resolved by fixed"""
+        reach = np.zeros(len(self.nodes), dtype=object if self.is_symbolic else np.float64)
+        k0 = self.index[node]
+        reach[k0] = 1
+        for k in range(k0, self.subtree_end[k0]):
+            if reach[k] == 0 or self.node_type[k] == OUTCOME:
+                continue
+            if self.node_type[k] == PROBABILITY:
+                for e in range(self.offsets[k], self.offsets[k+1]):
+                    reach[self.targets[e]] += reach[k] * self.probabilities[e]
+            else:
+                assert fixed[k] >= 0, "transitions must resolve all reachable decision and possibility nodes"
+                reach[self.targets[fixed[k]]] += reach[k]
+        return reach
+
+    def get_outcome_distribution(self, node=None, transitions=None):
+        """Compiled equivalent of Branch._get_outcome_distribution.
+        @return: dict of probability keyed by Outcome
+        """
+        reach = self.get_reach(node=node, fixed=self.get_fixed_edges(transitions))
+        distribution = {}
+        for k in np.flatnonzero(self.node_type == OUTCOME):
+            if reach[k] != 0:
+                ou = self.outcomes[self.outcome_id[k]]
+                distribution[ou] = distribution.get(ou, 0) + _scalar(reach[k])
+        return distribution
+
+
+def _scalar(x):
+    """convert numpy scalars to python numbers"""
+    return x.item() if isinstance(x, np.generic) else x
+
+def reduce_batches(rows, evaluate, resolve, bound=None, incumbent=None, max_batch_size=4096):
+    """Evaluate an iterable of rows of choice codes batch by batch and reduce 
+    the resulting values by resolve (Min or Max), stopping early once bound 
+    is attained.
+    @param evaluate: function mapping a matrix of choice codes to a vector of values
+    @param incumbent: optional one-element list holding the best numeric value 
+           found so far, updated after each batch, which the enumeration of 
+           rows may use for pruning
+    @param max_batch_size: batches start with one row and double in size up 
+           to this size, so that a good incumbent is found early
+    """
+    rows = iter(rows)
+    def batch_values():
+        size = 1
+        while True:
+            batch = [tuple(row) for row in itertools.islice(rows, size)]
+            if not batch:
+                return
+            value = _resolve(evaluate(np.array(batch, dtype=np.int64)), resolve)
+            if incumbent is not None and not isinstance(value, sp.Expr):
+                incumbent[0] = value if incumbent[0] is None else resolve([incumbent[0], value])
+            yield value
+            size = min(2 * size, max_batch_size)
+    return resolve(batch_values(), bound=bound)
+
+def _resolve(values, resolve):
+    """apply Min or Max to a vector of values and return a python number 
+    or sympy expression"""
+    if values.dtype == object:
+        return resolve(list(values))
+    return _scalar(values.max() if resolve is Max else values.min())
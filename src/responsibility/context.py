@@ -0,0 +1,180 @@
+from . import core
+from .core import _AbstractObject, LRUCache, Min
+from .players import _get_group
+from .solutions import CompactScenario
+from . import nodes as nd
+from . import trees
+
+
+class EvaluationContext (_AbstractObject):
+    """Wraps a Tree and memoizes the intermediate quantities that responsibility
+    functions compute repeatedly (gamma, omega, Delta_omega, rho, rho_min,
+    cooperatively achievable likelihoods, and lists of scenarios and strategies),
+    keyed by node, group, scenario, and action.
+    @param tree: the Tree to evaluate
+    @param memo_size: maximal number of memoized quantities, the least recently
+           used ones being dropped first (default: 10000, None means unbounded)
+
+    Pass the context instead of the tree to responsibility functions, e.g.
+    prf(tree=ctx, group=G, node=v, action=a), so that the second and later
+    functions evaluated on the same tree reuse these quantities. All other
+    attributes are those of the tree. If the tree is changed (e.g. by
+    InformationSet.remove_action), only the quantities at nodes whose branch
+    or information set was changed are dropped, assuming that quantities at
+    a node only depend on its branch and information set.
+    """
+
+    _i_tree = None
+    @property
+    def tree(self):
+        """the wrapped Tree"""
+        return self._i_tree
+
+    _i_memo_size = 10000
+    @property
+    def memo_size(self):
+        """maximal number of memoized quantities (None means unbounded)"""
+        return self._i_memo_size
+
+    def __init__(self, name, **kwargs):
+        super(EvaluationContext, self).__init__(name, **kwargs)
+        self.memo = LRUCache(maxsize=self.memo_size)
+        """LRUCache of memoized quantities"""
+        self.generation = core.mutation_generation
+        """value of core.mutation_generation when the memo was last updated"""
+
+    def validate(self):
+        assert isinstance(self.tree, trees.Tree)
+
+    def __getattr__(self, attr):
+        # only called for attributes not found on the context itself:
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        return getattr(self.tree, attr)
+
+    def _memoized(self, key, compute):
+        """helper method"""
+        if self.generation != core.mutation_generation:
+            self._drop_changed()
+        value = self.memo.get(key)
+        if value is None:
+            value = self.memo[key] = compute()
+        return value
+
+    def _drop_changed(self):
+        """helper method: drop the memoized quantities at the nodes and 
+        information sets changed since the memo was last updated"""
+        changes = self.tree._get_changes(self.generation)
+        if changes:
+            self.memo.discard_if(lambda key: self._is_changed(key[1], changes))
+        self.generation = core.mutation_generation
+
+    @staticmethod
+    def _is_changed(ob, changes):
+        """helper method: whether the node or information set a key refers to
+        is affected by the changes (see Branch._get_changes)"""
+        if isinstance(ob, nd.DecisionNode):
+            ob = ob.information_set
+        if isinstance(ob, nd.InformationSet):
+            return ob in changes or any(v in changes for v in ob.nodes)
+        return ob in changes
+
+    # keys:
+
+    @staticmethod
+    def _group_key(player=None, group=None):
+        """helper method"""
+        group = _get_group(player=player, group=group)
+        return None if group is None else group.players
+
+    @staticmethod
+    def _node_key(node, group_key):
+        """helper method: quantities that are aggregated over the node's 
+        information set are shared by all its nodes"""
+        if group_key is not None and hasattr(node, "player") and node.player in group_key:
+            return node.information_set
+        return node
+
+    @staticmethod
+    def _scenario_key(scenario):
+        """helper method"""
+        if isinstance(scenario, CompactScenario):
+            return (scenario.current_node, scenario.codes)
+        return (None if scenario is None
+                else (scenario.current_node, frozenset(scenario.transitions.items())))
+
+    # memoized enumerations:
+
+    def get_scenarios(self, node=None, player=None, group=None, fixed_transitions=None):
+        """Like Tree.get_scenarios, but returns a memoized list"""
+        if fixed_transitions:
+            return list(self.tree.get_scenarios(node=node, player=player, group=group,
+                                                fixed_transitions=fixed_transitions))
+        group_key = self._group_key(player, group)
+        return self._memoized(
+            ("scenarios", self._node_key(node, group_key), group_key),
+            lambda: list(self.tree.get_scenarios(node=node, player=player, group=group)))
+
+    def get_strategies(self, node=None, player=None, group=None, fixed_choices=None, constraint=None):
+        """Like Tree.get_strategies, but returns a memoized list"""
+        return self._memoized(
+            ("strategies", node, self._group_key(player, group),
+             frozenset((fixed_choices or {}).items()), None if constraint is None else constraint.key),
+            lambda: list(self.tree.get_strategies(node=node, player=player, group=group,
+                                                  fixed_choices=fixed_choices, constraint=constraint)))
+
+    # memoized components of responsibility functions (see Branch):
+
+    def get_guaranteed_likelihood(self, player=None, group=None, node=None):
+        group_key = self._group_key(player, group)
+        return self._memoized(
+            ("gamma", self._node_key(node, group_key), group_key),
+            lambda: self.tree.gamma(player=player, group=group, node=node))
+
+    gamma = get_guaranteed_likelihood
+
+    def get_optimal_avoidance_likelihood(self, node=None, scenario=None):
+        return self._memoized(
+            ("omega", node, self._scenario_key(scenario)),
+            lambda: self.tree.omega(node=node, scenario=scenario))
+
+    omega = get_optimal_avoidance_likelihood
+
+    def Delta_omega(self, node=None, scenario=None, action=None):
+        return self._memoized(
+            ("Delta_omega", node, self._scenario_key(scenario), action),
+            lambda: (self.omega(node=self.tree.get_consequences(node)[action],
+                                scenario=scenario.sub_scenario(action))
+                     - self.omega(node=node, scenario=scenario)))
+
+    def rho(self, group=None, node=None, action=None):
+        group_key = self._group_key(group=group)
+        return self._memoized(
+            ("rho", self._node_key(node, group_key), group_key, action),
+            lambda: self.tree.rho(group=group, node=node, action=action))
+
+    def rho_min(self, group=None, node=None):
+        group_key = self._group_key(group=group)
+        return self._memoized(
+            ("rho_min", self._node_key(node, group_key), group_key),
+            lambda: Min([self.rho(group=group, node=node, action=action)
+                         for action in self.tree.get_actions(node)]))
+
+    def cooperatively_achievable_likelihood(self, node=None, env_scenario=None, fixed_choices=None,
+                                            solver=None):
+        # (all solvers give the same values, so solver is not part of the key)
+        return self._memoized(
+            ("cooperatively_achievable_likelihood", node, self._scenario_key(env_scenario),
+             frozenset((fixed_choices or {}).items())),
+            lambda: self.tree.cooperatively_achievable_likelihood(
+                node=node, env_scenario=env_scenario, fixed_choices=fixed_choices, solver=solver))
+
+    def cooperatively_achievable_worst_case_likelihood(self, node=None, fixed_choices=None, solver=None):
+        return self._memoized(
+            ("cooperatively_achievable_worst_case_likelihood", node,
+             frozenset((fixed_choices or {}).items())),
+            lambda: self.tree.cooperatively_achievable_worst_case_likelihood(
+                node=node, fixed_choices=fixed_choices, solver=solver))
+
+    def __repr__(self):
+        return "EvaluationContext(" + self.tree.name + ", " + repr(self.memo) + ")"
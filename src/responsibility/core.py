@@ -1,6 +1,10 @@
 import sys
 import types
+import bisect
 import itertools 
+import threading
+import weakref
+from collections import OrderedDict
 import numpy as np
 import sympy as sp
 from line_profiler import LineProfiler
@@ -71,6 +75,99 @@ class _AbstractObject (object):
     def __repr__(self): return self._i_name
 
 
+class LRUCache (object):
+    """Bounded, thread-safe dict-like cache that evicts the least recently
+    used entries and counts cache hits and misses.
+    @param maxsize: maximal number of entries (None means unbounded)
+    """
+
+    def __init__(self, maxsize=None):
+        assert maxsize is None or maxsize >= 0
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value (and mark it as recently used) or default"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+    def discard_if(self, predicate):
+        """Remove all entries whose key satisfies predicate"""
+        with self._lock:
+            for key in [key for key in self._data if predicate(key)]:
+                del self._data[key]
+
+    def clear(self):
+        """Remove all entries and reset the statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self):
+        """dict of hits, misses, current size and maxsize"""
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._data), "maxsize": self.maxsize}
+
+    def __repr__(self):
+        return "LRUCache" + str(self.stats)
+
+
+mutation_generation = 0
+"""number of structural changes made to any tree so far, used to detect stale 
+cached data (see Branch.tree_index)"""
+
+_mutation_logs = weakref.WeakKeyDictionary()
+"""dict of pairs of lists (generations, weak references to the changed 
+objects) of the mutations of a tree, keyed by the tree's root node, so that 
+the log lives as long as the tree and only its own mutations are scanned"""
+
+def register_mutation(changed, root):
+    """Record a structural change of the tree with the given root node and 
+    increase mutation_generation, to be called whenever the successors of a 
+    node or the nodes of an information set change, with that node or 
+    information set. Cached data then only need to be dropped where they 
+    concern the changed node's branch or the changed information set (see
+    Branch._get_changes)."""
+    global mutation_generation
+    mutation_generation += 1
+    generations, refs = _mutation_logs.setdefault(root, ([], []))
+    generations.append(mutation_generation)
+    refs.append(weakref.ref(changed))
+
+def get_mutations(root, generation):
+    """Return the list of nodes and information sets of the tree with the 
+    given root node changed since mutation_generation had the given value
+    (omitting deleted ones)"""
+    generations, refs = _mutation_logs.get(root, ((), ()))
+    start = bisect.bisect_right(generations, generation)
+    return [ob for ob in (ref() for ref in refs[start:]) if ob is not None]
+
+
 # helper functions:
     
 def hasname(ob):
@@ -99,13 +196,33 @@ def global_symbols(*names):
         else:
             setattr(module, n, s)
 
-def Min(values):
-    """Return the symbolic or numeric minimum of a list of values"""
-    return (sp.simplify(sp.Min(*values)) if np.any([isinstance(v, sp.Expr) for v in values])
-            else min(values))
+def _extremum(values, bound, symbolic, is_better):
+    """helper function for Min and Max"""
+    values = iter(values)
+    best = None
+    for v in values:
+        if isinstance(v, sp.Expr):
+            # symbolic values require all remaining values:
+            return sp.simplify(symbolic(*([v, *values] + ([] if best is None else [best]))))
+        if best is None or is_better(v, best):
+            best = v
+            if bound is not None and not is_better(bound, best):
+                break
+    if best is None:
+        raise ValueError("empty sequence of values")
+    return best
+
+def Min(values, bound=None):
+    """Return the symbolic or numeric minimum of a list or iterable of values.
+    @param bound: optional known lower bound of the values (e.g. 0 for 
+           likelihoods). Values are consumed lazily, and consumption stops 
+           as soon as a numeric value attains the bound."""
+    return _extremum(values, bound, sp.Min, lambda v, w: v < w)
 
-def Max(values):
-    """Return the symbolic or numeric maximum of a list of values"""
-    return (sp.simplify(sp.Max(*values)) if np.any([isinstance(v, sp.Expr) for v in values])
-            else max(values))
+def Max(values, bound=None):
+    """Return the symbolic or numeric maximum of a list or iterable of values.
+    @param bound: optional known upper bound of the values (e.g. 1 for 
+           likelihoods). Values are consumed lazily, and consumption stops 
+           as soon as a numeric value attains the bound."""
+    return _extremum(values, bound, sp.Max, lambda v, w: v > w)
 
@@ -1,11 +1,17 @@
+from collections import deque
+import numpy as np
+
 from .core import Min, Max
+from .context import EvaluationContext
 from .nodes import * 
 from .trees import *
 
-def strictly_dominates(a1, a2, ins):
-    """Whether action 1 strictly dominates action 2 in information_set"""
-    T = ins.nodes[0].tree
-    for v in ins.nodes:
+def strictly_dominates(a1, a2, ins, tree=None):
+    """Whether action 1 strictly dominates action 2 in information_set
+    @param tree: optional Tree (or TreeView) to evaluate in, by default 
+           the tree of the information set's nodes"""
+    T = ins.nodes[0].tree if tree is None else tree
+    for v in T.get_information_set_nodes(ins):
         for tau in T._get_transitions(node=v, exclude_types=(ProbabilityNode,), 
                                       exclude_group=[], exclude_nodes=[v]):
             l1 = T._get_expectation(node=v, transitions={**tau, ins: a1}, resolve=Max)
@@ -15,19 +21,17 @@ def strictly_dominates(a1, a2, ins):
                 return False
     return True
 
-def is_strictly_dominated(action, ins):
+def is_strictly_dominated(action, ins, tree=None):
     """Whether action is strictly dominated by any other action in information set"""
-    for a1 in ins.actions:
-        if a1 != action and strictly_dominates(a1, action, ins):
-            return True
-    return False
+    actions, strict, weak, strength = domination_matrices(ins, action=action, tree=tree)
+    return bool(strict[:, actions.index(action)].any())
               
-def weakly_dominates(a1, a2, ins):
+def weakly_dominates(a1, a2, ins, tree=None):
     """Whether action 1 weakly dominates action 2 in information_set
     w.r.t. all sets of not strictly (!) dominated transitions"""
     found_better = False
-    T = ins.nodes[0].tree
-    for v in ins.nodes:
+    T = ins.nodes[0].tree if tree is None else tree
+    for v in T.get_information_set_nodes(ins):
         for tau in T._get_transitions(node=v, exclude_types=(ProbabilityNode,), 
                                       exclude_group=[], exclude_nodes=[v]):
             l1 = T._get_expectation(node=v, transitions={**tau, ins: a1}, resolve=Max)
@@ -39,40 +43,177 @@ def weakly_dominates(a1, a2, ins):
                 found_better = True
     return found_better
 
-def is_weakly_dominated(action, ins):
+def is_weakly_dominated(action, ins, tree=None):
     """Whether action is weakly dominated by any other action in information set"""
-    for a1 in ins.actions:
-        if a1 != action and weakly_dominates(a1, action, ins):
-            return True
-    return False
+    actions, strict, weak, strength = domination_matrices(ins, action=action, tree=tree)
+    return bool(weak[:, actions.index(action)].any())
+
+def domination_matrices(ins, action=None, tree=None):
+    """Compare all pairs of actions in information set in a single sweep over
+    the transition sets, evaluating each action only once per transition set
+    (rather than twice per pair as strictly_dominates and weakly_dominates do).
+    @param action: optional action, to only compare the others with it
+    @param tree: optional Tree (or TreeView) to evaluate in (see strictly_dominates)
+    @return: tuple (actions, strict, weak, strength) of the list of actions
+             and three arrays whose entry [k1, k2] concerns actions[k1] versus
+             actions[k2]: whether the former strictly or weakly dominates the
+             latter, and the domination strength, i.e., the maximal
+             difference in likelihoods if the former never has a larger
+             likelihood than the latter, else zero
+    """
+    T = ins.nodes[0].tree if tree is None else tree
+    actions = list(T.get_actions(ins))
+    n = len(actions)
+    # whether the former never has a larger, or always a smaller, or 
+    # sometimes a smaller likelihood so far:
+    never_larger = ~np.eye(n, dtype=bool)
+    if action is not None:
+        never_larger[:, [k for k, a in enumerate(actions) if a != action]] = False
+    always_smaller = never_larger.copy()
+    sometimes_smaller = np.zeros((n, n), dtype=bool)
+    strength = np.zeros((n, n), dtype=object)
+    cases = ((v, tau) for v in T.get_information_set_nodes(ins)
+             for tau in T._get_transitions(node=v, exclude_types=(ProbabilityNode,), 
+                                           exclude_group=[], exclude_nodes=[v]))
+    for v, tau in cases:
+        ls = [T._get_expectation(node=v, transitions={**tau, ins: a}, resolve=Max)
+              for a in actions]
+        for k1, l1 in enumerate(ls):
+            for k2, l2 in enumerate(ls):
+                if never_larger[k1, k2]:
+                    assert l1 <= l2 or l1 > l2
+                    if l1 > l2:
+                        never_larger[k1, k2] = always_smaller[k1, k2] = False
+                        strength[k1, k2] = 0
+                    elif l1 < l2:
+                        sometimes_smaller[k1, k2] = True
+                        strength[k1, k2] = max(strength[k1, k2], l2 - l1)
+                    else:
+                        always_smaller[k1, k2] = False
+        if not never_larger.any():
+            # (no entry can change any more)
+            break
+    return actions, always_smaller, never_larger & sometimes_smaller, strength
+
+def _get_likelihood_bounds(tree):
+    """helper function: dicts of the minimal and maximal likelihood of an
+    unacceptable outcome over all choices at decision and possibility nodes, 
+    keyed by node. Since is_strictly_dominated lets these choices differ 
+    between nodes, action a1 strictly dominates action a2 iff, at all nodes 
+    of the information set, the maximum after a1 is below the minimum after a2"""
+    lo, hi = {}, {}
+    for v in tree.get_nodes_postorder():
+        _set_likelihood_bounds(tree, v, lo, hi)
+    return lo, hi
+
+def _set_likelihood_bounds(tree, v, lo, hi):
+    """helper function: (re)compute the bounds at v from those of its
+    successors and return whether they changed"""
+    old = (lo.get(v), hi.get(v))
+    if isinstance(v, OutcomeNode):
+        lo[v] = hi[v] = 0 if v.outcome.is_acceptable else 1
+    elif isinstance(v, ProbabilityNode):
+        lo[v] = sum(p * lo[c] for c, p in tree.get_probabilities(v).items())
+        hi[v] = sum(p * hi[c] for c, p in tree.get_probabilities(v).items())
+    else:
+        lo[v] = Min([lo[c] for c in tree.get_successors(v)])
+        hi[v] = Max([hi[c] for c in tree.get_successors(v)])
+    return (lo[v], hi[v]) != old
+
+def _strictly_dominates(a1, a2, ins, bounds, tree):
+    """helper function: like strictly_dominates, but using the bounds 
+    (see _get_likelihood_bounds) where they decide"""
+    lo, hi = bounds
+    try:
+        return all(bool(hi[tree.get_consequences(v)[a1]] < lo[tree.get_consequences(v)[a2]])
+                   for v in tree.get_information_set_nodes(ins))
+    except TypeError:
+        # (symbolic bounds may not be comparable while all expectations are)
+        pass
+    return strictly_dominates(a1, a2, ins, tree=tree)
+
+def _get_reduced_tree_cache(tree):
+    """helper function: dict of trust-based reduced trees keyed by information
+    set, stored at the tree and dropped when the tree has changed, i.e., when
+    its tree_index was rebuilt (since every reduced tree depends on the 
+    whole tree)"""
+    index = tree.tree_index
+    cache = tree._a_reduced_tree_cache
+    if cache is None or cache["index"] is not index:
+        cache = tree._a_reduced_tree_cache = {"index": index, "trees": {}}
+    return cache
 
 def trust_based_reduced_tree(tree, information_set):
-    """Return a clone of the tree where all nodes incompatible with information
-    set and all iteratively strongly dominated future actions that are not in 
-    the history of information_set or belong to the information set are removed
-    and past probabilities are updated to posteriors to reflect this."""
+    """Return a view of the tree (see views.py) where all nodes incompatible 
+    with information set and all iteratively strongly dominated future 
+    actions that are not in the history of information_set or belong to the 
+    information set are hidden and past probabilities are updated to 
+    posteriors to reflect this. The view shares the tree's nodes, information 
+    sets, and actions, and can be turned into an independent Tree by its 
+    clone() method.
+    The result is memoized per tree and information set until the tree 
+    changes and is therefore read-only (see TreeView.read_only)."""
+    if isinstance(tree, EvaluationContext):
+        tree = tree.tree
+    cache = _get_reduced_tree_cache(tree)
+    T = cache["trees"].get(information_set)
+    if T is None:
+        T = cache["trees"][information_set] = _get_trust_based_reduced_tree(tree, information_set)
+        T._i_read_only = True
+    return T
+
+def trust_based_reduced_mask(tree, information_set):
+    """Return the trust-based reduced tree (see trust_based_reduced_tree) as 
+    a mask of the original tree, i.e., the set of the tree's nodes it shows"""
+    return frozenset(trust_based_reduced_tree(tree, information_set).tree_index.nodes)
+
+def _get_trust_based_reduced_tree(tree, information_set):
+    """helper function: compute trust_based_reduced_tree.
+    Information sets are checked from a worklist, to which only those are
+    added again that lost nodes or whose successors' likelihoods changed due
+    to a removal. These likelihood bounds are updated upwards from the 
+    removal only."""
     ins = information_set
     assert isinstance(ins, InformationSet)
-    T = tree.clone_constrained(name="tbrt_of_" + tree.name + "_for_" + ins.name,
-                               information_set=ins)
-    anchor = T.subs[ins]
-    change = True
-    while change:
-        change = False
-        for ins2 in T.get_information_sets():
-            if ins2 != anchor:
-                for a in [*ins2.actions]:
-                    if not (ins2, a) in anchor.choice_history:
-                        if is_strictly_dominated(a, ins2):
-                            print("removing", a)
-                            ins2.remove_action(a)
-                            change = True
-                            ins2._i_name += "'"
-            if change:
-                break
-    T.subs[ins].highlight = True
-    for v in T.subs[ins].nodes:
-        v.highlight = True
+    T = tree.view_constrained(name="tbrt_of_" + tree.name + "_for_" + ins.name,
+                              information_set=ins)
+    history = set(ins.choice_history)
+    bounds = _get_likelihood_bounds(T)
+    # check deeper information sets first, since removals only affect those above:
+    worklist = deque(reversed(list(T.get_information_sets())))
+    queued = set(worklist)
+    while worklist:
+        ins2 = worklist.popleft()
+        queued.discard(ins2)
+        nodes2 = T.get_information_set_nodes(ins2)
+        if ins2 == ins or len(nodes2) == 0:
+            continue
+        removed = False
+        # the nodes hidden by the removals, whose information sets lose nodes:
+        affected = []
+        for a in [*T.get_actions(ins2)]:
+            if not (ins2, a) in history:
+                if any(a1 != a and _strictly_dominates(a1, a, ins2, bounds, T) 
+                       for a1 in T.get_actions(ins2)):
+                    print("removing", a)
+                    index = T.tree_index
+                    for v in nodes2:
+                        affected.extend(index.get_branch_nodes(T.get_consequences(v)[a]))
+                    T.remove_action(ins2, a)
+                    removed = True
+        if removed:
+            # and the nodes above the removal whose successors changed:
+            for v in nodes2:
+                u = v
+                while u.predecessor is not None:
+                    if not _set_likelihood_bounds(T, u, *bounds):
+                        break
+                    u = u.predecessor
+                    affected.append(u)
+            for u in affected:
+                if isinstance(u, DecisionNode) and u.information_set not in queued:
+                    worklist.append(u.information_set)
+                    queued.add(u.information_set)
     return T
     
 tbrt = trust_based_reduced_tree
@@ -2,6 +2,7 @@ from .core import _AbstractObject
 from .nodes import *
 from .players import *
 from .trees import *
+from .context import EvaluationContext
 
 
 class Function (_AbstractObject):
@@ -33,13 +34,14 @@ AggF = AggregationFunction
 class ResponsibilityFunction (Function):
     """Represents a responsibility function taking a tree, a group, and a node
     and returning an assessment of that group's backward, or forward
-    responsibility at that node.""" 
+    responsibility at that node. Instead of a tree, an EvaluationContext
+    wrapping the tree can be passed to reuse intermediate results.""" 
     
     def __call__(self, tree=None, group=None, node=None):
-        assert isinstance(tree, Tree)
+        assert isinstance(tree, (Tree, EvaluationContext))
         assert isinstance(group, Group)
         assert isinstance(node, Node)
-        assert node.path[0] == tree.root
+        assert node in tree.tree_index
         return self._i_function(tree, group, node)
 
 RespF = ResponsibilityFunction
@@ -49,14 +51,16 @@ RespF = ResponsibilityFunction
 class PointwiseResponsibilityFunction (Function):
     """Represents a "pointwise" responsibility function taking a tree, a group, 
     a decision node, and an action, and returning an assessment of that group's
-    responsibility due to having taken that action at that node.""" 
+    responsibility due to having taken that action at that node. Instead of a 
+    tree, an EvaluationContext wrapping the tree can be passed to reuse 
+    intermediate results.""" 
     def __call__(self, tree=None, group=None, node=None, action=None):
-        assert isinstance(tree, Tree)
+        assert isinstance(tree, (Tree, EvaluationContext))
         assert isinstance(group, Group)
         assert isinstance(node, DecisionNode)
-        assert node.path[0] == tree.root
+        assert node in tree.tree_index
         assert node.player in group
-        assert action in node.actions
+        assert action in tree.get_actions(node)
         return self._i_function(tree, group, node, action)
 
 PRF = PointwiseResponsibilityFunction
@@ -70,10 +74,10 @@ class BackwardResponsibilityFunction (ResponsibilityFunction):
     outcome due to having taken the actions they took on the way to this
     outcome node.""" 
     def __call__(self, tree=None, group=None, node=None):
-        assert isinstance(tree, Tree)
+        assert isinstance(tree, (Tree, EvaluationContext))
         assert isinstance(group, Group)
         assert isinstance(node, OutcomeNode)
-        assert node.path[0] == tree.root
+        assert node in tree.tree_index
         return self._i_function(tree, group, node)
     
 BRF = BackwardResponsibilityFunction
@@ -85,10 +89,10 @@ class ForwardResponsibilityFunction (ResponsibilityFunction):
     and a decision node, and returning an assessment of that group's forward
     responsibility for avoiding an unacceptable outcome when in this node.""" 
     def __call__(self, tree=None, group=None, node=None):
-        assert isinstance(tree, Tree)
+        assert isinstance(tree, (Tree, EvaluationContext))
         assert isinstance(group, Group)
         assert isinstance(node, DecisionNode)
-        assert node.path[0] == tree.root
+        assert node in tree.tree_index
         assert node.player in group
         return self._i_function(tree, group, node)
     
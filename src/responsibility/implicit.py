@@ -0,0 +1,267 @@
+import random as rnd
+
+import sympy as sp
+
+from .core import _AbstractObject, LRUCache
+from .players import Player, _get_group
+from .actions import Action
+from .outcomes import Outcome
+from . import nodes as nd
+
+"""
+Implicit game trees whose nodes are produced on demand by a user callback,
+so that only those nodes are expanded which an evaluation actually visits.
+
+A node is identified by a hashable key, and the callback expand(key) returns
+either
+- an Outcome for an outcome node,
+- ("decision", player, information_set, consequences) with a Player, a
+  hashable information set key (or None for a singleton information set),
+  and a dict of successor keys keyed by Action,
+- ("probability", probabilities) with a dict of (numeric) probabilities keyed
+  by successor key, or
+- ("possibility", successors) with a list of successor keys.
+Equal keys stand for identical subtrees, so that the callback may map
+different histories to the same key where they lead to the same situation.
+
+Both the expanded nodes and the values computed for them are kept in LRUCaches
+of bounded size, so that trees much larger than memory can be studied as long
+as evaluations visit only a part of them: likelihoods are minimized and
+maximized by depth-first alpha-beta search, which stops evaluating a node's
+successors as soon as the result can no longer change, and likelihoods under
+given choices can be estimated by sampling paths. Quantities that aggregate
+over information sets or scenarios require the whole tree, which to_tree
+materializes as an ordinary Tree.
+"""
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+class ImplicitTree (_AbstractObject):
+    """Game tree given by a root key and a callback producing nodes on demand
+    (see above).
+    @param root: key of the root node
+    @param expand: function mapping a node key to the node's description
+    @param maxsize: maximal number of expanded nodes, and of computed values,
+           to keep (None means unbounded)
+    """
+
+    _i_root = None
+    @property
+    def root(self):
+        """key of the root node"""
+        return self._i_root
+
+    _i_expand = None
+    @property
+    def expand(self):
+        """function mapping a node key to the node's description"""
+        return self._i_expand
+
+    _i_maxsize = 100000
+    @property
+    def maxsize(self):
+        """maximal number of cached expanded nodes and of cached values"""
+        return self._i_maxsize
+
+    def validate(self):
+        assert callable(self.expand), "expand must be a function of node keys"
+        self.nodes = LRUCache(self.maxsize)
+        """LRUCache of expanded nodes' descriptions keyed by node key"""
+        self.values = LRUCache(self.maxsize)
+        """LRUCache of bounds on computed likelihoods"""
+        self.n_expansions = 0
+        """number of calls of expand so far (including repeated ones for
+        nodes evicted from the cache)"""
+
+    def get_node(self, key):
+        """Return the (validated) description of the node with the given key,
+        expanding it if it is not cached"""
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = self._validated(self.expand(key))
+            self.n_expansions += 1
+        return node
+
+    def _validated(self, node):
+        """helper method: normalized description"""
+        if isinstance(node, Outcome):
+            return node
+        kind = node[0]
+        if kind == "decision":
+            kind, player, information_set, consequences = node
+            assert isinstance(player, Player)
+            assert isinstance(consequences, dict) and len(consequences) > 0
+            for a in consequences:
+                assert isinstance(a, Action)
+            return (kind, player, information_set, consequences)
+        if kind == "probability":
+            kind, probabilities = node
+            assert isinstance(probabilities, dict) and len(probabilities) > 0
+            for p in probabilities.values():
+                assert not isinstance(p, sp.Expr) or p.is_number, "probabilities must be numeric"
+                assert 0 <= p <= 1
+            return (kind, probabilities)
+        assert kind == "possibility", "unknown kind of node: " + str(kind)
+        kind, successors = node
+        successors = list(successors)
+        assert len(successors) > 0
+        return (kind, successors)
+
+    def _successors(self, node):
+        """helper method: list of successor keys"""
+        if node[0] == "decision":
+            return list(node[3].values())
+        if node[0] == "probability":
+            return list(node[1])
+        return node[1]
+
+    # alpha-beta search:
+
+    def _search(self, key, mode, minimizes, choices, alpha, beta):
+        """helper method: likelihood of an unacceptable outcome at key if the
+        choices (dict of Action keyed by information set key) are taken and
+        all other decision and possibility nodes minimize or maximize as given
+        by minimizes(node). The result is exact if it lies strictly between
+        alpha and beta, else a bound beyond the violated one. Results are
+        cached under mode, which must identify minimizes and choices."""
+        entry = self.values.get((mode, key))
+        if entry is not None:
+            flag, value = entry
+            if (flag == _EXACT or (flag == _LOWER and value >= beta)
+                    or (flag == _UPPER and value <= alpha)):
+                return value
+        node = self.get_node(key)
+        if isinstance(node, Outcome):
+            value = 0 if node.is_acceptable else 1
+            self.values[mode, key] = (_EXACT, value)
+            return value
+        if node[0] == "probability":
+            # (the successors' windows would depend on each other, so
+            # their values are computed exactly):
+            value = sum(p * self._search(c, mode, minimizes, choices, 0, 1)
+                        for c, p in node[1].items())
+            self.values[mode, key] = (_EXACT, value)
+            return value
+        if node[0] == "decision" and node[2] is not None and node[2] in choices:
+            successors = [node[3][choices[node[2]]]]
+            minimize = True
+        else:
+            successors = self._successors(node)
+            minimize = minimizes(node)
+        best = None
+        lo, hi = alpha, beta
+        for c in successors:
+            value = self._search(c, mode, minimizes, choices, lo, hi)
+            if minimize:
+                if best is None or value < best:
+                    best = value
+                    hi = min(hi, best)
+                if best <= alpha:
+                    break
+            else:
+                if best is None or value > best:
+                    best = value
+                    lo = max(lo, best)
+                if best >= beta:
+                    break
+        flag = _UPPER if best <= alpha else _LOWER if best >= beta else _EXACT
+        self.values[mode, key] = (flag, best)
+        return best
+
+    def _evaluate(self, key, mode, minimizes, choices=None):
+        """helper method"""
+        return self._search(self.root if key is None else key, mode, minimizes, choices or {}, 0, 1)
+
+    # likelihoods at single nodes (see Branch):
+
+    def get_guaranteed_likelihood(self, key=None):
+        """Minimal likelihood of an unacceptable outcome over all choices of
+        all players and nature at the node with key (default: root)"""
+        return self._evaluate(key, "min", lambda node: True)
+
+    def get_worst_case_likelihood(self, key=None):
+        """Maximal likelihood of an unacceptable outcome over all choices of
+        all players and nature at the node with key (default: root)"""
+        return self._evaluate(key, "max", lambda node: False)
+
+    def get_worst_case_avoidance_likelihood(self, group=None, player=None, key=None):
+        """Minimal likelihood of an unacceptable outcome that group can
+        guarantee at the node with key (default: root) if it knows all
+        previous choices, i.e., minimizing at the group's decision nodes and
+        maximizing at all others' and at possibility nodes"""
+        group = _get_group(player=player, group=group)
+        assert group is not None
+        return self._evaluate(key, ("avoidance", group.players),
+                              lambda node: node[0] == "decision" and node[1] in group)
+
+    def get_likelihood(self, key=None, choices=None, resolve="max"):
+        """Likelihood of an unacceptable outcome at the node with key (default:
+        root) if the given choices are taken, resolving all other decision and
+        possibility nodes by minimizing or maximizing
+        @param choices: dict of Action keyed by information set key
+        @param resolve: "min" or "max"
+        """
+        assert resolve in ("min", "max")
+        choices = choices or {}
+        return self._evaluate(key, ("choices", resolve, frozenset(choices.items())),
+                              lambda node: resolve == "min", choices)
+
+    def sample_likelihood(self, key=None, choices=None, n_samples=1000, seed=None):
+        """Estimate the likelihood of an unacceptable outcome at the node with
+        key (default: root) if the given choices are taken and all other
+        decisions and possibilities are resolved uniformly at random, by
+        sampling n_samples paths
+        @param choices: dict of Action keyed by information set key
+        @return: the fraction of sampled paths leading to unacceptable outcomes
+        """
+        choices = choices or {}
+        generator = rnd.Random(seed)
+        n_unacceptable = 0
+        for sample in range(n_samples):
+            node = self.get_node(self.root if key is None else key)
+            while not isinstance(node, Outcome):
+                if node[0] == "probability":
+                    successors, weights = zip(*node[1].items())
+                    c = generator.choices(successors, weights)[0]
+                elif node[0] == "decision" and node[2] is not None and node[2] in choices:
+                    c = node[3][choices[node[2]]]
+                else:
+                    c = generator.choice(self._successors(node))
+                node = self.get_node(c)
+            n_unacceptable += not node.is_acceptable
+        return n_unacceptable / n_samples
+
+    def to_tree(self, name=None, max_nodes=None):
+        """Return the equivalent Tree, expanding all nodes
+        @param max_nodes: optional maximal number of nodes, beyond which an
+               AssertionError is raised"""
+        from .trees import Tree
+        information_sets = {}
+        n_nodes = [0]
+        def build(key, path):
+            n_nodes[0] += 1
+            assert max_nodes is None or n_nodes[0] <= max_nodes, "tree has more than max_nodes nodes"
+            node = self.get_node(key)
+            name = "v" + path
+            if isinstance(node, Outcome):
+                return nd.OutcomeNode("w" + path, ou=node)
+            if node[0] == "decision":
+                kind, player, ins, consequences = node
+                v = nd.DecisionNode(name, pl=player, co={
+                    a: build(c, path + "_" + a.name) for a, c in consequences.items()})
+                if ins is not None:
+                    if ins not in information_sets:
+                        information_sets[ins] = nd.InformationSet("S" + path)
+                    information_sets[ins].add_node(v)
+                return v
+            if node[0] == "probability":
+                return nd.ProbabilityNode(name, pr={
+                    build(c, path + "_" + str(pos)): p for pos, (c, p) in enumerate(node[1].items())})
+            return nd.PossibilityNode(name, su={build(c, path + "_" + str(pos))
+                                                for pos, c in enumerate(node[1])})
+        return Tree(name or self.name, ro=build(self.root, ""))
+
+    def __repr__(self):
+        return ("ImplicitTree(" + self.name + ", " + str(len(self.nodes)) + " cached nodes, "
+                + str(self.n_expansions) + " expansions)")
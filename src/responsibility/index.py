@@ -0,0 +1,141 @@
+from . import core
+from .core import _AbstractObject
+from . import nodes as nd
+
+"""
+Euler-tour index of a Branch for constant-time structural queries and 
+allocation-free traversal.
+
+Nodes are numbered in preorder (the order of Branch.get_nodes()). The branch
+of the node with entry number k consists exactly of the nodes with entry
+numbers k...exit[k]-1, so ancestor tests reduce to two integer comparisons.
+Flat preorder lists of the nodes of each type serve Branch's get_..._nodes()
+generators and named_... properties.
+"""
+
+
+class TreeIndex (_AbstractObject):
+    """Preorder entry and exit numbers, depths, and parents of all nodes of a
+    Branch, and lists of its nodes in preorder and postorder and by type,
+    produced by Branch.tree_index.
+    @param branch: the Branch to index
+
+    The index reflects the branch at the time of its creation. Once the 
+    branch was changed (see core.register_mutation), is_stale is True and 
+    Branch.tree_index builds a new one.
+    """
+
+    _i_branch = None
+    @property
+    def branch(self):
+        """the indexed Branch"""
+        return self._i_branch
+
+    def __init__(self, name, **kwargs):
+        super(TreeIndex, self).__init__(name, **kwargs)
+        self._build()
+
+    def validate(self):
+        assert self.branch is not None, "must specify a branch"
+
+    def _build(self):
+        """number nodes in preorder and fill all lists"""
+        self.generation = core.mutation_generation
+        """value of core.mutation_generation when the index was built"""
+        self.root = root = self.branch.root
+        """the branch's root Node"""
+        self.nodes = nodes = []
+        """list of Nodes in preorder"""
+        self.entry = entry = {}
+        """dict of preorder number keyed by Node"""
+        self.parent = parent = []
+        """list of preorder numbers of the parents (-1 at the root)"""
+        self.depth = depth = []
+        """list of depths (0 at the root)"""
+        # preorder traversal without recursion, visiting successors in the
+        # same order as Branch.get_nodes():
+        stack = [(root, -1)]
+        while stack:
+            v, p = stack.pop()
+            entry[v] = len(nodes)
+            nodes.append(v)
+            parent.append(p)
+            depth.append(0 if p < 0 else depth[p] + 1)
+            if isinstance(v, nd.InnerNode):
+                k = entry[v]
+                stack.extend((w, k) for w in reversed(list(self.branch.get_successors(v))))
+        self.exit = exit = list(range(1, len(nodes) + 1))
+        """list of numbers one after the last node of each node's branch"""
+        for k in range(len(nodes) - 1, 0, -1):
+            p = parent[k]
+            if exit[k] > exit[p]:
+                exit[p] = exit[k]
+        # descendants end their branch no later than their ancestors, and 
+        # among nodes ending their branch at the same point, deeper ones come first:
+        self.postorder = [nodes[k] for k in sorted(range(len(nodes)), 
+                                                   key=lambda k: (exit[k], -depth[k]))]
+        """list of Nodes in postorder (each node after all its successors)"""
+        # type-partitioned views, each in preorder:
+        self.inner_nodes = [v for v in nodes if isinstance(v, nd.InnerNode)]
+        self.possibility_nodes = [v for v in nodes if isinstance(v, nd.PossibilityNode)]
+        self.probability_nodes = [v for v in nodes if isinstance(v, nd.ProbabilityNode)]
+        self.decision_nodes = [v for v in nodes if isinstance(v, nd.DecisionNode)]
+        self.leaf_nodes = [v for v in nodes if isinstance(v, nd.LeafNode)]
+        self.outcome_nodes = [v for v in nodes if isinstance(v, nd.OutcomeNode)]
+
+    @property
+    def is_stale(self):
+        """Whether some node of the branch was changed since the index was built"""
+        if self.generation != core.mutation_generation:
+            changed = core.get_mutations(self.branch.root.root, self.generation)
+            if any(ob in self.entry for ob in changed):
+                return True
+            # (only nodes outside the branch were changed):
+            self.generation = core.mutation_generation
+        return False
+
+    def __contains__(self, node):
+        return node in self.entry
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get_depth(self, node):
+        """Return the number of edges between the branch's root and node"""
+        return self.depth[self.entry[node]]
+
+    def get_parent(self, node):
+        """Return the predecessor of node within the branch, or None at the root"""
+        p = self.parent[self.entry[node]]
+        return None if p < 0 else self.nodes[p]
+
+    def is_ancestor(self, ancestor, node):
+        """Return whether node lies in the branch starting at ancestor
+        (including ancestor itself)"""
+        k, l = self.entry[ancestor], self.entry[node]
+        return k <= l < self.exit[k]
+
+    def get_ancestor(self, node, depth):
+        """Return the ancestor of node at a certain depth"""
+        k = self.entry[node]
+        assert 0 <= depth <= self.depth[k]
+        for _ in range(self.depth[k] - depth):
+            k = self.parent[k]
+        return self.nodes[k]
+
+    def get_path(self, node, start=0):
+        """Return the list of nodes from the ancestor at depth start to node"""
+        k = self.entry[node]
+        path = [None] * (self.depth[k] - start + 1)
+        for pos in range(len(path) - 1, -1, -1):
+            path[pos] = self.nodes[k]
+            k = self.parent[k]
+        return path
+
+    def get_branch_nodes(self, node):
+        """Return the list of nodes of the branch starting at node, in preorder"""
+        k = self.entry[node]
+        return self.nodes[k:self.exit[k]]
+
+    def __repr__(self):
+        return "TreeIndex(" + self.branch.name + ", " + str(len(self)) + " nodes)"
@@ -0,0 +1,211 @@
+import bisect
+import itertools
+import numpy as np
+
+from .core import Min, Max
+from . import nodes as nd
+from . import compiled as cp
+
+"""
+Backward-induction engine for the likelihood-based quantities of [AAFRA].
+
+Instead of enumerating scenarios, gamma and rho are computed from two vectors
+that hold values for all nodes and are obtained in one bottom-up pass each:
+- the guaranteed likelihood (minimum over all scenarios and strategies), and
+- the worst-case optimal avoidance likelihood (maximum over scenarios of the
+  minimum over the group's choices).
+The latter equals the maximum of omega over scenarios only if scenarios can be
+chosen independently at each node, which fails where some information set of
+players outside the group has several nodes in the same branch. Only there,
+joint choices are still enumerated, and at each node only for those 
+information sets whose nodes lie under different successors of the node, 
+while all other nodes are resolved by backward induction within each 
+enumerated case. The cost thus depends on the number of such "nontrivial" 
+information sets rather than on the size of the tree. Branch's minimization 
+over strategies uses a similar hybrid approach.
+
+References:
+[AAFRA] Hiller, S., Israel, J., & Heitzig, J. (2021). An Axiomatic Approach to Formalized Responsibility Ascription.
+"""
+
+def guaranteed_likelihoods(compiled):
+    """Return the vector of guaranteed likelihoods of an unacceptable outcome
+    (minimum over all choices of all players and nature) for all nodes"""
+    if "guaranteed" not in compiled.cache:
+        compiled.cache["guaranteed"] = compiled.backward()
+    return compiled.cache["guaranteed"]
+
+def worst_case_avoidance_likelihoods(compiled, group):
+    """Return the vector of minimal likelihoods of an unacceptable outcome
+    achievable by group in the worst case, i.e., minimizing at the group's
+    decision nodes and maximizing at all other decision and possibility nodes"""
+    key = ("worst_case_avoidance", group.players)
+    if key not in compiled.cache:
+        compiled.cache[key] = compiled.backward(
+            maximize=(compiled.node_type != cp.PROBABILITY) & ~compiled.group_mask(group))
+    return compiled.cache[key]
+
+def split_information_sets(compiled, group):
+    """Return a dict of the list of ids of those information sets of players 
+    outside group that have nodes under different successors of a node, keyed
+    by that node's number, and a dict of the sorted node numbers of each such
+    information set"""
+    key = ("split_information_sets", group.players)
+    if key not in compiled.cache:
+        split_at, ins_nodes = {}, {}
+        is_other = (compiled.node_type == cp.DECISION) & ~compiled.group_mask(group)
+        by_ins = {}
+        for k in np.flatnonzero(is_other).tolist():
+            by_ins.setdefault(int(compiled.information_set_id[k]), []).append(k)
+        for i, ks in by_ins.items():
+            # the lowest common ancestors of all pairs of nodes are those of 
+            # the pairs adjacent in preorder:
+            for k1, k2 in zip(ks[:-1], ks[1:]):
+                while compiled.depth[k2] > compiled.depth[k1]:
+                    k2 = int(compiled.parent[k2])
+                while k1 != k2:
+                    k1, k2 = int(compiled.parent[k1]), int(compiled.parent[k2])
+                if i not in split_at.get(k1, ()):
+                    split_at.setdefault(k1, []).append(i)
+                ins_nodes[i] = ks
+        compiled.cache[key] = split_at, ins_nodes
+    return compiled.cache[key]
+
+def scenario_coupled_nodes(compiled, group):
+    """Return a bool vector that is True at nodes whose branch contains
+    several nodes of the same information set of a player outside group"""
+    key = ("scenario_coupled", group.players)
+    if key not in compiled.cache:
+        coupled = np.zeros(len(compiled.nodes), dtype=bool)
+        # mark the lowest common ancestors of such nodes and all their ancestors:
+        for k in split_information_sets(compiled, group)[0]:
+            while k >= 0 and not coupled[k]:
+                coupled[k] = True
+                k = compiled.parent[k]
+        compiled.cache[key] = coupled
+    return compiled.cache[key]
+
+def nontrivial_information_sets(compiled, roots, mask):
+    """Return a bool vector over information sets that is True for those with
+    several nodes in the branches starting at the given node numbers, counting
+    only nodes where the bool vector mask is True"""
+    inside = np.zeros(len(compiled.nodes), dtype=bool)
+    for k in roots:
+        inside[k:compiled.subtree_end[k]] = True
+    ks = np.flatnonzero(inside & mask & (compiled.node_type == cp.DECISION))
+    return np.bincount(compiled.information_set_id[ks], 
+                       minlength=len(compiled.information_sets)) >= 2
+
+def _get_hybrid_risk(compiled, group, k, action):
+    """helper function: rho at the group's decision node number k where 
+    scenarios are coupled. 
+    Joint choices are enumerated only for those information sets of players
+    outside group that have nodes under different successors of k. Within 
+    each case, the largest shortfall is obtained by maximizing the likelihood
+    after action and minimizing it after the other actions, where other 
+    coupled information sets are treated in the same way at the node where 
+    their nodes split, and all uncoupled branches by backward induction"""
+    C = compiled
+    split_at, ins_nodes = split_information_sets(C, group)
+    coupled = scenario_coupled_nodes(C, group)
+    L = guaranteed_likelihoods(C)
+    U = worst_case_avoidance_likelihoods(C, group)
+    node_type = C.node_type.tolist()
+    ins_id = C.information_set_id.tolist()
+    offsets = C.offsets.tolist()
+    targets = C.targets.tolist()
+    subtree_end = C.subtree_end.tolist()
+    is_other = ((C.node_type == cp.DECISION) & ~C.group_mask(group)).tolist()
+    memo = {}
+
+    def concerns(w, i):
+        # whether the branch at w contains a node of information set i:
+        ks = ins_nodes[i]
+        j = bisect.bisect_left(ks, w)
+        return j < len(ks) and ks[j] < subtree_end[w]
+
+    def value(w, fixed, maximize):
+        # the extremal likelihood at w over scenarios consistent with the
+        # fixed choice codes, minimizing over the group's choices:
+        relevant = tuple((i, c) for i, c in fixed.items() if concerns(w, i))
+        if not coupled[w] and not relevant:
+            return U[w] if maximize else L[w]
+        key = (w, maximize, relevant)
+        if key not in memo:
+            # enumerate the information sets whose nodes split at w:
+            split = [i for i in split_at.get(w, ()) if i not in fixed]
+            cases = (combine(w, {**fixed, **dict(zip(split, choice))}, maximize)
+                     for choice in itertools.product(*(range(len(C.actions[i])) for i in split)))
+            memo[key] = Max(cases, bound=1) if maximize else Min(cases, bound=0)
+        return memo[key]
+
+    def combine(w, fixed, maximize):
+        successors = targets[offsets[w]:offsets[w+1]]
+        if is_other[w] and ins_id[w] in fixed:
+            return value(successors[fixed[ins_id[w]]], fixed, maximize)
+        values = [value(c, fixed, maximize) for c in successors]
+        if node_type[w] == cp.PROBABILITY:
+            return sum(p * x for p, x in zip(C.probabilities[offsets[w]:offsets[w+1]], values))
+        if maximize and (is_other[w] or node_type[w] == cp.POSSIBILITY):
+            return Max(values, bound=1)
+        return Min(values, bound=0)
+
+    # successors in edge order, so that position equals choice code at decision nodes:
+    successors = targets[offsets[k]:offsets[k+1]]
+    a = successors.index(C.index[C.nodes[k].consequences[action]])
+    split = split_at.get(k, [])
+
+    def get_shortfalls():
+        # the shortfall is largest if the scenario maximizes the likelihood 
+        # after action while minimizing it after the best other action:
+        for choice in itertools.product(*(range(len(C.actions[j])) for j in split)):
+            fixed = dict(zip(split, choice))
+            upper = value(successors[a], fixed, True)
+            others = [value(c, fixed, False) for b, c in enumerate(successors) if b != a]
+            yield Max([0, upper - Min(others)]) if len(others) > 0 else 0
+
+    return Max(get_shortfalls(), bound=1)
+
+def get_guaranteed_likelihood(tree, group=None, node=None):
+    """Compute gamma (see Branch.get_guaranteed_likelihood) via backward induction"""
+    C = tree.compile()
+    L = guaranteed_likelihoods(C)
+    if isinstance(node, nd.DecisionNode):
+        assert group is not None
+        nodes = tree.get_information_set_nodes(node.information_set) if node.player in group else [node]
+    else:
+        nodes = [node]
+    return cp._scalar(Min([L[C.index[c]] for c in nodes]))
+
+def get_risk(tree, group=None, node=None, action=None):
+    """Compute rho (see Branch.rho) via backward induction, enumerating
+    scenarios only where information sets of other players require it"""
+    C = tree.compile()
+    L = guaranteed_likelihoods(C)
+    U = worst_case_avoidance_likelihoods(C, group)
+    coupled = scenario_coupled_nodes(C, group)
+    if isinstance(node, nd.DecisionNode) and node.player in group:
+        nodes = tree.get_information_set_nodes(node.information_set)
+    else:
+        nodes = [node]
+    values = []
+    for c in nodes:
+        k = C.index[c]
+        if isinstance(c, nd.DecisionNode) and c.player in group and not coupled[k]:
+            # the shortfall is largest if the scenario maximizes the likelihood
+            # after action while minimizing it after the best other action:
+            others = [L[C.index[w]] for b, w in tree.get_consequences(c).items() if b != action]
+            values.append(Max([0, U[C.index[tree.get_consequences(c)[action]]] - Min(others)])
+                          if len(others) > 0 else 0)
+        elif isinstance(c, nd.DecisionNode) and c.player in group:
+            values.append(_get_hybrid_risk(C, group, k, action))
+        else:
+            # a scenario specifies only the branch after the action it chooses
+            # at c, so that all other branches are resolved optimistically,
+            # hence the shortfall is evaluated scenario by scenario:
+            at = [C.index[tree.get_consequences(c)[action]], k]
+            def evaluate(codes):
+                omega = C.evaluate_batch(codes, at)
+                return omega[:, 0] - omega[:, 1]
+            values.append(cp.reduce_batches(tree._iter_scenario_codes(c, group, {}), evaluate, Max, bound=1))
+    return cp._scalar(Max(values))
@@ -0,0 +1,104 @@
+import numpy as np
+
+try:
+    from scipy.optimize import milp as _milp, LinearConstraint, Bounds
+    from scipy.sparse import coo_matrix
+except ImportError:
+    _milp = None
+    print("solver='milp' unavailable since scipy python package is not available")
+
+from . import compiled as cp
+
+"""
+Mixed-integer linear programming (MILP) backend for minimizing likelihoods
+over joint pure strategies, solved by SciPy's HiGHS interface.
+
+Instead of enumerating strategies, there is one binary variable a[i,c] per
+information set i and action code c, with sum_c a[i,c] = 1, and one continuous
+variable w[k] in [0,1] per node k, bounded from below by
+- the outcome's badness at outcome nodes,
+- the expectation of the successors' w at probability nodes,
+- the chosen (or each) successor's w at resolved (or unresolved) possibility
+  nodes, and
+- w[successor] - (1 - a[i,c]) for each action c at decision nodes, which binds
+  only for the chosen action since all values lie in [0,1].
+Since the objective t >= w[k] (for k in the nodes to evaluate) is minimized,
+the optimal w are the likelihoods under the optimal strategy. Unlike a
+sequence-form program, this needs no perfect recall. The strategy is then read
+off the a and evaluated exactly, so that results equal those of enumeration.
+"""
+
+def minimize_over_strategies(compiled, at, base, allowed):
+    """Return the minimum over joint pure strategies of the maximum over the
+    nodes at of the likelihood of an unacceptable outcome, maximizing at
+    possibility nodes not resolved by base.
+    @param at: node numbers to evaluate
+    @param base: vector of choice codes resolving some possibility nodes
+    @param allowed: list of allowed action codes, one per information set
+    """
+    assert _milp is not None, "solver='milp' requires scipy"
+    C = compiled
+    assert not C.is_symbolic, "solver='milp' requires numeric probabilities"
+    # nodes in the branches to evaluate:
+    inside = np.zeros(len(C.nodes), dtype=bool)
+    for k in at:
+        inside[k:C.subtree_end[k]] = True
+    ks = np.flatnonzero(inside)
+    w = {k: pos for pos, k in enumerate(ks.tolist())}
+    # variables: w (one per node), a (one per information set and action), t:
+    a = {}
+    for k in ks[C.node_type[ks] == cp.DECISION]:
+        i = C.information_set_id[k]
+        if (i, 0) not in a:
+            for c in range(len(C.actions[i])):
+                a[i, c] = len(w) + len(a)
+    t = len(w) + len(a)
+    n_vars = t + 1
+    lb, ub = np.zeros(n_vars), np.ones(n_vars)
+    integrality = np.zeros(n_vars)
+    for (i, c), col in a.items():
+        integrality[col] = 1
+        if c not in allowed[i]:
+            ub[col] = 0
+    rows, cols, vals, lower, upper = [], [], [], [], []
+    def add(coefficients, lo, hi):
+        for col, val in coefficients:
+            rows.append(len(lower))
+            cols.append(col)
+            vals.append(val)
+        lower.append(lo)
+        upper.append(hi)
+    for k, col in w.items():
+        succ = C.targets[C.offsets[k]:C.offsets[k+1]].tolist()
+        ty = C.node_type[k]
+        if ty == cp.OUTCOME:
+            lb[col] = ub[col] = C.badness[k]
+        elif ty == cp.PROBABILITY:
+            add([(col, 1)] + [(w[s], -p) for s, p in zip(succ, C.probabilities[C.offsets[k]:C.offsets[k+1]])],
+                0, np.inf)
+        elif ty == cp.POSSIBILITY:
+            code = base[C.code_column[k]]
+            for s in ([succ[code]] if code >= 0 else succ):
+                add([(col, 1), (w[s], -1)], 0, np.inf)
+        else:
+            i = C.information_set_id[k]
+            for c, s in enumerate(succ):
+                add([(col, 1), (w[s], -1), (a[i, c], -1)], -1, np.inf)
+    for i in {i for (i, c) in a}:
+        add([(a[i, c], 1) for c in range(len(C.actions[i]))], 1, 1)
+    for k in at:
+        add([(t, 1), (w[k], -1)], 0, np.inf)
+    objective = np.zeros(n_vars)
+    objective[t] = 1
+    result = _milp(objective, integrality=integrality, bounds=Bounds(lb, ub),
+                   constraints=LinearConstraint(coo_matrix((vals, (rows, cols)), shape=(len(lower), n_vars)),
+                                                lower, upper),
+                   options={"mip_rel_gap": 0})
+    assert result.success, "MILP solver failed: " + result.message
+    # read off the strategy and evaluate it exactly:
+    codes = np.array(base, dtype=np.int64)
+    for (i, c), col in a.items():
+        if result.x[col] > 0.5:
+            codes[i] = c
+    values = C.evaluate_batch(codes[None, :], at, maximize=C.node_type == cp.POSSIBILITY)
+    return cp._scalar(values.max())
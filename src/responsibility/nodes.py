@@ -2,7 +2,7 @@ import sys
 import random
 import sympy as sp
 
-from .core import _AbstractObject, hasname
+from .core import _AbstractObject, hasname, register_mutation
 
 from .actions import Action
 from .outcomes import Outcome
@@ -31,8 +31,23 @@ class Node (_AbstractObject):
     @property
     def path(self):
         """List of Nodes from root to self"""
-        return [self] if self.predecessor is None else self.predecessor.path + [self]
-        # Note: cannot be cached since it is mutable!
+        path = []
+        v = self
+        while v is not None:
+            path.append(v)
+            v = v.predecessor
+        path.reverse()
+        return path
+        # Note: cannot be cached since it is mutable! 
+        # Within a fixed tree, use Branch.tree_index.get_path() instead.
+
+    @property
+    def root(self):
+        """Root Node of the whole tree containing this node"""
+        v = self
+        while v.predecessor is not None:
+            v = v.predecessor
+        return v
         
     _a_branch = None
     @property
@@ -48,15 +63,16 @@ class Node (_AbstractObject):
         """The whole (!) Tree containing this node 
         (not just the branch starting here)"""
         if self._a_tree is None:
-            self._a_tree = trees.Tree("T_" + self.name, ro=self.path[0])
+            self._a_tree = trees.Tree("T_" + self.name, ro=self.root)
         return self._a_tree
 
     def __repr__(self):
         """Short string representation"""
         return self.name if hasname(self) else "•"
 
-    def _to_lines(self, pre1, pre2):
-        """Generate one or more lines for the detailed description of a branch"""
+    def _to_lines(self, pre1, pre2, branch):
+        """Generate one or more lines for the detailed description of a branch,
+        showing the structure as seen from branch (see Branch.get_successors)"""
         return "\n" + pre1 + repr(self)
         
     _a_dotname = None
@@ -66,14 +82,15 @@ class Node (_AbstractObject):
             self._a_dotname = self.name if hasname(self) else "_" + str(random.random())
         return self._a_dotname
 
-    def _add_to_dot(self, dot):
-        """Add this node to the graphviz ("dot") file"""
+    def _add_to_dot(self, dot, branch):
+        """Add this node to the graphviz ("dot") file, showing the structure
+        as seen from branch"""
         dot.node(self._get_dotname(), 
                  (self.name if hasname(self) else "")
                  + ("\n" if hasname(self) and hasattr(self, "player") else "")
                  + (self.player.name if hasattr(self, "player") else ""),
                  shape=self._c_dotshape,
-                 penwidth="3.0" if getattr(self, 'highlight', False) else "1.0"
+                 penwidth="3.0" if branch._is_highlighted(self) else "1.0"
                  )
         
         
@@ -103,16 +120,16 @@ class InnerNode (Node):
     def __repr__(self):
         return Node.__repr__(self) + " …"
         
-    def _to_lines(self, pre1, pre2):
-        su = list(self.successors)
+    def _to_lines(self, pre1, pre2, branch):
+        su = list(branch.get_successors(self))
         return ("\n" + pre1 + Node.__repr__(self)
-                + "".join([v._to_lines(pre2 + "├─╴", pre2 + "│  ") for v in su[:-1]])
-                + su[-1]._to_lines(pre2 + "╰─╴", pre2 + "   "))
+                + "".join([v._to_lines(pre2 + "├─╴", pre2 + "│  ", branch) for v in su[:-1]])
+                + su[-1]._to_lines(pre2 + "╰─╴", pre2 + "   ", branch))
 
-    def _add_to_dot(self, dot):
-        Node._add_to_dot(self, dot)
-        for v in self.successors:
-            v._add_to_dot(dot)
+    def _add_to_dot(self, dot, branch):
+        Node._add_to_dot(self, dot, branch)
+        for v in branch.get_successors(self):
+            v._add_to_dot(dot, branch)
             dot.edge(self._get_dotname(), v._get_dotname())
 
 
@@ -172,24 +189,24 @@ class PossibilityNode (InnerNode):
         })
         return clone
 
-    def _to_lines(self, pre1, pre2):
-        su = list(self.successors)
+    def _to_lines(self, pre1, pre2, branch):
+        su = list(branch.get_successors(self))
         la = self.labels
         return ("\n" + pre1 + Node.__repr__(self)
                 + "".join([(
-                    v._to_lines(pre2 + "├─╴" + la[v] + "╶─╴", pre2 + "│     " + " "*len(la[v])) 
+                    v._to_lines(pre2 + "├─╴" + la[v] + "╶─╴", pre2 + "│     " + " "*len(la[v]), branch) 
                     if v in la and la[v] != "" 
-                    else v._to_lines(pre2 + "├─╴", pre2 + "│  ")
+                    else v._to_lines(pre2 + "├─╴", pre2 + "│  ", branch)
                     ) for v in su[:-1]])
-                + (su[-1]._to_lines(pre2 + "╰─╴" + la[su[-1]] + "╶─╴", pre2 + "      " + " "*len(la[su[-1]])) 
+                + (su[-1]._to_lines(pre2 + "╰─╴" + la[su[-1]] + "╶─╴", pre2 + "      " + " "*len(la[su[-1]]), branch) 
                    if su[-1] in la and la[su[-1]] != ""
-                   else su[-1]._to_lines(pre2 + "╰─╴", pre2 + "   "))
+                   else su[-1]._to_lines(pre2 + "╰─╴", pre2 + "   ", branch))
                 )
 
-    def _add_to_dot(self, dot):
-        Node._add_to_dot(self, dot)
-        for v in self.successors:
-            v._add_to_dot(dot)
+    def _add_to_dot(self, dot, branch):
+        Node._add_to_dot(self, dot, branch)
+        for v in branch.get_successors(self):
+            v._add_to_dot(dot, branch)
             dot.edge(self._get_dotname(), v._get_dotname(),
                      label=self.labels.get(v, ""))
 
@@ -272,18 +289,21 @@ class ProbabilityNode (InnerNode):
     def __repr__(self):
         return Node.__repr__(self) + " ⚄ …"
 
-    def _to_lines(self, pre1, pre2):
-        su = list(self.probabilities.items())
+    def _to_lines(self, pre1, pre2, branch):
+        su = list(branch.get_probabilities(self).items())
         return ("\n" + pre1 + Node.__repr__(self)
-                + "".join([v._to_lines(pre2 + "├─╴" + str(p) + "╶─╴", pre2 + "│     " + " "*len(str(p)) ) for v, p in su[:-1]])
-                + su[-1][0]._to_lines(pre2 + "╰─╴" + str(su[-1][1]) + "╶─╴", pre2 + "      " + " "*len(str(su[-1][1]))))
+                + "".join([v._to_lines(pre2 + "├─╴" + str(p) + "╶─╴", pre2 + "│     " + " "*len(str(p)), branch) for v, p in su[:-1]])
+                + su[-1][0]._to_lines(pre2 + "╰─╴" + str(su[-1][1]) + "╶─╴", pre2 + "      " + " "*len(str(su[-1][1])), branch))
             
-    def _add_to_dot(self, dot):
-        Node._add_to_dot(self, dot)
-        for v, p in self.probabilities.items():
-            v._add_to_dot(dot)
+    def _add_to_dot(self, dot, branch):
+        Node._add_to_dot(self, dot, branch)
+        probabilities = branch.get_probabilities(self)
+        # (as in clone, posteriors are labeled as such):
+        labels = self.labels if probabilities is self.probabilities else {v: "posterior" for v in probabilities}
+        for v, p in probabilities.items():
+            v._add_to_dot(dot, branch)
             dot.edge(self._get_dotname(), v._get_dotname(), 
-                     label=(self.labels[v]+": " if v in self.labels else "") + str(p))
+                     label=(labels[v]+": " if v in labels else "") + str(p))
 
 PrN = ProbabilityNode
 """Abbreviation for ProbabilityNode"""
@@ -368,6 +388,7 @@ class DecisionNode (InnerNode):
         """called when removed from the tree, performs cleanup"""
         super(DecisionNode, self).remove()
         self.information_set._i_nodes.remove(self)
+        register_mutation(self.information_set, self.root)
 
     _a_actions = None
     @property
@@ -388,43 +409,47 @@ class DecisionNode (InnerNode):
     def choice_history(self):
         """List of (InformationSet, Action) pairs from root to predecessor"""
         hist = []
-        for pos, v in enumerate(self.path[:-1]):
+        w, v = self, self.predecessor
+        while v is not None:
             if isinstance(v, DecisionNode) and v.player == self.player:
-                hist.append((v.information_set, v.get_action(self.path[pos+1])))
+                hist.append((v.information_set, v.get_action(w)))
+            w, v = v, v.predecessor
+        hist.reverse()
         return hist
         # Note: cannot be cached since it is mutable!
         
-    def _base_repr(self):
+    def _base_repr(self, branch=None):
+        nodes = self.information_set.nodes if branch is None else branch.get_information_set_nodes(self.information_set)
         return (Node.__repr__(self) 
-                + (" (" + self.information_set.name + ")" if len(self.information_set.nodes) > 1 else "")
+                + (" (" + self.information_set.name + ")" if len(nodes) > 1 else "")
                 + ": " 
                 + repr(self.player))
         
     def __repr__(self):
         return self._base_repr() + " …"
  
-    def _to_lines(self, pre1, pre2):
-        su = list(self.consequences.items())
-        return ("\n" + pre1 + self._base_repr()
-                + "".join([v._to_lines(pre2 + "├─╴" + repr(a) + "╶─╴", pre2 + "│     " + " "*len(repr(a))) for a, v in su[:-1]])
-                + su[-1][1]._to_lines(pre2 + "╰─╴" + repr(su[-1][0]) + "╶─╴", pre2 + "      " + " "*len(repr(su[-1][0]))))
-
-    def _add_to_dot(self, dot):
-        vs = list(self.information_set.nodes)
+    def _to_lines(self, pre1, pre2, branch):
+        su = list(branch.get_consequences(self).items())
+        return ("\n" + pre1 + self._base_repr(branch)
+                + "".join([v._to_lines(pre2 + "├─╴" + repr(a) + "╶─╴", pre2 + "│     " + " "*len(repr(a)), branch) for a, v in su[:-1]])
+                + su[-1][1]._to_lines(pre2 + "╰─╴" + repr(su[-1][0]) + "╶─╴", pre2 + "      " + " "*len(repr(su[-1][0])), branch))
+
+    def _add_to_dot(self, dot, branch):
+        vs = list(branch.get_information_set_nodes(self.information_set))
         if len(vs) > 1:
             if vs[0] == self:
                 with dot.subgraph(name="cluster_" + self.information_set.name,
                                   graph_attr={
                                       "label": self.information_set.name,
                                       "style": "dashed",
-                                      "penwidth": "3.0" if getattr(self.information_set, 'highlight', False) else "1.0"
+                                      "penwidth": "3.0" if branch._is_highlighted(self.information_set) else "1.0"
                                   }) as sub:
                     for v in vs:
-                        Node._add_to_dot(v, sub)
+                        Node._add_to_dot(v, sub, branch)
         else:
-            Node._add_to_dot(self, dot)
-        for a, v in self.consequences.items():
-            v._add_to_dot(dot)
+            Node._add_to_dot(self, dot, branch)
+        for a, v in branch.get_consequences(self).items():
+            v._add_to_dot(dot, branch)
             dot.edge(self._get_dotname(), v._get_dotname(), label=a.name)
 
 DeN = DecisionNode
@@ -469,10 +494,10 @@ class OutcomeNode (LeafNode):
     def __repr__(self):
         return Node.__repr__(self) + ": " + repr(self.outcome)
 
-    def _to_lines(self, pre1, pre2):
+    def _to_lines(self, pre1, pre2, branch):
         return "\n" + pre1 + repr(self)
 
-    def _add_to_dot(self, dot):
+    def _add_to_dot(self, dot, branch):
         dot.edge(self._get_dotname(), self.outcome.name, dir="none")
 
         
@@ -560,6 +585,8 @@ class InformationSet (_AbstractObject):
             v1.successors.remove(v1.consequences[a])
             v1.consequences[a].remove()
             del v1.consequences[a]
+            v1.actions.discard(a)
+            register_mutation(v1, v1.root)
 
 InS = InformationSet
 """Abbreviation for InformationSet"""
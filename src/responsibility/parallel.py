@@ -0,0 +1,109 @@
+import os
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+from . import batch
+
+"""
+Parallel evaluation of responsibility functions on a process pool.
+
+Work is sharded into independent pieces (groups of whole information sets of
+one tree, or whole trees of a batch), each of which is evaluated exactly as
+batch.evaluate() would do it, so results are identical to serial execution.
+
+Where the "fork" start method is available, workers inherit trees and functions
+from the parent process and receive only row ranges, so that responsibility
+functions defined by lambdas can be used. Elsewhere, trees and functions are
+sent to the workers and must therefore be picklable.
+"""
+
+_shared = {}
+"""dict of work descriptions keyed by job id, inherited by (or sent to) workers"""
+
+_job_ids = itertools.count()
+
+def _init_worker(job, payload):
+    """helper function"""
+    if payload is not None:
+        _shared[job] = payload
+
+def _evaluate_shard(job, pos, start, stop):
+    """helper function: evaluate rows start...stop-1 of the pos-th tree of a job"""
+    ctxs, prfs, rowss = _shared[job]
+    ctx = batch.EvaluationContext("ctx", tree=ctxs[pos].tree, memo_size=ctxs[pos].memo_size)
+    return batch._evaluate_rows(ctx, prfs, rowss[pos][start:stop])
+
+def _run(ctxs, prfs, rowss, shards, max_workers):
+    """helper function: evaluate shards (pos, start, stop) on a process pool
+    and return the values of each tree's rows"""
+    job = next(_job_ids)
+    _shared[job] = (ctxs, prfs, rowss)
+    if "fork" in mp.get_all_start_methods():
+        context, payload = mp.get_context("fork"), None
+    else:
+        context, payload = None, _shared[job]
+    values = [[] for ctx in ctxs]
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                                 initializer=_init_worker, initargs=(job, payload)) as pool:
+            futures = [(pos, pool.submit(_evaluate_shard, job, pos, start, stop))
+                       for (pos, start, stop) in shards]
+            # shards are in row order, so collecting them in order preserves it:
+            for pos, future in futures:
+                values[pos].extend(future.result())
+    finally:
+        del _shared[job]
+    return values
+
+def _get_max_workers(max_workers):
+    """helper function"""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    assert max_workers >= 1
+    return max_workers
+
+def evaluate_parallel(tree, prfs, groups=None, nodes=None, max_workers=None, n_shards=None):
+    """Like batch.evaluate(), but shards the information sets of the tree
+    across a process pool.
+    @param max_workers: number of worker processes (default: number of CPUs)
+    @param n_shards: number of shards (default: 4 per worker)
+    @return: ResponsibilityTable identical to that of batch.evaluate()
+    """
+    max_workers = _get_max_workers(max_workers)
+    ctx = batch._get_context(tree)
+    prfs = batch._get_prfs(prfs)
+    rows = batch._schedule(ctx, groups=groups, nodes=nodes)
+    if max_workers == 1 or len(rows) == 0:
+        return batch._make_table(ctx, prfs, rows, batch._evaluate_rows(ctx, prfs, rows))
+    # cut the rows into shards at information set boundaries, so that
+    # quantities shared by the nodes of an information set are computed once:
+    bounds = [r for r in range(1, len(rows))
+              if rows[r][1].information_set != rows[r-1][1].information_set]
+    n_shards = min(n_shards if n_shards is not None else 4 * max_workers, len(bounds) + 1)
+    cuts = [bounds[(k * len(bounds)) // n_shards] for k in range(1, n_shards)] if n_shards > 1 else []
+    starts = [0] + cuts
+    stops = cuts + [len(rows)]
+    values = _run([ctx], prfs, [rows],
+                  [(0, start, stop) for start, stop in zip(starts, stops) if start < stop],
+                  max_workers)[0]
+    return batch._make_table(ctx, prfs, rows, values)
+
+def evaluate_trees(trees, prfs, groups=None, max_workers=None):
+    """Apply batch.evaluate() to each of several trees, distributing
+    the trees across a process pool.
+    @param max_workers: number of worker processes (default: number of CPUs)
+    @return: list of ResponsibilityTables, one per tree
+    """
+    max_workers = _get_max_workers(max_workers)
+    ctxs = [batch._get_context(T) for T in trees]
+    prfs = batch._get_prfs(prfs)
+    rowss = [batch._schedule(ctx, groups=groups) for ctx in ctxs]
+    if max_workers == 1:
+        values = [batch._evaluate_rows(ctx, prfs, rows) for ctx, rows in zip(ctxs, rowss)]
+    else:
+        values = _run(ctxs, prfs, rowss,
+                      [(pos, 0, len(rows)) for pos, rows in enumerate(rowss)],
+                      max_workers)
+    return [batch._make_table(ctx, prfs, rows, vals)
+            for ctx, rows, vals in zip(ctxs, rowss, values)]
@@ -42,4 +42,11 @@ for r in range(n_rounds, -1, -1):
 
 T = Tree("repeated_public_good_2_of_3", ro=nodes[()])
 
+# the same game as a RepeatedGame, whose state is the running total of
+# contributions, which scales to many rounds:
+G = RepeatedGame("repeated_public_good_2_of_3", players=[i, j, k], actions=A,
+                 initial_state=0, transition=lambda total, profile: total + profile.count(C),
+                 n_rounds=n_rounds,
+                 outcome=lambda total: enough if total >= 2 * n_rounds else not_enough)
+
 T.make_globals()
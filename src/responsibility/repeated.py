@@ -0,0 +1,325 @@
+import itertools
+
+from .core import _AbstractObject, Min, Max
+from .players import Player, _get_group
+from .actions import Action
+from .outcomes import Outcome
+from . import nodes as nd
+from .simultaneous import make_simultaneous_move
+
+"""
+Compressed-state evaluation of repeated games, in which the same players
+simultaneously take actions in each of several rounds, and where all that
+matters about the history of action profiles is a compact state, e.g. the
+running total of contributions in a repeated public good game.
+
+Such a game is defined by an initial state, a transition function mapping a
+state and an action profile to the next state (or to a dict of next states and
+their probabilities), and a function mapping the final state to an Outcome.
+It corresponds to a tree in which, in each round, the players decide one after
+another as in make_simultaneous_move, each without knowing the others' actions
+in that round but knowing the whole history, i.e., there is one information
+set per history and player, containing all nodes at the player's position.
+
+Since all quantities at a node only depend on the round, the state, and the
+actions already taken in the current round, they are computed by backward
+induction over the graph of reachable states instead of over all histories,
+so that the cost grows linearly rather than exponentially with the number of
+rounds. Accordingly, each information set of the tree corresponds to a round,
+state, and player, and scenarios are given by dicts of Action keyed by such
+(round, state, player) triples. Since there are no possibility nodes,
+scenarios consist of the choices of players outside the group.
+
+A node is specified by the deciding player, the round t (starting at 0), the
+state, and the profile of actions taken by the previous players in the round
+(a tuple in the order of players), where a profile of None stands for the
+player's information set.
+"""
+
+
+class RepeatedGame (_AbstractObject):
+    """A repeated game with compressed states (see above).
+    @param players: list of Players, in the order in which the equivalent
+           tree lets them decide in each round
+    @param actions: list of Actions available to every player, or dict of
+           such lists keyed by Player
+    @param initial_state: hashable state before the first round
+    @param transition: function mapping a state and an action profile (tuple
+           in the order of players) to the next (hashable) state, or to a dict
+           of probabilities keyed by next state. To let it depend on the
+           round, include the round in the state.
+    @param n_rounds: number of rounds
+    @param outcome: function mapping the final state to an Outcome
+    """
+
+    _i_players = None
+    @property
+    def players(self):
+        """list of Players"""
+        return self._i_players
+
+    _i_actions = None
+    @property
+    def actions(self):
+        """dict of lists of Actions keyed by Player"""
+        return self._i_actions
+
+    _i_initial_state = None
+    @property
+    def initial_state(self):
+        """state before the first round"""
+        return self._i_initial_state
+
+    _i_transition = None
+    @property
+    def transition(self):
+        """function mapping a state and an action profile to the next state(s)"""
+        return self._i_transition
+
+    _i_n_rounds = None
+    @property
+    def n_rounds(self):
+        """number of rounds"""
+        return self._i_n_rounds
+
+    _i_outcome = None
+    @property
+    def outcome(self):
+        """function mapping the final state to an Outcome"""
+        return self._i_outcome
+
+    def validate(self):
+        self._i_players = list(self.players)
+        assert len(self.players) > 0, "players must not be empty"
+        for pl in self.players:
+            assert isinstance(pl, Player)
+        assert len(set(self.players)) == len(self.players), "players must be distinct"
+        if not isinstance(self.actions, dict):
+            self._i_actions = {pl: self.actions for pl in self.players}
+        self._i_actions = {pl: list(self.actions[pl]) for pl in self.players}
+        for acs in self.actions.values():
+            assert len(acs) > 0, "actions must not be empty"
+            for a in acs:
+                assert isinstance(a, Action)
+        assert callable(self.transition), "transition must be a function of state and profile"
+        assert isinstance(self.n_rounds, int) and self.n_rounds >= 0
+        assert callable(self.outcome), "outcome must be a function of the final state"
+        self._a_action_lists = [self.actions[pl] for pl in self.players]
+        self._a_position = {pl: p for p, pl in enumerate(self.players)}
+        self._a_successors = {}
+        self._a_states = None
+        self._a_values = {}
+
+    def _get_successors(self, state, profile):
+        """helper method: list of pairs of next state and probability (memoized)"""
+        key = (state, profile)
+        successors = self._a_successors.get(key)
+        if successors is None:
+            result = self.transition(state, profile)
+            successors = self._a_successors[key] = (
+                list(result.items()) if isinstance(result, dict) else [(result, 1)])
+        return successors
+
+    def get_states(self):
+        """Return the reachable state graph's nodes as a list (one entry per
+        round, including the final states after the last round) of lists of
+        states"""
+        if self._a_states is None:
+            states = [[self.initial_state]]
+            for t in range(self.n_rounds):
+                reached = {}
+                for s in states[t]:
+                    for profile in itertools.product(*self._a_action_lists):
+                        for s2, p in self._get_successors(s, profile):
+                            reached[s2] = None
+                states.append(list(reached))
+            self._a_states = states
+        return self._a_states
+
+    def to_tree(self, name=None):
+        """Return the equivalent Tree (with exponentially many nodes!),
+        e.g. to check results for few rounds"""
+        from .trees import Tree
+        name = name or self.name
+        def build(t, state, history):
+            if t == self.n_rounds:
+                return nd.OutcomeNode("w" + history, ou=self.outcome(state))
+            consequences = {}
+            for profile in itertools.product(*self._a_action_lists):
+                h = history + "".join(a.name for a in profile)
+                successors = self._get_successors(state, profile)
+                if len(successors) == 1:
+                    consequences[profile] = build(t + 1, successors[0][0], h)
+                else:
+                    consequences[profile] = nd.ProbabilityNode("p" + h, pr={
+                        build(t + 1, s2, h + "_" + str(c)): p for c, (s2, p) in enumerate(successors)})
+            return make_simultaneous_move("v" + history, players=self.players,
+                                          consequences=consequences)
+        return Tree(name, ro=build(0, self.initial_state, ""))
+
+    # backward induction over the state graph:
+
+    def _badness(self, state):
+        """helper method: 1 if the final outcome is unacceptable, else 0"""
+        ou = self.outcome(state)
+        assert isinstance(ou, Outcome)
+        return 0 if ou.is_acceptable else 1
+
+    def _stage(self, t, state, prefix, values, fixed):
+        """helper method: value in round t and state after the actions in
+        prefix, where the next players take the actions in fixed (a dict keyed
+        by position) or else minimize, given values of the next round's
+        states (a dict keyed by (t, state))"""
+        q = len(prefix)
+        if q == len(self.players):
+            return sum(p * values[t + 1, s2] for s2, p in self._get_successors(state, prefix))
+        if q in fixed:
+            return self._stage(t, state, prefix + (fixed[q],), values, fixed)
+        return Min((self._stage(t, state, prefix + (a,), values, fixed)
+                    for a in self._a_action_lists[q]), bound=0)
+
+    def _get_profiles(self, positions):
+        """helper method: iterate over dicts of actions keyed by positions"""
+        for profile in itertools.product(*(self._a_action_lists[q] for q in positions)):
+            yield dict(zip(positions, profile))
+
+    def _get_values(self, group=None):
+        """helper method: dict of the guaranteed likelihoods (if group is None)
+        or the group's worst-case avoidance likelihoods, keyed by (t, state)"""
+        key = None if group is None else group.players
+        if key not in self._a_values:
+            states = self.get_states()
+            values = {(self.n_rounds, s): self._badness(s) for s in states[self.n_rounds]}
+            others = [] if group is None else [q for q, pl in enumerate(self.players) if pl not in group]
+            for t in range(self.n_rounds - 1, -1, -1):
+                for s in states[t]:
+                    # players outside group commit to actions before group responds:
+                    values[t, s] = Max((self._stage(t, s, (), values, sigma)
+                                        for sigma in self._get_profiles(others)), bound=1)
+            self._a_values[key] = values
+        return self._a_values[key]
+
+    def _get_node(self, player, t, state, profile):
+        """helper method: position, state, and list of profiles of previous
+        players at the node (or information set if profile is None)"""
+        assert player in self._a_position, "player must be one of the players"
+        q = self._a_position[player]
+        assert isinstance(t, int) and 0 <= t < self.n_rounds, "t must be a round"
+        if state is None:
+            assert t == 0, "state required after the first round"
+            state = self.initial_state
+        if profile is None:
+            return q, state, list(itertools.product(*self._a_action_lists[:q]))
+        profile = tuple(profile)
+        assert len(profile) == q, "profile must consist of the previous players' actions"
+        return q, state, [profile]
+
+    # components of responsibility functions (see Branch):
+
+    def get_guaranteed_likelihood(self, player=None, group=None, t=0, state=None, profile=None):
+        """Guaranteed likelihood of an unacceptable outcome (gamma, see Branch)"""
+        group = _get_group(group=group)
+        if profile is None:
+            assert group is not None and player in group, "profile required unless player is in group"
+        q, state, prefixes = self._get_node(player, t, state, profile)
+        L = self._get_values()
+        return Min((self._stage(t, state, prefix, L, {}) for prefix in prefixes), bound=0)
+
+    gamma = get_guaranteed_likelihood
+
+    def _get_scenario_values(self, scenario):
+        """helper method: dict of the minimal likelihoods achievable given a
+        scenario, keyed by (t, state)"""
+        states = self.get_states()
+        values = {(self.n_rounds, s): self._badness(s) for s in states[self.n_rounds]}
+        for t in range(self.n_rounds - 1, -1, -1):
+            for s in states[t]:
+                values[t, s] = self._stage(t, s, (), values, self._get_fixed(scenario, t, s, 0))
+        return values
+
+    def _get_fixed(self, scenario, t, state, q):
+        """helper method: the scenario's actions in round t and state for
+        positions from q on, keyed by position"""
+        return {p: scenario[t, state, pl] for p, pl in enumerate(self.players)
+                if p >= q and (t, state, pl) in scenario}
+
+    def get_optimal_avoidance_likelihood(self, player=None, t=0, state=None, profile=None, scenario=None,
+                                         action=None):
+        """Minimal likelihood achievable given a scenario (omega, see Branch)
+        @param scenario: dict of Action keyed by (round, state, Player),
+               fixing the choices of some of the players from player on
+        @param action: optional action taken by player, to get omega at the
+               resulting successor node"""
+        q, state, (prefix,) = self._get_node(player, t, state, profile)
+        scenario = scenario or {}
+        if action is not None:
+            prefix += (action,)
+        return self._stage(t, state, prefix, self._get_scenario_values(scenario),
+                           self._get_fixed(scenario, t, state, len(prefix)))
+
+    omega = get_optimal_avoidance_likelihood
+
+    def Delta_omega(self, player=None, t=0, state=None, profile=None, scenario=None, action=None):
+        """Shortfall in minimizing likelihood due to taking action (see Branch)"""
+        return (self.omega(player=player, t=t, state=state, profile=profile, scenario=scenario, action=action)
+                - self.omega(player=player, t=t, state=state, profile=profile, scenario=scenario))
+
+    def rho(self, group=None, player=None, action=None, t=0, state=None, profile=None):
+        """Risk taken by taking action (see Branch), maximized over the
+        information set if profile is None"""
+        group = _get_group(group=group)
+        assert group is not None
+        if profile is None:
+            assert player in group, "profile required unless player is in group"
+        q, state, prefixes = self._get_node(player, t, state, profile)
+        L = self._get_values()
+        # a scenario at the node of a player outside group fixes that player's
+        # choice and only the branch after it, so that after any other action, 
+        # later rounds are resolved optimally as well:
+        U = self._get_values(group) if player in group else L
+        # the later players outside group form the scenario in this round,
+        # while it can be chosen independently in later rounds' states:
+        others = [p for p in range(q + 1, len(self.players)) if self.players[p] not in group]
+        values = [0]
+        for prefix in prefixes:
+            for sigma in self._get_profiles(others):
+                # the shortfall is largest if the scenario maximizes the
+                # likelihood after action while minimizing it after the best
+                # other action:
+                alternatives = [self._stage(t, state, prefix + (b,), L, sigma)
+                                for b in self._a_action_lists[q] if b != action]
+                if len(alternatives) > 0:
+                    values.append(self._stage(t, state, prefix + (action,), U, sigma) - Min(alternatives))
+        return Max(values)
+
+    def rho_min(self, group=None, player=None, t=0, state=None, profile=None):
+        """Minimal risk (see Branch)"""
+        return Min([self.rho(group=group, player=player, action=a, t=t, state=state, profile=profile)
+                    for a in self.actions[player]])
+
+    def cooperatively_achievable_likelihood(self, player=None, t=0, state=None, profile=None,
+                                            fixed_action=None):
+        """Likelihood of an unacceptable outcome, minimized over all players'
+        strategies in which player takes the optional fixed_action (see Branch)"""
+        q, state, (prefix,) = self._get_node(player, t, state, profile)
+        if fixed_action is not None:
+            prefix += (fixed_action,)
+        return self._stage(t, state, prefix, self._get_values(), {})
+
+    def cooperatively_achievable_worst_case_likelihood(self, player=None, t=0, state=None,
+                                                       fixed_action=None):
+        """Minimum over all players' strategies in which player takes the
+        optional fixed_action of the worst-case likelihood over the player's
+        information set (see Branch). Since the remaining players in the round
+        have a single information set each, a strategy fixes their actions,
+        while it can be chosen independently in later rounds' states."""
+        q, state, prefixes = self._get_node(player, t, state, None)
+        L = self._get_values()
+        fixed = self._a_action_lists[q] if fixed_action is None else [fixed_action]
+        rests = itertools.product(fixed, *self._a_action_lists[q + 1:])
+        return Min((Max((self._stage(t, state, prefix + rest, L, {}) for prefix in prefixes), bound=1)
+                    for rest in rests), bound=0)
+
+    def __repr__(self):
+        return ("RepeatedGame(" + self.name + ", " + str(len(self.players)) + " players, "
+                + str(self.n_rounds) + " rounds)")
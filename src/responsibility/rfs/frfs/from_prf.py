@@ -6,7 +6,7 @@ def frf_from_max_prf(name, desc=None, prf=None):
     PRFs at the node."""
     assert isinstance(prf, PRF)
     return FRF(name, desc=desc, function=(
-        lambda T, G, v: Max([prf(T, G, v, a) for a in v.actions])
+        lambda T, G, v: Max([prf(T, G, v, a) for a in T.get_actions(v)])
     ))
     
 def frf_from_max_ins_max_prf(name, desc=None, prf=None):
@@ -15,8 +15,8 @@ def frf_from_max_ins_max_prf(name, desc=None, prf=None):
     assert isinstance(prf, PRF)
     return FRF(name, desc=desc, function=(
         lambda T, G, v: Max([prf(T, G, v2, a) 
-                             for v2 in v.ins.nodes
-                             for a in v2.actions])
+                             for v2 in T.get_information_set_nodes(v.ins)
+                             for a in T.get_actions(v2)])
     ))
     
 def frf_from_maxdiff_prf(name, desc=None, prf=None):
@@ -24,7 +24,7 @@ def frf_from_maxdiff_prf(name, desc=None, prf=None):
     all actions' PRFs at the node."""
     assert isinstance(prf, PRF)
     def frf(T, G, v):
-        values = [prf(T, G, v, a) for a in v.actions]
+        values = [prf(T, G, v, a) for a in T.get_actions(v)]
         return Max(values) - Min(values)
     return FRF(name, desc=desc, function=frf)
 
@@ -33,8 +33,8 @@ def frf_from_max_ins_maxdiff_prf(name, desc=None, prf=None):
     all actions' PRFs at any node in the node's information set."""
     assert isinstance(prf, PRF)
     def frf0(T, G, v):
-        values = [prf(T, G, v, a) for a in v.actions]
+        values = [prf(T, G, v, a) for a in T.get_actions(v)]
         return Max(values) - Min(values)
     return FRF(name, desc=desc, function=(
-        lambda T, G, v, a: Max([frf0(T, G, v2) for v2 in v.ins.nodes])
+        lambda T, G, v, a: Max([frf0(T, G, v2) for v2 in T.get_information_set_nodes(v.ins)])
     ))
@@ -20,8 +20,9 @@ r_risk = PRF(
     desc="Worst-case shortfall in scenario-based minimization of likelihood: by how much has the scenario-specific minimally achievable likelihood increased from this node to the next due to taking the given action, in that scenario where this shortfall is largest? (max over scen. of min over strat. of L)",
     function=(
         lambda T, G, v, a:
-            Max([T.Delta_omega(node=v, scenario=zeta, action=a)
-                 for zeta in T.get_scenarios(node=v, group=G)])
+            # = Max([T.Delta_omega(node=v, scenario=zeta, action=a)
+            #        for zeta in T.get_scenarios(node=v, group=G)]):
+            T.rho(group=G, node=v, action=a)
     ))
     
 r_negl = PRF(
@@ -37,6 +38,6 @@ r_like_KSym = PRF(
     desc="Increase in guaranteed likelihood, maximized over possible current nodes: by how much might the guaranteed likelihood have increased from this node to the next due to taking the given action, given the uncertainty about the current node?",
     function=(
         lambda T, G, v, a: 
-            Max([r_like(T, G, v2, a) for v2 in v.information_set.nodes])
+            Max([r_like(T, G, v2, a) for v2 in T.get_information_set_nodes(v.information_set)])
     ))
 
@@ -8,12 +8,12 @@ r_coop = PRF(
     desc="Worst-case increase in cooperatively achievable likelihood",
     function=(
         lambda T, unused_G, v, a:
-            Max([
+            Max((
                 T.cooperatively_achievable_likelihood(
                     node=v, env_scenario=eps,
                     fixed_choices={v.information_set: a}) 
                 - T.cooperatively_achievable_likelihood(
                     node=v, env_scenario=eps)
                 for eps in T.get_scenarios(node=v, group=T.players)
-            ])
+            ), bound=1)
     ))
@@ -10,7 +10,7 @@ def domination_strength(T, a1, a2, ins):
     domination, i.e., the maximal difference in likelihoods
     w.r.t. all sets of not strictly (!) dominated transitions"""
     strength = 0
-    for v in ins.nodes:
+    for v in T.get_information_set_nodes(ins):
         for tau in T._get_transitions(node=v, exclude_types=(ProbabilityNode,), 
                                       exclude_group=[], exclude_nodes=[v]):
             l1 = T._get_expectation(node=v, transitions={**tau, ins: a1}, resolve=Max)
@@ -27,8 +27,10 @@ def shortfall(tree, action, ins):
     T = tbrt(tree, ins)
     action = T.subs[action]
     ins = T.subs[ins]
-    return max([domination_strength(T, a1, action, ins) 
-                for a1 in ins.actions if a1 != action])
+    # (one sweep over the transition sets gives the strengths of all actions):
+    actions, strict, weak, strength = domination_matrices(ins, action=action, tree=T)
+    k = actions.index(action)
+    return max([strength[k1, k] for k1 in range(len(actions)) if k1 != k])
               
 r_stbr = PRF("r_stbr",
              desc="shortfall in trust-based-reduced tree",
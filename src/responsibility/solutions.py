@@ -76,3 +76,169 @@ class Strategy (_AbstractObject):
         
 Strat = Strategy
 """Abbreviation for Strategy"""
+
+
+class Constraint (_AbstractObject):
+    """Restricts the strategies considered by Branch.get_strategies and 
+    Branch.count_strategies before they are enumerated.
+    @param fixed: optional dict of InformationSet: Action to be taken there
+    @param excluded: optional dict of InformationSet: set of Actions not to be 
+           taken there
+    @param excluded_nodes: optional set of Nodes whose branches are not explored, 
+           so that no choices are made there
+    @param required: whether strategies must actually reach and hence contain
+           all information sets in fixed (as in Strategy.includes), rather than 
+           only respect fixed where they reach them (default: False)
+    """
+
+    _i_fixed = None
+    @property
+    def fixed(self):
+        """dict of InformationSet: Action"""
+        return self._i_fixed
+
+    _i_excluded = None
+    @property
+    def excluded(self):
+        """dict of InformationSet: set of Actions"""
+        return self._i_excluded
+
+    _i_excluded_nodes = None
+    @property
+    def excluded_nodes(self):
+        """set of Nodes"""
+        return self._i_excluded_nodes
+
+    _i_required = False
+    @property
+    def required(self):
+        """bool"""
+        return self._i_required
+
+    def validate(self):
+        if self._i_fixed is None:
+            self._i_fixed = {}
+        if self._i_excluded is None:
+            self._i_excluded = {}
+        if self._i_excluded_nodes is None:
+            self._i_excluded_nodes = set()
+        for ins, ac in self.fixed.items():
+            assert isinstance(ins, nodes.InformationSet), "fixed maps InformationSets to actions"
+            assert ac in ins.actions, "fixed maps information sets to feasible actions"
+        for ins, acs in self.excluded.items():
+            assert isinstance(ins, nodes.InformationSet), "excluded maps InformationSets to sets of actions"
+            assert set(acs) <= ins.actions, "excluded maps information sets to sets of feasible actions"
+        for v in self.excluded_nodes:
+            assert isinstance(v, nodes.Node), "excluded_nodes must be Nodes"
+        assert isinstance(self.required, bool)
+
+    def refined(self, fixed_choices):
+        """Return a Constraint that additionally fixes the given choices"""
+        return Constraint(self.name, fixed={**self.fixed, **fixed_choices}, excluded=self.excluded,
+                          excluded_nodes=self.excluded_nodes, required=self.required)
+
+    @property
+    def key(self):
+        """hashable representation, e.g. for memoization"""
+        return (frozenset(self.fixed.items()), 
+                frozenset((ins, frozenset(acs)) for ins, acs in self.excluded.items()),
+                frozenset(self.excluded_nodes), self.required)
+
+
+class CompactSolution (object):
+    """Compact encoding of a partial solution by a tuple of choice codes of a 
+    CompiledTree (one action or successor position per information set and 
+    per possibility node, or -1 if unresolved, see compiled.py).
+    Parent class of CompactScenario and CompactStrategy, which enumerators
+    yield instead of Scenario and Strategy objects if asked to, and which are 
+    converted into these (and their dicts built) only on demand.
+    @param compiled: the CompiledTree
+    @param codes: tuple of choice codes
+    """
+
+    __slots__ = ("compiled", "codes", "_mask", "_transitions")
+
+    def __init__(self, compiled, codes):
+        self.compiled = compiled
+        self.codes = codes
+        self._mask = None
+        self._transitions = None
+
+    @property
+    def mask(self):
+        """int whose i-th bit is set iff the i-th code is resolved"""
+        if self._mask is None:
+            self._mask = sum(1 << i for i, c in enumerate(self.codes) if c >= 0)
+        return self._mask
+
+    @property
+    def transitions(self):
+        """dict of InformationSet: Action and InnerNode: successor Node"""
+        if self._transitions is None:
+            self._transitions = self.compiled.decode(self.codes)
+        return self._transitions
+
+    def overlaps(self, other):
+        """Return whether both solutions resolve some common information set or node"""
+        return (self.mask & other.mask) != 0
+
+    def includes(self, choices):
+        """Return whether the given choices (a dict of transitions) are part of this solution"""
+        codes = self.compiled.encode_tuple(choices)
+        return all(c < 0 or c == c0 for c, c0 in zip(codes, self.codes))
+
+    def __eq__(self, other):
+        return type(self) == type(other) and self.codes == other.codes
+
+    def __hash__(self):
+        return hash(self.codes)
+
+    def __repr__(self):
+        return self.__class__.__name__ + str(self.codes)
+
+
+class CompactScenario (CompactSolution):
+    """Compact encoding of a Scenario (see CompactSolution)
+    @param current_node_id: number of the current node in the CompiledTree
+    """
+
+    __slots__ = ("current_node_id",)
+
+    def __init__(self, compiled, codes, current_node_id):
+        super(CompactScenario, self).__init__(compiled, codes)
+        self.current_node_id = current_node_id
+
+    @property
+    def current_node(self):
+        """Node"""
+        return self.compiled.nodes[self.current_node_id]
+
+    def sub_scenario(self, action):
+        """Return the subscenario in which action was taken in current_node"""
+        return CompactScenario(self.compiled, self.codes,
+                               self.compiled.index[self.current_node.consequences[action]])
+
+    def to_scenario(self, name="_"):
+        """Return the equivalent Scenario"""
+        return Scenario(name, current_node=self.current_node, transitions=self.transitions)
+
+    def __eq__(self, other):
+        return CompactSolution.__eq__(self, other) and self.current_node_id == other.current_node_id
+
+    def __hash__(self):
+        return hash((self.codes, self.current_node_id))
+
+
+class CompactStrategy (CompactSolution):
+    """Compact encoding of a Strategy (see CompactSolution)"""
+
+    __slots__ = ()
+
+    @property
+    def choices(self):
+        """dict of InformationSet: Action"""
+        return self.transitions
+
+    def to_strategy(self, name="_"):
+        """Return the equivalent Strategy"""
+        return Strategy(name, choices=self.transitions)
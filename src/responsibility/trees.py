@@ -7,16 +7,25 @@ try:
 except:
     print("Branch.draw() unavailable since graphviz python package is not available")
 
-from .core import _AbstractObject, hasname, update_consistently, profile, Max, Min
+from .core import _AbstractObject, hasname, update_consistently, profile, Max, Min, LRUCache
 from .players import Group, _get_group
-from .solutions import PartialSolution, Scenario, Strategy
+from .solutions import PartialSolution, Scenario, Strategy, CompactScenario, CompactStrategy, Constraint
+from . import core
 from . import nodes as nd
+from . import compiled as cp
+from . import index as ix
+from . import induction as ind
 
 """
 References:
 [AAFRA] Hiller, S., Israel, J., & Heitzig, J. (2021). An Axiomatic Approach to Formalized Responsibility Ascription.
 """
 
+def _named(objects):
+    """helper function: dict of named objects keyed by name"""
+    return {ob.name: ob for ob in objects if hasname(ob)}
+
+
 class Branch (_AbstractObject):
     """Represents that part of the tree that starts at some anchor node that
     serves as the branch's "root".
@@ -59,6 +68,8 @@ class Branch (_AbstractObject):
             subs = {}
         return Tree((name if name is not None else "clone_of_" + self.name),
                     desc=(desc if desc is not None else self.desc), 
+                    cache_size=self.cache_size,
+                    share_subtrees=self.share_subtrees,
                     ro=self.root.clone(subs=subs, keep=keep), 
                     subs=subs) 
         
@@ -68,93 +79,88 @@ class Branch (_AbstractObject):
     @property
     def named_nodes(self):
         """dict of named nodes keyed by name"""
+        index = self.tree_index
         if self._a_named_nodes is None:
-            self._a_named_nodes = {self.root.name: self.root} if hasname(self.root) else {} 
-            if hasattr(self.root, 'successors'):
-                for v in self.root.successors:
-                    self._a_named_nodes.update(v.branch.named_nodes)
+            self._a_named_nodes = _named(index.nodes)
         return self._a_named_nodes
 
     _a_named_inner_nodes = None
     @property
     def named_inner_nodes(self):
+        index = self.tree_index
         if self._a_named_inner_nodes is None:
-            self._a_named_inner_nodes = {n: v
-                for n, v in self.named_nodes.items() 
-                if isinstance(v, nd.InnerNode)} 
+            self._a_named_inner_nodes = _named(index.inner_nodes)
         return self._a_named_inner_nodes
         
     _a_named_possibility_nodes = None
     @property
     def named_possibility_nodes(self):
+        index = self.tree_index
         if self._a_named_possibility_nodes is None:
-            self._a_named_possibility_nodes = {n: v
-                for n, v in self.named_nodes.items() 
-                if isinstance(v, nd.PossibilityNode)} 
+            self._a_named_possibility_nodes = _named(index.possibility_nodes)
         return self._a_named_possibility_nodes
         
     _a_named_probability_nodes = None
     @property
     def named_probability_nodes(self): 
+        index = self.tree_index
         if self._a_named_probability_nodes is None:
-            self._a_named_probability_nodes = {n: v
-                for n, v in self.named_nodes.items() 
-                if isinstance(v, nd.ProbabilityNode)} 
+            self._a_named_probability_nodes = _named(index.probability_nodes)
         return self._a_named_probability_nodes
 
     _a_named_decision_nodes = None
     @property
     def named_decision_nodes(self): 
+        index = self.tree_index
         if self._a_named_decision_nodes is None:
-            self._a_named_decision_nodes = {n: v
-                for n, v in self.named_nodes.items() 
-                if isinstance(v, nd.DecisionNode)} 
+            self._a_named_decision_nodes = _named(index.decision_nodes)
         return self._a_named_decision_nodes
 
     _a_named_players = None
     @property
     def named_players(self):
         """dict of named named_players keyed by name"""
+        index = self.tree_index
         if self._a_named_players is None:
             self._a_named_players = {
                 v.player.name: v.player 
-                for v in self.get_nodes() 
-                if hasattr(v, "player") and hasname(v.player)}
+                for v in index.decision_nodes 
+                if hasname(v.player)}
         return self._a_named_players
     
     _a_named_outcomes = None
     @property
     def named_outcomes(self):
         """dict of named named_outcomes keyed by name"""
+        index = self.tree_index
         if self._a_named_outcomes is None:
             self._a_named_outcomes = {
                 v.outcome.name: v.outcome 
-                for v in self.get_nodes() 
-                if hasattr(v, "outcome") and hasname(v.outcome)}
+                for v in index.outcome_nodes 
+                if hasname(v.outcome)}
         return self._a_named_outcomes
         
     _a_named_leaf_nodes = None
     @property
     def named_leaf_nodes(self):
+        index = self.tree_index
         if self._a_named_leaf_nodes is None:
-            self._a_named_leaf_nodes = {n: v
-                for n, v in self.named_nodes.items() 
-                if isinstance(v, nd.LeafNode)} 
+            self._a_named_leaf_nodes = _named(index.leaf_nodes)
         return self._a_named_leaf_nodes
         
     _a_named_outcome_nodes = None
     @property
     def named_outcome_nodes(self): 
+        index = self.tree_index
         if self._a_named_outcome_nodes is None:
-            self._a_named_outcome_nodes = {n: v
-                for n, v in self.named_nodes.items() 
-                if isinstance(v, nd.OutcomeNode)} 
+            self._a_named_outcome_nodes = _named(index.outcome_nodes)
         return self._a_named_outcome_nodes
 
     _a_named_information_sets = None
     @property
     def named_information_sets(self):
         """dict of named named_information_sets keyed by name"""
+        self.tree_index  # drops this cache if stale
         if self._a_named_information_sets is None:
             self._a_named_information_sets = {
                 v.information_set.name: v.information_set
@@ -165,20 +171,22 @@ class Branch (_AbstractObject):
     _a_named_actions = None
     @property
     def named_actions(self):
+        self.tree_index  # drops this cache if stale
         if self._a_named_actions is None:
             self._a_named_actions = {a.name: a
                 for v in self.named_nodes.values() if hasattr(v, "actions")
-                for a in v.actions}
+                for a in self.get_actions(v)}
         return self._a_named_actions
 
     _a_named_symbols = None
     @property    
     def named_symbols(self):
         """dict of all symbols occurring in probabilities"""
+        self.tree_index  # drops this cache if stale
         if self._a_named_symbols is None:
             self._a_named_symbols = {}
             for v in self.get_probability_nodes():
-                for p in v.probabilities.values():
+                for p in self.get_probabilities(v).values():
                     if isinstance(p, sp.Expr):
                         self._a_named_symbols.update({
                             s.name: s 
@@ -190,6 +198,7 @@ class Branch (_AbstractObject):
     @property    
     def players(self):
         """set of all (!) players, named or not"""
+        self.tree_index  # drops this cache if stale
         if self._a_players is None:
             self._a_players = {v.player for v in self.get_decision_nodes()}
         return self._a_players
@@ -197,37 +206,30 @@ class Branch (_AbstractObject):
     # generators for objects, named or not:
         
     def get_nodes(self):
-        """yield all (!) nodes, named or not"""
-        yield self.root
-        if hasattr(self.root, 'successors'):
-            for v in self.root.successors:
-                for v2 in v.branch.get_nodes():
-                    yield v2
+        """yield all (!) nodes, named or not, in preorder"""
+        yield from self.tree_index.nodes
+
+    def get_nodes_postorder(self):
+        """yield all (!) nodes, named or not, each after all its successors"""
+        yield from self.tree_index.postorder
 
     def get_inner_nodes(self):
         """yield all (!) inner nodes, named or not"""
-        for v in self.get_nodes():
-            if isinstance(v, nd.InnerNode):
-                yield v 
+        yield from self.tree_index.inner_nodes
 
     def get_possibility_nodes(self):
         """yield all (!) possibility nodes, named or not"""
-        for v in self.get_nodes():
-            if isinstance(v, nd.PossibilityNode):
-                yield v 
+        yield from self.tree_index.possibility_nodes
 
     def get_probability_nodes(self):
         """yield all (!) probability nodes, named or not"""
-        for v in self.get_nodes():
-            if isinstance(v, nd.ProbabilityNode):
-                yield v 
+        yield from self.tree_index.probability_nodes
 
     def get_decision_nodes(self, player_or_group=None):
         """yield all (!) decision nodes, named or not, optionally restricted
         to those of a certain player or group"""
-        for v in self.get_nodes():
-            if isinstance(v, nd.DecisionNode) and (
-                    player_or_group is None
+        for v in self.tree_index.decision_nodes:
+            if (player_or_group is None
                     or v.player == player_or_group 
                     or (isinstance(player_or_group, Group) 
                         and v.player in player_or_group)):
@@ -235,22 +237,18 @@ class Branch (_AbstractObject):
 
     def get_leaf_nodes(self):
         """yield all (!) leaf nodes, named or not"""
-        for v in self.get_nodes():
-            if isinstance(v, nd.LeafNode):
-                yield v 
+        yield from self.tree_index.leaf_nodes
 
     def get_outcome_nodes(self):
         """yield all (!) outcome nodes, named or not"""
-        for v in self.get_nodes():
-            if isinstance(v, nd.OutcomeNode):
-                yield v 
+        yield from self.tree_index.outcome_nodes
 
     def get_information_sets(self, player_or_group=None):
         """yield all (!) information sets, named or not, optionally restricted
         to those of a certain player or group"""
         for v in self.get_decision_nodes(player_or_group):
             ins = v.information_set
-            if ins.nodes[0] == v:
+            if self.get_information_set_nodes(ins)[0] == v:
                 yield ins
 
     def get_outcomes(self):
@@ -259,7 +257,33 @@ class Branch (_AbstractObject):
             ou = v.outcome
             if ou.nodes[0] == v:
                 yield ou
-            
+
+    # structure of nodes as seen from this branch, which all evaluation
+    # engines use instead of the nodes' own attributes, so that a TreeView
+    # (see views.py) can hide parts of a tree by overriding these methods:
+
+    def get_successors(self, node):
+        """Return the successors of an inner node (a set or list)"""
+        return node.successors
+
+    def get_consequences(self, node):
+        """Return the dict of successors keyed by Action of a decision node"""
+        return node.consequences
+
+    def get_probabilities(self, node):
+        """Return the dict of probabilities keyed by successor of a
+        probability node"""
+        return node.probabilities
+
+    def get_actions(self, node_or_information_set):
+        """Return the set of possible Actions of a decision node or
+        information set"""
+        return node_or_information_set.actions
+
+    def get_information_set_nodes(self, information_set):
+        """Return the list of nodes of an information set"""
+        return information_set.nodes
+
     # generators for solutions:
     
     #@profile
@@ -290,7 +314,7 @@ class Branch (_AbstractObject):
                     ins = node.information_set
                     if ins in fixed_transitions:
                         action = fixed_transitions[ins]
-                        successor = node.consequences[action]
+                        successor = self.get_consequences(node)[action]
                         for transitions in self._get_transitions(
                                 node=successor, include_types=include_types, exclude_types=exclude_types, 
                                 include_group=include_group, exclude_group=exclude_group, consistently=consistently):
@@ -304,14 +328,14 @@ class Branch (_AbstractObject):
                             transitions[node] = successor
                             yield transitions                    
                     else:                    
-                        for action, successor in node.consequences.items():
+                        for action, successor in self.get_consequences(node).items():
                             for transitions in self._get_transitions(
                                     node=successor, include_types=include_types, exclude_types=exclude_types, 
                                     include_group=include_group, exclude_group=exclude_group, consistently=consistently):
                                 transitions[ins] = action
                                 yield transitions
                 else:
-                    for successor in node.successors:
+                    for successor in self.get_successors(node):
                         for transitions in self._get_transitions(
                                 node=successor, include_types=include_types, exclude_types=exclude_types, 
                                 include_group=include_group, exclude_group=exclude_group, consistently=consistently):
@@ -319,7 +343,7 @@ class Branch (_AbstractObject):
                             yield transitions
             else:
                 # yield from cartesian product of strategies of all successors:
-                su = [fixed_transitions[node]] if node in fixed_transitions else node.successors
+                su = [fixed_transitions[node]] if node in fixed_transitions else self.get_successors(node)
                 cartesian_product = itertools.product(*(
                     self._get_transitions(
                         node=successor, include_types=include_types, exclude_types=exclude_types, 
@@ -369,10 +393,11 @@ class Branch (_AbstractObject):
                 include_group=include_group, exclude_group=exclude_group, consistently=consistently):
             yield PartialSolution("_", transitions=transitions)
         
-    def get_scenarios(self, node=None, player=None, group=None, fixed_transitions=None):
+    def get_scenarios(self, node=None, player=None, group=None, fixed_transitions=None, compact=False):
         """Return all scenarios for the given player or group starting at some 
         node, potentially restricted to the optional dict of fixed_transitions.
-        @return: generator for Scenario objects   
+        @param compact: whether to yield CompactScenarios instead 
+        @return: generator for Scenario (or CompactScenario) objects   
         """
         if fixed_transitions is None:
             fixed_transitions = {}
@@ -380,88 +405,212 @@ class Branch (_AbstractObject):
         assert group is not None
         if isinstance(node, nd.DecisionNode) and node.player in group:
             # yield from concatenation of scenarios of all nodes in same information set:
-            nodes = node.information_set.nodes
+            nodes = self.get_information_set_nodes(node.information_set)
         else:
             nodes = {node}
+        if compact:
+            C = self.compile()
+            for v in nodes:
+                for codes in self._iter_scenario_codes(v, group, fixed_transitions):
+                    yield CompactScenario(C, tuple(codes), C.index[v])
+            return
         for v in nodes: 
             for transitions in self._get_transitions(
                     node=v, include_types=(nd.PossibilityNode, nd.DecisionNode), 
                     exclude_group=group, consistently=True, fixed_transitions=fixed_transitions):
                 yield Scenario("_", current_node=v, transitions=transitions)
     
-    #@profile
-    def _get_choices(self, node=None, group=None, fixed_choices=None):
+    def _iter_scenario_codes(self, node, group, fixed_transitions):
+        """helper method: enumerate the scenarios for group starting at node 
+        by a depth-first search over the compiled tree like _iter_strategy_codes,
+        branching at possibility nodes and at the decision nodes of players 
+        not in group, whose information sets are assigned an action when first 
+        reached. As in _get_transitions, fixed_transitions only restrict the 
+        choices at node itself. 
+        Yields the same list of choice codes (see compiled.py) after each 
+        complete assignment, to be copied by the caller."""
+        C = self.compile()
+        assert node in C.index, "node must belong to the branch"
+        node_type = C.node_type.tolist()
+        ins_id = C.information_set_id.tolist()
+        code_column = C.code_column.tolist()
+        offsets = C.offsets.tolist()
+        targets = C.targets.tolist()
+        in_group = C.group_mask(group).tolist()
+        # allowed codes at node due to fixed_transitions:
+        allowed = {}
+        k0 = C.index[node]
+        if isinstance(node, nd.DecisionNode) and not in_group[k0] and node.information_set in fixed_transitions:
+            allowed[k0] = [C.actions[ins_id[k0]].index(fixed_transitions[node.information_set])]
+        elif isinstance(node, (nd.DecisionNode, nd.ProbabilityNode)) and node in fixed_transitions:
+            allowed[k0] = [targets.index(C.index[fixed_transitions[node]], offsets[k0]) - offsets[k0]]
+        codes = [-1] * C.n_codes
+
+        def search(frontier):
+            frontier = list(frontier)
+            while frontier:
+                k = frontier.pop()
+                if node_type[k] == cp.OUTCOME:
+                    continue
+                choices = allowed.get(k)
+                if node_type[k] == cp.POSSIBILITY or (node_type[k] == cp.DECISION and not in_group[k]):
+                    j = code_column[k] if node_type[k] == cp.POSSIBILITY else ins_id[k]
+                    if codes[j] >= 0:
+                        frontier.append(targets[offsets[k] + codes[j]])
+                        continue
+                    # branch on the first unassigned choice:
+                    for c in (range(offsets[k+1] - offsets[k]) if choices is None else choices):
+                        codes[j] = c
+                        frontier.append(targets[offsets[k] + c])
+                        yield from search(frontier)
+                        frontier.pop()
+                    codes[j] = -1
+                    return
+                if choices is None:
+                    frontier.extend(targets[offsets[k]:offsets[k+1]])
+                else:
+                    frontier.extend(targets[offsets[k] + c] for c in choices)
+            yield codes
+
+        return search([k0])
+
+    def _iter_strategy_codes(self, nodes=None, group=None, constraint=None, prune=None, branch_on=None):
+        """helper method: enumerate the strategies of group starting at nodes 
+        by a depth-first search over the compiled tree that keeps a frontier of
+        nodes still to be explored and assigns an action to each of group's 
+        information sets when it is first reached, respecting the Constraint. 
+        Since every assignment is final, no inconsistent combination is ever 
+        produced, and excluded actions and nodes are never explored.
+        Yields the same list of choice codes (see compiled.py) after each 
+        complete assignment, to be copied by the caller.
+        @param prune: optional function that receives the list of choice codes 
+               after each new assignment and returns True if no completion of 
+               this partial assignment needs to be enumerated
+        @param branch_on: optional bool vector over information sets; if given, 
+               only these are assigned, and all successors of group's other 
+               decision nodes are explored as at possibility nodes"""
+        C = self.compile()
+        node_type = C.node_type.tolist()
+        ins_id = C.information_set_id.tolist()
+        offsets = C.offsets.tolist()
+        targets = C.targets.tolist()
+        in_group = C.group_mask(group)
+        allowed = self._get_allowed_codes(constraint)
+        if branch_on is not None:
+            in_group &= np.append(branch_on, False)[C.information_set_id]
+        in_group = in_group.tolist()
+        is_excluded = [False] * len(C.nodes)
+        for v in constraint.excluded_nodes:
+            if v in C.index:
+                is_excluded[C.index[v]] = True
+        required = [C.information_set_index.get(ins, -1) for ins in constraint.fixed] if constraint.required else []
+        codes = [-1] * C.n_codes
+        
+        def search(frontier):
+            frontier = list(frontier)
+            while frontier:
+                k = frontier.pop()
+                if node_type[k] == cp.OUTCOME or is_excluded[k]:
+                    continue
+                if in_group[k]:
+                    i = ins_id[k]
+                    if codes[i] >= 0:
+                        frontier.append(targets[offsets[k] + codes[i]])
+                        continue
+                    # branch on the first unassigned information set:
+                    for c in allowed[i]:
+                        codes[i] = c
+                        if prune is not None and prune(codes):
+                            continue
+                        frontier.append(targets[offsets[k] + c])
+                        yield from search(frontier)
+                        frontier.pop()
+                    codes[i] = -1
+                    return
+                frontier.extend(targets[offsets[k]:offsets[k+1]])
+            if all(i >= 0 and codes[i] >= 0 for i in required):
+                yield codes
+
+        for v in nodes:
+            assert v in C.index, "nodes must belong to the branch"
+        return search(reversed([C.index[v] for v in nodes]))
+
+    def _get_allowed_codes(self, constraint):
+        """helper method: list of allowed action codes per information set"""
+        C = self.compile()
+        allowed = [range(len(actions)) for actions in C.actions]
+        for ins, acs in constraint.excluded.items():
+            i = C.information_set_index.get(ins)
+            if i is not None:
+                allowed[i] = [c for c in allowed[i] if C.actions[i][c] not in acs]
+        for ins, a in constraint.fixed.items():
+            i = C.information_set_index.get(ins)
+            if i is not None:
+                allowed[i] = [c for c in allowed[i] if C.actions[i][c] == a]
+        return allowed
+
+    def _get_strategy_nodes(self, node=None, player=None, group=None):
         """helper method"""
-        if fixed_choices is None:
-            fixed_choices = {}
+        assert isinstance(node, nd.Node)
+        group = _get_group(player=player, group=group)
+        assert group is not None
         if isinstance(node, nd.DecisionNode) and node.player in group:
-            # yield from concatenation of partial strategies at all successors,
-            # each one enriched by the corresponding choice:
-            ins = node.information_set
-            if ins in fixed_choices:
-                action = fixed_choices[ins]
-                successor = node.consequences[action]
-                for choices in self._get_choices(node=successor, group=group, fixed_choices=fixed_choices):
-                    choices[ins] = action
-                    yield choices
-            else:                    
-                for action, successor in node.consequences.items():
-                    for choices in self._get_choices(node=successor, group=group, fixed_choices=fixed_choices):
-                        choices[ins] = action
-                        yield choices
-        elif isinstance(node, nd.InnerNode):
-            # yield from cartesian product of strategies at all successors:
-            cartesian_product = itertools.product(*(
-                self._get_choices(node=successor, group=group, fixed_choices=fixed_choices)
-                for successor in node.successors))
-            for combination in cartesian_product:
-                choices = {}
-                is_consistent = True
-                for component in combination:
-                    is_consistent = update_consistently(choices, component)
-                    if not is_consistent: 
-                        break
-                if is_consistent: 
-                    yield choices
-        elif isinstance(node, nd.LeafNode):
-            yield {}
-        
-    def get_strategies(self, node=None, player=None, group=None, fixed_choices=None):
+            # strategies must choose consistently at all nodes in the same information set:
+            return self.get_information_set_nodes(node.information_set), group
+        return [node], group
+
+    def _get_constraint(self, fixed_choices=None, constraint=None):
+        """helper method"""
+        if constraint is None:
+            constraint = Constraint("_")
+        assert isinstance(constraint, Constraint)
+        return constraint.refined(fixed_choices) if fixed_choices else constraint
+
+    def get_strategies(self, node=None, player=None, group=None, fixed_choices=None, 
+                       constraint=None, compact=False):
         """Return all strategies for the given player or group starting at a 
         certain node, potentially restricted to matching the optionally specified
         dict of fixed_choices. 
-        @return: generator for Strategy objects   
+        @param constraint: optional Constraint further restricting the strategies
+        @param compact: whether to yield CompactStrategies instead 
+        @return: generator for Strategy (or CompactStrategy) objects   
         """
-        if fixed_choices is None:
-            fixed_choices = {}
-        assert isinstance(node, nd.Node)
-        group = _get_group(player=player, group=group)
-        assert group is not None
-        if isinstance(node, nd.DecisionNode) and node.player in group:  
-            # yield from basically the cartesian product of strategies of all nodes in same information set:
-            ins = node.information_set
-            combinations = itertools.chain(*(itertools.product(*(
-                    self._get_choices(node=v, group=group, fixed_choices={**fixed_choices, ins: a})
-                    for v in ins.nodes))
-                for a in ([fixed_choices[ins]] if ins in fixed_choices else ins.actions)))
-        else:
-            combinations = itertools.product(self._get_choices(node=v, group=group, fixed_choices=fixed_choices))
-        for combination in combinations:
-            choices = {}
-            is_consistent = True
-            for component in combination:
-                is_consistent = is_consistent and update_consistently(choices, component)
-                if not is_consistent: 
-                    break
-            if is_consistent: 
-                yield Strategy("_", choices=choices)
+        nodes, group = self._get_strategy_nodes(node=node, player=player, group=group)
+        constraint = self._get_constraint(fixed_choices=fixed_choices, constraint=constraint)
+        C = self.compile()
+        n_ins = len(C.information_sets)
+        for codes in self._iter_strategy_codes(nodes=nodes, group=group, constraint=constraint):
+            if compact:
+                yield CompactStrategy(C, tuple(codes))
+            else:
+                yield Strategy("_", choices={C.information_sets[i]: C.actions[i][c] 
+                                             for i, c in enumerate(codes[:n_ins]) if c >= 0})
+
+    def count_strategies(self, node=None, player=None, group=None, fixed_choices=None, constraint=None):
+        """Return the number of strategies that get_strategies would yield, 
+        without constructing them"""
+        nodes, group = self._get_strategy_nodes(node=node, player=player, group=group)
+        constraint = self._get_constraint(fixed_choices=fixed_choices, constraint=constraint)
+        return sum(1 for _ in self._iter_strategy_codes(nodes=nodes, group=group, constraint=constraint))
         
     # outcome distributions:
         
-    _n_not_used_cache = 0
-    _n_used_cache = 0
-    
-    _d_outcome_distribution = {}
+    _i_cache_size = 100000
+    @property
+    def cache_size(self):
+        """maximal number of cached outcome distributions (None means unbounded)"""
+        return self._i_cache_size
+
+    _a_outcome_distribution_cache = None
+    @property
+    def outcome_distribution_cache(self):
+        """LRUCache of outcome distributions at probability nodes, 
+        keyed by (node, frozenset of transitions)"""
+        self.tree_index  # drops entries of changed nodes
+        if self._a_outcome_distribution_cache is None:
+            self._a_outcome_distribution_cache = LRUCache(maxsize=self.cache_size)
+        return self._a_outcome_distribution_cache
+
     #@profile
     def _get_outcome_distribution(self, node=None, transitions=None):
         """helper method"""
@@ -472,22 +621,19 @@ class Branch (_AbstractObject):
             if node in transitions:
                 successor = new_transitions.pop(node) 
             else:
-                successor = node.consequences[new_transitions.pop(node.information_set)]
+                successor = self.get_consequences(node)[new_transitions.pop(node.information_set)]
             return self._get_outcome_distribution(successor, new_transitions)
         else:
             key = (node, frozenset(transitions.items()))
-            try:
-                distribution = self._d_outcome_distribution[key]
-                self._n_used_cache += 1
-                return distribution
-            except:
-                self._n_not_used_cache += 1
+            cache = self.outcome_distribution_cache
+            distribution = cache.get(key)
+            if distribution is None:
                 distribution = {}
-                for successor, p1 in node.probabilities.items():
+                for successor, p1 in self.get_probabilities(node).items():
                     for outcome, p2 in self._get_outcome_distribution(successor, transitions).items():
                         distribution[outcome] = distribution.get(outcome, 0) + p1*p2
-                self._d_outcome_distribution[key] = distribution
-                return distribution
+                cache[key] = distribution
+            return distribution
             
     def get_outcome_distribution(self, node=None, scenario=None, strategy=None):
         """Returns the probability of outcomes resulting from a given
@@ -501,7 +647,7 @@ class Branch (_AbstractObject):
         for S, act in strategy.choices.items():
             assert S not in transitions, "scenario and strategy must not overlap"
             transitions[S] = act
-        distribution = self._get_outcome_distribution(node=scenario.current_node, transitions=transitions)
+        distribution = {**self._get_outcome_distribution(node=scenario.current_node, transitions=transitions)}
         for (ou, p) in distribution.items():
             if isinstance(p, sp.Expr):
                 distribution[ou] = sp.simplify(p)
@@ -514,7 +660,7 @@ class Branch (_AbstractObject):
                     else getattr(node.outcome, attribute, 0))
         elif isinstance(node, nd.ProbabilityNode):
             expectation = 0
-            for successor, p1 in node.probabilities.items():
+            for successor, p1 in self.get_probabilities(node).items():
                 expectation += p1 * self._get_expectation(successor, transitions, attribute, resolve)
             return expectation
         else:
@@ -524,10 +670,10 @@ class Branch (_AbstractObject):
             elif isinstance(node, nd.DecisionNode):
                 ins = node.information_set
                 if ins in transitions:
-                    successor = node.consequences[transitions[ins]]
+                    successor = self.get_consequences(node)[transitions[ins]]
                     return self._get_expectation(successor, transitions, attribute, resolve)
         return resolve([self._get_expectation(successor, transitions, attribute, resolve)
-                        for successor in node.successors])
+                        for successor in self.get_successors(node)])
     
     def get_expectation(self, node=None, scenario=None, player=None, group=None,
                         strategy=None, attribute=None, resolve=None):
@@ -558,7 +704,7 @@ class Branch (_AbstractObject):
             if isinstance(node, nd.DecisionNode):
                 group = _get_group(player=player, group=group)
                 assert group is not None
-                nodes = node.information_set.nodes if node.player in group else {node} 
+                nodes = self.get_information_set_nodes(node.information_set) if node.player in group else {node} 
             else:
                 nodes = {node}
             # take min or max over relevant nodes:
@@ -596,7 +742,7 @@ class Branch (_AbstractObject):
             if isinstance(node, nd.DecisionNode):
                 group = _get_group(player=player, group=group)
                 assert group is not None
-                nodes = node.information_set.nodes if node.player in group else {node} 
+                nodes = self.get_information_set_nodes(node.information_set) if node.player in group else {node} 
             else:
                 nodes = {node}
             # take min or max over relevant nodes:
@@ -609,8 +755,9 @@ class Branch (_AbstractObject):
     
     def get_guaranteed_likelihood(self, player=None, group=None, node=None):
         """Calculate the known guaranteed likelihood (minimum likelihood over
-        all scenario and strategies) of an unacceptable outcome, called gamma in AAFRA"""
-        return self.get_likelihood(node=node, scenario=None, player=player, group=group, strategy=None, resolve=Min)
+        all scenario and strategies) of an unacceptable outcome, called gamma in AAFRA.
+        Uses backward induction on the compiled tree (see induction.py)"""
+        return ind.get_guaranteed_likelihood(self, group=_get_group(player=player, group=group), node=node)
 
     gamma = get_guaranteed_likelihood
 
@@ -625,49 +772,209 @@ class Branch (_AbstractObject):
         """Shortfall in minimizing likelihood: by how much has the minimally 
         achievable likelihood in the given scenario increased from this node 
         to the next due to taking the given action? See AAFRA""" 
-        return (self.omega(node=node.consequences[action], 
+        return (self.omega(node=self.get_consequences(node)[action], 
                            scenario=scenario.sub_scenario(action)) 
                 - self.omega(node=node, scenario=scenario))
                 
     def rho(self, group=None, node=None, action=None):
         """Risk taken when taking a certain action in a certain node,
-        given a certain scenario. See AAFRA"""
-        return Max([self.Delta_omega(node=node, scenario=scenario, action=action)
-                    for scenario in self.get_scenarios(node=node, group=group)])
+        given a certain scenario. See AAFRA.
+        Equals the maximum of Delta_omega over all scenarios, but uses backward 
+        induction on the compiled tree and enumerates scenarios only where 
+        information sets require it (see induction.py)"""
+        return ind.get_risk(self, group=_get_group(group=group), node=node, action=action)
                     
     def rho_min(self, group=None, node=None):
         """Minimal risk in node. See AAFRA"""
         return Min([self.rho(group=group, node=node, action=action)
-                    for action in node.actions])
+                    for action in self.get_actions(node)])
                     
-    def cooperatively_achievable_likelihood(self, node=None, env_scenario=None, fixed_choices=None):
+    def _minimize_over_strategies(self, node=None, at=None, base=None, constraint=None, solver=None):
+        """helper method: minimize, over all joint strategies of the whole player
+        set starting at node that satisfy constraint, the maximum over the nodes
+        in at of the likelihood of an unacceptable outcome given these choices 
+        and the fixed choices in base (a vector of choice codes), maximizing 
+        over everything else.
+        Choices are only enumerated at information sets with several nodes in 
+        the branches and at those restricted by constraint, while all other 
+        decision nodes are resolved optimally by backward induction (see 
+        induction.py). The resulting partial strategies are evaluated in 
+        batches on the compiled tree, the minimization stops as soon as a 
+        likelihood of zero is found, and partial strategies are pruned if even 
+        their best completion (bounded by resolving unassigned choices 
+        optimally at each node separately) cannot beat the best strategy 
+        found so far.
+        @param solver: "enumeration" (default) or "milp" (see milp.py)"""
+        everybody = Group("all", players=self.players)
+        nodes, everybody = self._get_strategy_nodes(node=node, group=everybody)
+        C = self.compile()
+        at = [C.index[c] for c in at]
+        if solver == "milp":
+            assert not constraint.excluded_nodes, "solver='milp' does not support excluded_nodes"
+            if constraint.required:
+                assert all(any(C.index.get(v) in at for v in self.get_information_set_nodes(ins)) for ins in constraint.fixed), \
+                    "solver='milp' requires fixed choices to be reached"
+            # (imported only here since it loads scipy.optimize):
+            from . import milp
+            return milp.minimize_over_strategies(C, at, base, self._get_allowed_codes(constraint))
+        assert solver in (None, "enumeration"), "solver must be 'enumeration' or 'milp'"
+        maximize_unassigned = C.node_type == cp.POSSIBILITY
+        if constraint.excluded_nodes:
+            # unexplored branches are not resolved optimally, so enumerate everything:
+            branch_on, maximize_strategies = None, np.ones(len(C.nodes), dtype=bool)
+        else:
+            branch_on = ind.nontrivial_information_sets(C, [C.index[v] for v in nodes], 
+                                                        C.group_mask(everybody))
+            for ins in [*constraint.fixed, *constraint.excluded]:
+                if ins in C.information_set_index:
+                    branch_on[C.information_set_index[ins]] = True
+            if constraint.required:
+                # strategies must choose to reach the fixed information sets,
+                # so the choices on the way there must be enumerated as well:
+                for ins in constraint.fixed:
+                    for v in self.get_information_set_nodes(ins):
+                        k = C.index.get(v, -1)
+                        while k >= 0:
+                            if C.node_type[k] == cp.DECISION:
+                                branch_on[C.information_set_id[k]] = True
+                            k = C.parent[k]
+            maximize_strategies = maximize_unassigned
+
+        def evaluate(codes, maximize=maximize_strategies):
+            assert not np.any((codes >= 0) & (base >= 0)), "scenario and strategy must not overlap"
+            values = C.evaluate_batch(np.where(codes >= 0, codes, base), at, maximize=maximize)
+            if values.dtype == object:
+                return np.array([Max(list(row)) for row in values], dtype=object)
+            return values.max(axis=1)
+
+        incumbent = [None]
+        def prune(codes):
+            return (incumbent[0] is not None 
+                    and cp._scalar(evaluate(np.array([codes]), maximize_unassigned)[0]) >= incumbent[0])
+
+        return cp.reduce_batches(
+            self._iter_strategy_codes(nodes=nodes, group=everybody, constraint=constraint, 
+                                      prune=None if C.is_symbolic else prune, branch_on=branch_on),
+            evaluate, Min, bound=0, incumbent=incumbent)
+
+    def cooperatively_achievable_likelihood(self, node=None, env_scenario=None, fixed_choices=None,
+                                            solver=None):
         """Achievable likelihood of unacceptable outcome under a certain env_scenario
         for all possibility nodes, minimized over all joint strategies of the whole 
         player set that respect the optionally given fixed_choices.
+        @param solver: "enumeration" (default) or "milp", which solves a mixed-integer
+               linear program instead (see milp.py)
         """
         if fixed_choices is None:
             fixed_choices = {}
         assert isinstance(env_scenario, Scenario)
-        all = Group("all", players=self.players)
-        res = Min([
-            self.get_likelihood(node=node, scenario=env_scenario, strategy=strategy, resolve=Max)
-            for strategy in self.get_strategies(node=node, group=all, fixed_choices=fixed_choices)
-        ])
-        return res
-
-    def cooperatively_achievable_worst_case_likelihood(self, node=None, fixed_choices=None):
+        return self._minimize_over_strategies(
+            node=node, at=[env_scenario.current_node], 
+            base=self.compile().encode(env_scenario.transitions),
+            constraint=self._get_constraint(fixed_choices=fixed_choices), solver=solver)
+
+    def cooperatively_achievable_worst_case_likelihood(self, node=None, fixed_choices=None, solver=None):
         """Minimum of worst-case likelihood of unacceptable outcome,
         minimized over all joint strategies of the whole player set that respect
         the optionally given fixed_choices.
+        @param solver: "enumeration" (default) or "milp" (see milp.py)
         """
         if fixed_choices is None: 
             fixed_choices = {}
-        all = Group("all", players=self.players)
-        return Min([
-            self.get_likelihood(node=node, group=all, strategy=strategy, resolve=Max)
-            for strategy in self.get_strategies(node=node, group=all)
-            if strategy.includes(fixed_choices)
-        ])
+        nodes = (self.get_information_set_nodes(node.information_set) 
+                 if isinstance(node, nd.DecisionNode) else [node])
+        # only strategies containing fixed_choices are enumerated:
+        return self._minimize_over_strategies(
+            node=node, at=nodes, base=np.full(self.compile().n_codes, -1, dtype=np.int64),
+            constraint=Constraint("_", fixed=fixed_choices, required=True), solver=solver)
+
+    _a_reduced_tree_cache = None
+    """memoized trust-based reduced trees (see domination.py)"""
+
+    # compiled representation:
+
+    _i_share_subtrees = False
+    @property
+    def share_subtrees(self):
+        """whether compile() identifies structurally identical subtrees, so that
+        backward induction evaluates each of them only once (default: False)"""
+        return self._i_share_subtrees
+
+    _a_compiled = None
+    def compile(self):
+        """Return a flat, array-based CompiledTree representation of this branch
+        to be used by fast evaluation routines. It is cached and compiled anew
+        after the branch was changed."""
+        self.tree_index  # drops cached data of changed nodes
+        if self._a_compiled is None or self._a_compiled.is_stale:
+            self._a_compiled = cp.CompiledTree("compiled_" + self.name, branch=self, 
+                                               share_subtrees=self.share_subtrees)
+        return self._a_compiled
+
+    _a_tree_index = None
+    @property
+    def tree_index(self):
+        """TreeIndex answering ancestor, depth, and path queries for this
+        branch in constant or O(depth) time and holding flat lists of its nodes.
+        It is cached and rebuilt after the branch was changed (see 
+        core.register_mutation), when those cached data derived from the 
+        branch that concern the changed part are dropped (see _drop_changed)."""
+        index = self._a_tree_index
+        if index is None or index.is_stale:
+            changes = None if index is None else self._get_changes(index.generation)
+            self._drop_changed(changes)
+            self._a_tree_index = index = ix.TreeIndex("index_" + self.name, branch=self)
+            if changes is not None:
+                # keep the named nodes that remain:
+                for attr in ("_a_named_nodes", "_a_named_inner_nodes", "_a_named_possibility_nodes",
+                             "_a_named_probability_nodes", "_a_named_decision_nodes",
+                             "_a_named_leaf_nodes", "_a_named_outcome_nodes"):
+                    named = getattr(self, attr)
+                    if named is not None:
+                        setattr(self, attr, {n: v for n, v in named.items() if v in index})
+        return index
+
+    def _get_changes(self, generation):
+        """helper method: set of the nodes of this branch whose branch was 
+        changed since core.mutation_generation had the given value, i.e., the
+        changed nodes (see core.register_mutation) and their ancestors, and 
+        of the changed information sets"""
+        changes = set()
+        for ob in core.get_mutations(self.root.root, generation):
+            if isinstance(ob, nd.InformationSet):
+                changes.add(ob)
+                continue
+            path, v = [], ob
+            while v is not None and v not in changes and v != self.root:
+                path.append(v)
+                v = v.predecessor
+            if v is not None:
+                # (ob lies in this branch):
+                changes.update(path)
+                changes.add(v)
+        return changes
+
+    def _drop_changed(self, changes):
+        """helper method: drop the cached data that concern the given changes
+        (see _get_changes), or all if changes is None. Since values at a node
+        only depend on the node's branch, only the entries of the changed 
+        nodes are dropped from the outcome distribution cache. Dicts of named 
+        nodes are updated by tree_index, while the other named_... dicts are
+        recomputed since objects may no longer occur."""
+        if changes is None:
+            self._a_named_nodes = self._a_named_inner_nodes = None
+            self._a_named_possibility_nodes = self._a_named_probability_nodes = None
+            self._a_named_decision_nodes = self._a_named_leaf_nodes = None
+            self._a_named_outcome_nodes = None
+        self._a_named_information_sets = None
+        self._a_named_players = self._a_named_outcomes = None
+        self._a_named_actions = self._a_named_symbols = self._a_players = None
+        cache = self._a_outcome_distribution_cache
+        if cache is not None:
+            if changes is None:
+                cache.clear()
+            else:
+                cache.discard_if(lambda key: key[0] in changes)
 
     # other methods_
 
@@ -681,7 +988,12 @@ class Branch (_AbstractObject):
         Unnamed nodes are represented by a bullet. 
         @return: str (multiline)
         """
-        return self.name + ":" + self.root._to_lines("", "")
+        return self.name + ":" + self.root._to_lines("", "", self)
+
+    def _is_highlighted(self, ob):
+        """helper method: whether to highlight a node or information set when 
+        drawing"""
+        return getattr(ob, 'highlight', False)
 
     def draw(self, filename, show=False):
         """Draw the tree using graphviz and potentially show it.
@@ -697,11 +1009,11 @@ class Branch (_AbstractObject):
                 "labeldistance": "100.0"})
         with dot.subgraph(name="cluster_outcome_nodes", graph_attr={"style": "invis"}) as sub:
             for w in self.get_outcome_nodes():
-                nd.Node._add_to_dot(w, sub)
+                nd.Node._add_to_dot(w, sub, self)
         with dot.subgraph(name="cluster_outcomes", graph_attr={"style": "invis"}) as sub:
             for ou in self.get_outcomes():
                 sub.node(ou.name, shape="triangle" if ou.is_acceptable else "invtriangle")
-        self.root._add_to_dot(dot)
+        self.root._add_to_dot(dot, self)
         dot.render(outfile=filename, view=show)
 
 
@@ -723,12 +1035,26 @@ class Tree (Branch):
     def clone_constrained(self, name=None, desc=None, subs=None, information_set=None):
         """Return a clone that contains only those parts which are
         consistent with information_set"""
+        index = self.tree_index
         keep = set()
-        for v in information_set.nodes:
-            keep.update(v.path)
-            keep.update([*v.branch.get_nodes()])
+        for v in self.get_information_set_nodes(information_set):
+            keep.update(index.get_path(v))
+            keep.update(index.get_branch_nodes(v))
         return self.clone(name=name, desc=desc, subs=subs, keep=keep)
-        
+
+    def view_constrained(self, name=None, desc=None, information_set=None):
+        """Like clone_constrained, but return a TreeView (see views.py) that
+        shares this tree's nodes instead of copying them"""
+        from .views import TreeView
+        index = self.tree_index
+        keep = set()
+        for v in self.get_information_set_nodes(information_set):
+            keep.update(index.get_path(v))
+            keep.update(index.get_branch_nodes(v))
+        return TreeView((name if name is not None else "view_of_" + self.name),
+                        desc=(desc if desc is not None else self.desc),
+                        tree=self, mask=keep, ins=information_set)
+
     def make_globals(self, overwrite=False):
         """In the calling module, make a global variable for each 
         player, action, outcome, node, or information set 
@@ -0,0 +1,223 @@
+import sympy as sp
+
+from . import nodes as nd
+from .trees import Tree
+
+"""
+Lightweight views of game trees that share the tree's nodes, information sets,
+players, actions, and outcomes instead of cloning them.
+
+A TreeView shows only the nodes in its mask and hides the branches after
+actions removed from the view. At probability nodes with hidden successors,
+the remaining probabilities are renormalized to posteriors, which are only
+computed when first needed. Since all evaluation engines access the structure
+of nodes via the methods Branch.get_successors, get_consequences,
+get_probabilities, get_actions, and get_information_set_nodes, which TreeView
+overrides, a view can be used wherever a Tree can, and it gives the same
+results as the clone that Tree.clone_constrained would produce.
+
+Removing actions from a view does not change the underlying tree, so several
+views of the same tree can be used side by side. If the underlying tree is
+changed, the view drops what it derived from the changed part, like a Tree.
+"""
+
+
+class _IdentitySubstitutions (dict):
+    """The substitutions of a TreeView: since it shares the underlying tree's
+    objects, each object is substituted by itself"""
+
+    def __missing__(self, key):
+        return key
+
+    def __contains__(self, key):
+        return True
+
+    def get(self, key, default=None):
+        return key
+
+
+class TreeView (Tree):
+    """A view of a Tree showing only some of its nodes and actions (see above),
+    e.g. as produced by Tree.view_constrained.
+    @param tree: the underlying Tree (or TreeView, whose mask and removed
+           actions are then combined with the given ones)
+    @param mask: optional set of nodes to show (default: all), containing the
+           root and, with each node, its predecessor
+    @param removed_actions: optional dict of set of hidden Actions keyed by
+           InformationSet
+    @param information_set: optional InformationSet to which the view was
+           constrained, which is highlighted when drawing the view
+
+    Since the view shares the tree's objects, its substitutions (see 
+    Tree.substitutions) map each object to itself, so that code written for 
+    clones, such as T.subs[information_set], also works for views.
+    """
+
+    _i_tree = None
+    @property
+    def tree(self):
+        """the underlying Tree"""
+        return self._i_tree
+
+    _i_mask = None
+    @property
+    def mask(self):
+        """frozenset of shown nodes (None means all)"""
+        return self._i_mask
+
+    _i_removed_actions = None
+    @property
+    def removed_actions(self):
+        """dict of set of hidden Actions keyed by InformationSet"""
+        return self._i_removed_actions
+
+    _i_information_set = None
+    @property
+    def information_set(self):
+        """InformationSet to which the view was constrained, or None"""
+        return self._i_information_set
+
+    _i_read_only = False
+    @property
+    def read_only(self):
+        """whether actions may no longer be removed from the view, e.g. since
+        it is memoized and shared (see domination.trust_based_reduced_tree)"""
+        return self._i_read_only
+
+    def __init__(self, name, **kwargs):
+        # (the underlying tree's information sets were already checked):
+        super(TreeView, self).__init__(name, total_recall=False, **kwargs)
+
+    def validate(self):
+        assert isinstance(self.tree, Tree), "tree must be a Tree"
+        removed = {ins: set(acs) for ins, acs in (self.removed_actions or {}).items()}
+        if isinstance(self.tree, TreeView):
+            # view the underlying tree directly:
+            for ins, acs in self.tree.removed_actions.items():
+                removed.setdefault(ins, set()).update(acs)
+            if self.tree.mask is not None:
+                self._i_mask = self.tree.mask if self.mask is None else self.mask & self.tree.mask
+            self._i_tree = self.tree.tree
+        self._i_removed_actions = removed
+        self._i_substitutions = _IdentitySubstitutions()
+        self._i_root = self.tree.root
+        assert self.mask is None or self.root in self.mask, "mask must contain the root"
+        self._i_cache_size = self.tree.cache_size
+        self._i_share_subtrees = self.tree.share_subtrees
+        self._a_successors = {}
+        self._a_consequences = {}
+        self._a_probabilities = {}
+
+    def _is_shown(self, node):
+        """helper method"""
+        return self.mask is None or node in self.mask
+
+    # structure of nodes as seen from this view (see Branch):
+
+    def get_successors(self, node):
+        successors = self._a_successors.get(node)
+        if successors is None:
+            if isinstance(node, nd.DecisionNode):
+                successors = list(self.get_consequences(node).values())
+            elif isinstance(node, nd.ProbabilityNode):
+                successors = list(self.get_probabilities(node))
+            else:
+                successors = [w for w in node.successors if self._is_shown(w)]
+            self._a_successors[node] = successors
+        return successors
+
+    def get_consequences(self, node):
+        consequences = self._a_consequences.get(node)
+        if consequences is None:
+            removed = self.removed_actions.get(node.information_set, ())
+            consequences = {a: w for a, w in node.consequences.items()
+                            if a not in removed and self._is_shown(w)}
+            self._a_consequences[node] = consequences
+        return consequences
+
+    def get_probabilities(self, node):
+        probabilities = self._a_probabilities.get(node)
+        if probabilities is None:
+            if all(self._is_shown(w) for w in node.probabilities):
+                probabilities = node.probabilities
+            else:
+                # posteriors, computed as in ProbabilityNode.clone:
+                ptotal = sum(p for w, p in node.probabilities.items() if self._is_shown(w))
+                probabilities = {w: sp.simplify(p/ptotal) if isinstance(p, sp.Expr) else p/ptotal
+                                 for w, p in node.probabilities.items() if self._is_shown(w)}
+            self._a_probabilities[node] = probabilities
+        return probabilities
+
+    def get_actions(self, node_or_information_set):
+        if isinstance(node_or_information_set, nd.DecisionNode):
+            return set(self.get_consequences(node_or_information_set))
+        if isinstance(node_or_information_set, nd.InformationSet):
+            ins = node_or_information_set
+            nodes = self.get_information_set_nodes(ins)
+            if len(nodes) == 0:
+                return set()
+            return set(self.get_consequences(nodes[0]))
+        return node_or_information_set.actions
+
+    def get_information_set_nodes(self, information_set):
+        index = self.tree_index
+        return [v for v in information_set.nodes if v in index]
+
+    def get_outcomes(self):
+        """yield all (!) shown outcomes, named or not"""
+        seen = set()
+        for v in self.get_outcome_nodes():
+            if v.outcome not in seen:
+                seen.add(v.outcome)
+                yield v.outcome
+
+    # changes:
+
+    def remove_action(self, information_set, action):
+        """Hide an action of an information set and the branches after it in
+        this view only (see InformationSet.remove_action)"""
+        ins = information_set
+        assert not self.read_only, "cannot change a read-only view, use a clone instead"
+        actions = self.get_actions(ins)
+        assert action in actions
+        assert len(actions) > 1, "cannot remove the only action"
+        self.removed_actions.setdefault(ins, set()).add(action)
+        for v in ins.nodes:
+            self._a_successors.pop(v, None)
+            self._a_consequences.pop(v, None)
+        # the shown nodes have changed, so drop all derived data:
+        self._a_tree_index = self._a_compiled = None
+
+    def _drop_changed(self, changes):
+        super(TreeView, self)._drop_changed(changes)
+        if changes is not None:
+            for ob in changes:
+                self._a_successors.pop(ob, None)
+                self._a_consequences.pop(ob, None)
+                self._a_probabilities.pop(ob, None)
+
+    # materialization:
+
+    def clone(self, name=None, desc=None, subs=None, keep=None):
+        """Return a deep copy of the shown part as an independent Tree"""
+        shown = set(self.tree_index.nodes)
+        if subs is None:
+            subs = {}
+        clone = self.tree.clone(name=(name if name is not None else "clone_of_" + self.name),
+                                desc=(desc if desc is not None else self.desc), subs=subs,
+                                keep=shown if keep is None else shown & set(keep))
+        if self.information_set is not None and self.information_set in subs:
+            ins = subs[self.information_set]
+            ins.highlight = True
+            for v in ins.nodes:
+                v.highlight = True
+        return clone
+
+    # rendering (see Branch.__repr__ and Branch.draw, which use the 
+    # structure as seen from this view):
+
+    def _is_highlighted(self, ob):
+        if self.information_set is not None and (
+                ob == self.information_set or ob in self.information_set.nodes):
+            return True
+        return super(TreeView, self)._is_highlighted(ob)
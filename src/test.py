@@ -137,12 +137,15 @@ T.draw("/tmp/T.pdf", show=True)
 T2.draw("/tmp/T2.pdf", show=True)
 
 
+# share intermediate results between all PRFs:
+ctx = EvaluationContext("ctx", tree=T)
+
 for prf in prfs:
     frf = frf_from_max_prf("", prf=prf)
     print(prf.name, ":")
     for a in v.actions:
-        print(" ", {v2.name: prf(tree=T, group=G, node=v2, action=a) for v2 in v.information_set.nodes}, pl, a)
-    print(" ", {v2.name: frf(tree=T, group=G, node=v2) for v2 in v.information_set.nodes}, pl, "FRF")
+        print(" ", {v2.name: prf(tree=ctx, group=G, node=v2, action=a) for v2 in v.information_set.nodes}, pl, a)
+    print(" ", {v2.name: frf(tree=ctx, group=G, node=v2) for v2 in v.information_set.nodes}, pl, "FRF")
     
 exit()
 
@@ -199,7 +202,7 @@ print(sum(1 for _ in T.get_strategies(vi, player=i)))
 print(np.mean([T.get_outcome_distribution(scenario=sc_jCkD, strategy=st).get(enough, 0) for st in T.get_strategies(vi, player=i)]))
 print(time()-start, "sec.")
 
-print(T._n_not_used_cache, T._n_used_cache)
+print(T.outcome_distribution_cache.stats)
 
 T.make_globals()
 
@@ -0,0 +1,66 @@
+import itertools
+
+from responsibility import *
+from responsibility.anonymous import AnonymousGame
+
+"""
+Tests of the symmetry-reduced evaluation of anonymous games (see anonymous.py)
+against the object-level evaluation of the corresponding tree.
+"""
+
+def _get_games():
+    """helper function: threshold public good games and a game with random
+    outcomes of three actions"""
+    import random
+    random.seed(1)
+    ok, nok = Ou("ok", ac=True), Ou("nok", ac=False)
+    for n, threshold in [(3, 2), (4, 3)]:
+        yield AnonymousGame("thr", players=[Player("i%d" % k) for k in range(n)],
+                            actions=[Action("dont"), Action("contribute")],
+                            outcome=lambda counts, l=threshold: ok if counts[1] >= l else nok)
+    table = {}
+    def outcome(counts):
+        if counts not in table:
+            table[counts] = random.choice([ok, nok])
+        return table[counts]
+    yield AnonymousGame("rnd", players=[Player("j%d" % k) for k in range(3)],
+                        actions=[Action("x"), Action("y"), Action("z")], outcome=outcome)
+
+def _get_counts(game, node):
+    """helper function: the counts of the actions taken on the way to node"""
+    taken = [w.get_action(u) for w, u in zip(node.path[:-1], node.path[1:])]
+    return tuple(taken.count(a) for a in game.actions)
+
+def test_values_match_tree():
+    for A in _get_games():
+        T = A.to_tree()
+        groups = [Group("G", players=set(s)) for r in range(1, len(A.players) + 1)
+                  for s in itertools.combinations(A.players, r)]
+        for v in T.get_decision_nodes():
+            for G in groups:
+                # for players in G, the values are maximized over the information set:
+                c = None if v.player in G else _get_counts(A, v)
+                assert T.gamma(group=G, node=v) == A.gamma(player=v.player, group=G, counts=c)
+                for a in A.actions:
+                    assert T.rho(group=G, node=v, action=a) == A.rho(
+                        group=G, player=v.player, action=a, counts=c)
+                for scenario in T.get_scenarios(node=v, group=G):
+                    w = scenario.current_node
+                    choices = {ins.player: b for ins, b in scenario.transitions.items()}
+                    assert T.omega(node=w, scenario=scenario) == A.omega(
+                        player=v.player, counts=_get_counts(A, w), scenario=choices)
+                    for a in A.actions:
+                        assert T.Delta_omega(node=w, scenario=scenario, action=a) == A.Delta_omega(
+                            player=v.player, counts=_get_counts(A, w), scenario=choices, action=a)
+            for a in [None, *A.actions]:
+                fixed_choices = {} if a is None else {v.information_set: a}
+                for scenario in T.get_scenarios(node=v, group=T.players):
+                    assert T.cooperatively_achievable_likelihood(
+                        node=v, env_scenario=scenario, fixed_choices=fixed_choices) == \
+                        A.cooperatively_achievable_likelihood(
+                            player=v.player, counts=_get_counts(A, scenario.current_node), 
+                            fixed_action=a)
+                if a is not None:
+                    assert T.cooperatively_achievable_worst_case_likelihood(
+                        node=v, fixed_choices=fixed_choices) == \
+                        A.cooperatively_achievable_worst_case_likelihood(player=v.player, fixed_action=a)
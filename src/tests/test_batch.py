@@ -0,0 +1,28 @@
+from responsibility import *
+from responsibility.rfs.prfs.aafra import r_like, r_risk, r_negl
+
+"""
+Tests of the batch evaluation of responsibility functions (see batch.py).
+"""
+
+def _get_random_trees():
+    """helper function"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(5):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=10)
+
+def test_evaluate_matches_single_calls():
+    prfs = [r_like, r_risk, r_negl]
+    for T in _get_random_trees():
+        groups = [Group("i", players={pl}) for pl in T.players] + [Group("all", players=T.players)]
+        for table in (evaluate(T, prfs), evaluate(T, prfs, groups=groups)):
+            assert len(table.rows) > 0
+            for G, v, a in table.rows:
+                for prf in prfs:
+                    assert table.get(prf, group=G, node=v, action=a) == prf(tree=T, group=G, node=v, action=a)
+        # all rows are there:
+        table = evaluate(T, prfs, groups=groups)
+        assert len(table.rows) == sum(len(v.actions) * sum(v.player in G for G in groups)
+                                      for v in T.get_decision_nodes())
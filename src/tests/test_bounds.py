@@ -0,0 +1,47 @@
+import itertools
+
+from responsibility import *
+from responsibility.core import Min, Max
+
+"""
+Tests of the bounded reductions and the pruned minimization over strategies
+against exhaustive enumeration.
+"""
+
+def test_reductions_stop_at_bound():
+    consumed = []
+    def values():
+        for x in [0.5, 0, 0.25, 0.75]:
+            consumed.append(x)
+            yield x
+    assert Min(values(), bound=0) == 0 and consumed == [0.5, 0]
+    consumed.clear()
+    assert Max(values()) == 0.75 and len(consumed) == 4
+    assert Max([0.5, 1, 0.25], bound=1) == 1
+
+def test_cooperative_likelihoods_match_enumeration():
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(8):
+        np.random.seed(seed)
+        T = random_tree(n_players=2, n_leafs=12)
+        everyone = Group("all", players=T.players)
+        for v in T.get_inner_nodes():
+            strategies = [s.choices for s in T.get_strategies(node=v, group=everyone)]
+            for scenario in T.get_scenarios(node=v, group=everyone):
+                expected = min(T._get_expectation(scenario.current_node, {**scenario.transitions, **choices}, None, Max)
+                               for choices in strategies)
+                value = T.cooperatively_achievable_likelihood(node=v, env_scenario=scenario)
+                assert abs(value - expected) < 1e-12
+            # the worst case is over all nodes of v's information set:
+            nodes = v.information_set.nodes if isinstance(v, DecisionNode) else [v]
+            for ins in T.get_information_sets():
+                for a in ins.actions:
+                    fixed_choices = {ins: a}
+                    values = [max(T._get_expectation(c, choices, None, Max) for c in nodes) 
+                              for choices in strategies
+                              if all(choices.get(ins2) == a2 for ins2, a2 in fixed_choices.items())]
+                    if len(values) > 0:
+                        value = T.cooperatively_achievable_worst_case_likelihood(
+                            node=v, fixed_choices=fixed_choices)
+                        assert abs(value - min(values)) < 1e-12
@@ -0,0 +1,79 @@
+import numpy as np
+
+from responsibility import *
+from responsibility.core import Min, Max
+
+"""
+Tests of the compiled tree (see compiled.py) against the object-level 
+evaluation routines of Branch.
+"""
+
+def _get_random_trees():
+    """helper function"""
+    from responsibility.random import random_tree
+    for seed in range(5):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=10)
+
+def test_batch_likelihoods_match_expectations():
+    for T in _get_random_trees():
+        C = T.compile()
+        for v in T.get_decision_nodes():
+            G = Group("G", players={v.player})
+            transitions_list = [{**scenario.transitions, **strategy.choices}
+                                for scenario in T.get_scenarios(node=v, group=G)
+                                for strategy in T.get_strategies(node=v, group=G)]
+            codes = C.encode_many(transitions_list)
+            for row, transitions in zip(codes, transitions_list):
+                assert C.decode(row) == transitions
+            for resolve in (Min, Max):
+                values = C.get_likelihoods(node=v, codes=codes, resolve=resolve)
+                expected = [T._get_expectation(v, transitions, None, resolve)
+                            for transitions in transitions_list]
+                assert np.allclose(values, np.array(expected, dtype=np.float64))
+            # rows that resolve nothing give the extremal likelihoods:
+            empty = np.full((1, C.n_codes), -1)
+            assert np.isclose(C.get_likelihoods(node=v, codes=empty, resolve=Min)[0],
+                              T._get_expectation(v, {}, None, Min))
+
+def _get_shared_clone(tree):
+    """helper function: a copy of tree with share_subtrees=True, and the dict
+    mapping tree's objects to the copy's"""
+    subs = {}
+    return Tree(tree.name, share_subtrees=True, 
+                ro=tree.root.clone(subs=subs), subs=subs), subs
+
+def test_shared_subtrees_give_the_same_values():
+    from responsibility.problems.threshold_public_good import threshold_public_good
+    T = threshold_public_good(5, 3)
+    # the threshold public good game shrinks to a DAG of polynomial size:
+    D = _get_shared_clone(T)[0].compile()
+    assert D.n_shared < len(D.nodes) / 4
+    for T in [T, *_get_random_trees()]:
+        S, subs = _get_shared_clone(T)
+        C, D = T.compile(), S.compile()
+        n = len(C.nodes)
+        # (successors of possibility nodes may be numbered in another order):
+        order = [D.index[subs[v]] for v in C.nodes]
+        assert D.n_shared <= n
+        # shareable and non-shareable arguments:
+        choices = {v: [*v.consequences.values()][0] 
+                   for v in T.get_decision_nodes() if np.random.rand() < 0.5}
+        for maximize, fixed in [(None, {}), (np.ones(n, dtype=bool), {}),
+                                (np.random.rand(n) < 0.5, {}), (None, choices)]:
+            values = C.backward(maximize=maximize, fixed=C.get_fixed_edges(fixed))
+            shared_maximize = None
+            if maximize is not None:
+                shared_maximize = np.zeros(n, dtype=bool)
+                shared_maximize[order] = maximize
+            shared_values = D.backward(
+                maximize=shared_maximize, 
+                fixed=D.get_fixed_edges({subs[v]: subs[w] for v, w in fixed.items()}))
+            assert np.allclose(values[:n], shared_values[order])
+        for v in T.get_decision_nodes():
+            G, H = Group("G", players={v.player}), Group("H", players={subs[v.player]})
+            assert np.isclose(T.get_guaranteed_likelihood(group=G, node=v),
+                              S.get_guaranteed_likelihood(group=H, node=subs[v]))
+            for a in v.actions:
+                assert np.isclose(T.rho(group=G, node=v, action=a),
+                                  S.rho(group=H, node=subs[v], action=subs[a]))
@@ -0,0 +1,15 @@
+from responsibility import *
+
+"""
+Tests of the memoization of intermediate quantities (see context.py).
+"""
+
+def test_bounded_memo_gives_same_values():
+    from responsibility.problems.drsc_fig3 import T
+    ctx = EvaluationContext("ctx", tree=T, memo_size=5)
+    for v in T.get_decision_nodes():
+        G = Group("G", players={v.player})
+        for a in T.get_actions(v):
+            assert ctx.rho(group=G, node=v, action=a) == T.rho(group=G, node=v, action=a)
+            assert len(ctx.memo) <= 5
+        assert ctx.gamma(group=G, node=v) == T.gamma(group=G, node=v)
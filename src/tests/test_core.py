@@ -0,0 +1,38 @@
+import gc
+import weakref
+
+from responsibility import *
+from responsibility import core
+
+"""
+Tests of the mutation tracking that invalidates cached data (see core.py).
+"""
+
+def _get_tree(name):
+    """helper function"""
+    i = Player(name + "_i")
+    a, b = Action(name + "_a"), Action(name + "_b")
+    good, bad = Ou(name + "_good", ac=True), Ou(name + "_bad", ac=False)
+    return Tree(name, ro=DeN(name + "_v", pl=i, co={
+        a: OuN(name + "_w1", ou=good), 
+        b: DeN(name + "_v2", pl=i, co={a: OuN(name + "_w2", ou=bad), b: OuN(name + "_w3", ou=good)})}))
+
+def test_mutations_are_logged_per_tree():
+    T1, T2 = _get_tree("t1"), _get_tree("t2")
+    generation = core.mutation_generation
+    index2 = T2.tree_index
+    v2 = T1.named_nodes["t1_v2"]
+    v2.information_set.remove_action(T1.named_actions["t1_a"])
+    assert core.get_mutations(T1.root, generation) == [v2]
+    assert core.get_mutations(T2.root, generation) == []
+    assert T2.tree_index is index2
+    assert T1.named_nodes.get("t1_w2") is None
+
+def test_mutation_log_is_dropped_with_tree():
+    T = _get_tree("t3")
+    T.named_nodes["t3_v2"].information_set.remove_action(T.named_actions["t3_a"])
+    root = weakref.ref(T.root)
+    assert root() in core._mutation_logs
+    del T
+    gc.collect()
+    assert root() is None
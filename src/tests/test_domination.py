@@ -0,0 +1,86 @@
+from responsibility import *
+from responsibility.domination import is_strictly_dominated, trust_based_reduced_mask
+
+"""
+Regression tests for the trust-based reduced tree (see domination.py).
+"""
+
+def _get_fixpoint_mask(tree, information_set):
+    """helper function: the trust-based reduced tree as computed by removing
+    strictly dominated actions until no more change occurs"""
+    ins = information_set
+    T = tree.view_constrained(name="fixpoint", information_set=ins)
+    history = set(ins.choice_history)
+    change = True
+    while change:
+        change = False
+        for ins2 in list(T.get_information_sets()):
+            if ins2 == ins or len(T.get_information_set_nodes(ins2)) == 0:
+                continue
+            for a in [*T.get_actions(ins2)]:
+                if (ins2, a) not in history and is_strictly_dominated(a, ins2, tree=T):
+                    T.remove_action(ins2, a)
+                    change = True
+    return frozenset(T.tree_index.nodes)
+
+def test_reduced_tree_matches_fixpoint():
+    """in particular, information sets that lose nodes by a removal must be
+    checked again (as for seeds 134 and 290)"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in [*range(20), 134, 290]:
+        np.random.seed(seed)
+        T = random_tree(n_players=3, n_leafs=20)
+        for ins in T.get_information_sets():
+            assert trust_based_reduced_mask(T, ins) == _get_fixpoint_mask(T, ins), \
+                "seed %d, %s" % (seed, ins.name)
+
+def test_memoized_reduced_tree_is_read_only():
+    import pytest
+    from responsibility.domination import trust_based_reduced_tree
+    from responsibility.problems.drsc_fig3 import T
+    for ins in T.get_information_sets():
+        R = trust_based_reduced_tree(T, ins)
+        assert trust_based_reduced_tree(T, ins) is R
+        for ins2 in R.get_information_sets():
+            if len(R.get_information_set_nodes(ins2)) > 0 and len(R.get_actions(ins2)) > 1:
+                with pytest.raises(AssertionError):
+                    R.remove_action(ins2, [*R.get_actions(ins2)][0])
+        # a nested view can still be changed:
+        V = TreeView("view", tree=R)
+        assert not V.read_only
+
+def test_reduced_tree_subs_map_original_objects():
+    from responsibility.problems.drsc_fig3 import T
+    for ins in T.get_information_sets():
+        R = tbrt(T, ins)
+        assert R.subs[ins] is ins
+        for a in T.get_actions(ins):
+            assert R.subs[a] is a
+        # a clone of the view has its own objects:
+        C = R.clone()
+        assert C.subs[ins] is not ins and C.subs[ins].name == ins.name
+
+def test_domination_matrices_match_pairwise_comparisons():
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(10):
+        np.random.seed(seed)
+        T = random_tree(n_players=2, n_leafs=12)
+        for ins in T.get_information_sets():
+            actions, strict, weak, strength = domination_matrices(ins)
+            for k1, a1 in enumerate(actions):
+                for k2, a2 in enumerate(actions):
+                    if k1 == k2:
+                        assert not strict[k1, k2] and not weak[k1, k2]
+                        continue
+                    assert strict[k1, k2] == strictly_dominates(a1, a2, ins), \
+                        "seed %d, %s" % (seed, ins.name)
+                    assert weak[k1, k2] == weakly_dominates(a1, a2, ins), \
+                        "seed %d, %s" % (seed, ins.name)
+                    assert (strength[k1, k2] > 0) == weak[k1, k2]
+            # only comparing the others with one action gives that column:
+            for k, a in enumerate(actions):
+                _, strict2, weak2, _ = domination_matrices(ins, action=a)
+                assert (strict2[:, k] == strict[:, k]).all() and (weak2[:, k] == weak[:, k]).all()
+                assert not np.delete(strict2, k, axis=1).any() and not np.delete(weak2, k, axis=1).any()
@@ -0,0 +1,51 @@
+import random
+from fractions import Fraction
+
+from responsibility import *
+from responsibility.implicit import ImplicitTree
+from responsibility import induction as ind
+from responsibility.compiled import PROBABILITY
+
+"""
+Tests of the alpha-beta search on implicit trees (see implicit.py) against
+backward induction on the materialized tree.
+"""
+
+players = [Player("p%d" % q) for q in range(3)]
+acts = [Action("a"), Action("b"), Action("c")]
+ok, nok = Ou("ok", ac=True), Ou("nok", ac=False)
+
+def _get_random_tree(seed, maxsize, depth=6):
+    """helper function: an implicit random tree whose nodes are determined
+    by their key, so that they can be expanded again after eviction"""
+    def expand(key):
+        r = random.Random(hash((seed, key)))
+        if len(key) >= depth or (len(key) > 1 and r.random() < 0.15):
+            return ok if r.random() < 0.5 else nok
+        kind = r.choice(["decision", "decision", "probability", "possibility"])
+        if kind == "decision":
+            return ("decision", r.choice(players), None,
+                    {a: key + (a.name,) for a in acts[:r.randint(1, 3)]})
+        if kind == "probability":
+            weights = [Fraction(r.randint(1, 9)) for _ in range(r.randint(1, 3))]
+            return ("probability", {key + (q,): w / sum(weights) for q, w in enumerate(weights)})
+        return ("possibility", [key + (q,) for q in range(r.randint(1, 3))])
+    return ImplicitTree("implicit_%d" % seed, root=(), expand=expand, maxsize=maxsize)
+
+def test_search_with_eviction_matches_backward_induction():
+    evicted = False
+    for seed in range(20):
+        C = _get_random_tree(seed, None).to_tree().compile()
+        for maxsize in (None, 10):
+            I = _get_random_tree(seed, maxsize)
+            assert abs(I.get_guaranteed_likelihood() - ind.guaranteed_likelihoods(C)[0]) < 1e-12
+            assert abs(I.get_worst_case_likelihood()
+                       - C.backward(maximize=C.node_type != PROBABILITY)[0]) < 1e-12
+            for G in [Group("G", players={players[0]}), Group("G", players=set(players[:2]))]:
+                assert abs(I.get_worst_case_avoidance_likelihood(group=G)
+                           - ind.worst_case_avoidance_likelihoods(C, G)[0]) < 1e-12
+            if maxsize is not None:
+                assert len(I.nodes) <= maxsize and len(I.values) <= maxsize
+                # (evicted nodes are expanded again):
+                evicted = evicted or I.n_expansions > len(I.nodes)
+    assert evicted
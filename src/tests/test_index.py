@@ -0,0 +1,38 @@
+from responsibility import *
+
+"""
+Tests of the tree index (see index.py) against the nodes' own attributes.
+"""
+
+def _get_random_trees():
+    """helper function"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(5):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=15)
+
+def test_index_matches_node_paths():
+    for T in _get_random_trees():
+        index = T.tree_index
+        nodes = list(T.get_nodes())
+        assert len(index) == len(nodes) == len(set(nodes))
+        for v in nodes:
+            assert index.get_path(v) == v.path
+            assert index.get_depth(v) == len(v.path) - 1
+            assert index.get_parent(v) is v.predecessor
+            assert index.get_ancestor(v, 0) is T.root
+            assert set(index.get_branch_nodes(v)) == {w for w in nodes if v in w.path}
+            for w in nodes:
+                assert index.is_ancestor(v, w) == (v in w.path)
+        # postorder lists each node after all its successors:
+        position = {v: k for k, v in enumerate(T.get_nodes_postorder())}
+        assert all(position[w] < position[v] for v in T.get_inner_nodes() for w in v.successors)
+
+def test_branch_index_is_relative_to_branch():
+    for T in _get_random_trees():
+        for v in T.get_inner_nodes():
+            index = v.branch.tree_index
+            assert index.get_path(v) == [v]
+            for w in index.nodes:
+                assert index.get_path(w) == w.path[len(v.path) - 1:]
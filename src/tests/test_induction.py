@@ -0,0 +1,66 @@
+import time
+
+from responsibility import *
+from responsibility.rfs.prfs.aafra import r_risk, r_negl
+
+"""
+Regression tests for the backward-induction engine (see induction.py).
+"""
+
+def test_risk_is_fast_on_repeated_public_good():
+    """rho must not enumerate all information sets that are coupled somewhere
+    in the branch, of which the repeated public good game has very many"""
+    from responsibility.problems import repeated_public_good_2_of_3 as m
+    G = Group("", players={m.i})
+    m.T.compile()
+    for prf in (r_risk, r_negl):
+        start = time.time()
+        value = prf(tree=m.T, group=G, node=m.v, action=m.C)
+        assert time.time() - start < 1, prf.name + " is too slow"
+        assert value == (1 if prf is r_risk else 0)
+
+def test_risk_matches_scenario_enumeration():
+    """rho at nodes with coupled scenarios must equal the maximum of 
+    Delta_omega over all scenarios"""
+    from responsibility.problems import repeated_public_good_2_of_3 as m
+    for v in (m.v000, m.v111):
+        G = Group("", players={v.player})
+        for a in (m.C, m.D):
+            expected = max(m.T.Delta_omega(node=v, scenario=s, action=a)
+                           for s in m.T.get_scenarios(node=v, group=G))
+            assert abs(m.T.rho(group=G, node=v, action=a) - expected) < 1e-12
+
+def test_risk_matches_scenario_enumeration_on_random_trees():
+    """the same for random trees, also at decision nodes of players outside
+    the group, where scenarios only specify the branch after their choice"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(10):
+        np.random.seed(seed)
+        T = random_tree(n_players=2, n_leafs=12)
+        for v in T.get_decision_nodes():
+            for pl in T.players:
+                G = Group("", players={pl})
+                for a in v.actions:
+                    expected = max(T.Delta_omega(node=v, scenario=s, action=a)
+                                   for s in T.get_scenarios(node=v, group=G))
+                    assert abs(T.rho(group=G, node=v, action=a) - expected) < 1e-12
+
+def test_required_choices_are_reached():
+    """choices leading to a required fixed information set must be enumerated
+    rather than resolved optimally, since that might avoid it"""
+    i = Player("i")
+    safe, detour, a, b = (Action(n) for n in ("safe", "detour", "a", "b"))
+    good, bad = Outcome("good", ac=True), Outcome("bad", ac=False)
+    T = Tree("detour", ro=DeN("v", pl=i, co={
+        safe: OuN("good_end", ou=good),
+        detour: DeN("w", pl=i, co={
+            a: OuN("bad_a", ou=bad),
+            b: OuN("bad_b", ou=bad)
+        })
+    }))
+    v, w = T.named_nodes["v"], T.named_nodes["w"]
+    assert T.cooperatively_achievable_worst_case_likelihood(node=v) == 0
+    # only by taking the detour at v can i make the fixed choice at w:
+    assert T.cooperatively_achievable_worst_case_likelihood(
+        node=v, fixed_choices={w.information_set: a}) == 1
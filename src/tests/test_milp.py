@@ -0,0 +1,32 @@
+import pytest
+
+from responsibility import *
+
+"""
+Tests of the MILP backend (see milp.py) against strategy enumeration.
+"""
+
+pytest.importorskip("scipy")
+
+def _get_random_trees():
+    """helper function"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(10):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=12)
+
+def test_milp_matches_enumeration():
+    for T in _get_random_trees():
+        for v in T.get_decision_nodes():
+            for a in v.actions:
+                fixed_choices = {v.information_set: a}
+                expected = T.cooperatively_achievable_worst_case_likelihood(
+                    node=v, fixed_choices=fixed_choices)
+                value = T.cooperatively_achievable_worst_case_likelihood(
+                    node=v, fixed_choices=fixed_choices, solver="milp")
+                assert abs(value - expected) < 1e-9
+            for scenario in T.get_scenarios(node=v, group=Group("", players=T.players)):
+                expected = T.cooperatively_achievable_likelihood(node=v, env_scenario=scenario)
+                value = T.cooperatively_achievable_likelihood(node=v, env_scenario=scenario, solver="milp")
+                assert abs(value - expected) < 1e-9
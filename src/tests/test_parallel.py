@@ -0,0 +1,42 @@
+import multiprocessing as mp
+import numpy as np
+import pytest
+
+from responsibility import *
+from responsibility.rfs.prfs.aafra import r_like, r_risk, r_negl
+
+"""
+Tests of the parallel evaluation of responsibility functions (see parallel.py)
+against serial evaluation.
+"""
+
+# (the PRFs are defined by lambdas, so workers must inherit them):
+pytestmark = pytest.mark.skipif("fork" not in mp.get_all_start_methods(), 
+                                reason="needs the fork start method")
+
+def _get_random_trees():
+    """helper function"""
+    from responsibility.random import random_tree
+    for seed in range(3):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=10)
+
+def _get_keys(table):
+    """helper function: the rows, with groups identified by their players"""
+    return [(G.players, v, a) for G, v, a in table.rows]
+
+def test_evaluate_parallel_matches_evaluate():
+    prfs = [r_like, r_risk, r_negl]
+    for T in _get_random_trees():
+        expected = evaluate(T, prfs)
+        table = evaluate_parallel(T, prfs, max_workers=2, n_shards=3)
+        assert _get_keys(table) == _get_keys(expected)
+        assert np.array_equal(table.values, expected.values)
+
+def test_evaluate_trees_matches_evaluate():
+    prfs = [r_risk, r_negl]
+    trees = list(_get_random_trees())
+    for T, table in zip(trees, evaluate_trees(trees, prfs, max_workers=2)):
+        expected = evaluate(T, prfs)
+        assert _get_keys(table) == _get_keys(expected)
+        assert np.array_equal(table.values, expected.values)
@@ -0,0 +1,100 @@
+import itertools
+
+from responsibility import *
+from responsibility.repeated import RepeatedGame
+
+"""
+Tests of the compressed-state evaluation of repeated games (see repeated.py)
+against the object-level evaluation of the corresponding tree.
+"""
+
+def _get_games():
+    """helper function: a game with random transitions and three actions for
+    one player, and a public good game with probabilistic transitions"""
+    import random
+    random.seed(3)
+    i, j = Player("ri"), Player("rj")
+    D, C = Action("D"), Action("C")
+    ok, nok = Ou("ok", ac=True), Ou("nok", ac=False)
+    table = {}
+    def transition(state, profile):
+        if (state, profile) not in table:
+            table[state, profile] = random.randrange(3)
+        return table[state, profile]
+    yield RepeatedGame("rnd", players=[i, j], actions={i: [D, C], j: [D, C, Action("X")]},
+                       initial_state=0, transition=transition, n_rounds=2,
+                       outcome=lambda state: ok if state == 0 else nok)
+    yield RepeatedGame("prob", players=[i, j], actions=[D, C], initial_state=0, n_rounds=2,
+                       transition=lambda state, profile: ({state + profile.count(C): 0.7, state: 0.3}
+                                                          if C in profile else state),
+                       outcome=lambda state: ok if state >= 3 else nok)
+
+def _get_node_data(game, tree):
+    """helper function: dict of (round, state, profile) keyed by decision node"""
+    data = {}
+    def walk(v, t, state, profile):
+        if isinstance(v, DecisionNode):
+            data[v] = (t, state, profile)
+            for a, w in v.consequences.items():
+                if len(profile) + 1 < len(game.players):
+                    walk(w, t, state, profile + (a,))
+                else:
+                    successors = game._get_successors(state, profile + (a,))
+                    if isinstance(w, ProbabilityNode):
+                        # (successors are named by their position in successors):
+                        for u in w.successors:
+                            walk(u, t + 1, successors[int(u.name.split("_")[-1])][0], ())
+                    else:
+                        walk(w, t + 1, successors[0][0], ())
+    walk(tree.root, 0, game.initial_state, ())
+    return data
+
+def test_values_match_tree():
+    for R in _get_games():
+        T = R.to_tree()
+        data = _get_node_data(R, T)
+        def to_choices(scenario):
+            """the scenario's choices keyed by (round, state, player), or None
+            if it chooses differently at nodes with the same key"""
+            choices = {}
+            for ins, a in scenario.transitions.items():
+                t, state, _ = data[[*ins.nodes][0]]
+                key = (t, state, ins.player)
+                if choices.setdefault(key, a) != a:
+                    return None
+                choices[key] = a
+            return choices
+        groups = [Group("G", players=set(s)) for r in range(1, len(R.players) + 1)
+                  for s in itertools.combinations(R.players, r)]
+        for v, (t, state, profile) in data.items():
+            for G in groups:
+                # for players in G, the values are maximized over the information set:
+                p = None if v.player in G else profile
+                assert abs(T.gamma(group=G, node=v)
+                           - R.gamma(player=v.player, group=G, t=t, state=state, profile=p)) < 1e-12
+                for a in v.actions:
+                    assert abs(T.rho(group=G, node=v, action=a) - R.rho(
+                        group=G, player=v.player, action=a, t=t, state=state, profile=p)) < 1e-12
+                for scenario in itertools.islice(T.get_scenarios(node=v, group=G), 0, None, 20):
+                    choices = to_choices(scenario)
+                    if choices is None:
+                        continue
+                    w = scenario.current_node
+                    tw, sw, pw = data[w]
+                    assert abs(T.omega(node=w, scenario=scenario) - R.omega(
+                        player=w.player, t=tw, state=sw, profile=pw, scenario=choices)) < 1e-12
+                    for a in w.actions:
+                        assert abs(T.Delta_omega(node=w, scenario=scenario, action=a) - R.Delta_omega(
+                            player=w.player, t=tw, state=sw, profile=pw, scenario=choices,
+                            action=a)) < 1e-12
+            scenario = Scenario("", current_node=v, transitions={})
+            for a in [None, *v.actions]:
+                fixed_choices = {} if a is None else {v.information_set: a}
+                assert abs(T.cooperatively_achievable_likelihood(
+                    node=v, env_scenario=scenario, fixed_choices=fixed_choices)
+                    - R.cooperatively_achievable_likelihood(
+                        player=v.player, t=t, state=state, profile=profile, fixed_action=a)) < 1e-12
+                assert abs(T.cooperatively_achievable_worst_case_likelihood(
+                    node=v, fixed_choices=fixed_choices)
+                    - R.cooperatively_achievable_worst_case_likelihood(
+                        player=v.player, t=t, state=state, fixed_action=a)) < 1e-12
@@ -0,0 +1,104 @@
+import itertools
+
+from responsibility import *
+from responsibility.core import update_consistently
+
+"""
+Tests of the enumeration of strategies (see Branch.get_strategies) against
+filtering the cartesian product of the choices at all nodes.
+"""
+
+def _get_random_trees():
+    """helper function"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(8):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=12)
+
+def _get_choices(node, group, fixed_choices):
+    """helper function: all consistent partial strategies in node's branch"""
+    if isinstance(node, DecisionNode) and node.player in group:
+        ins = node.information_set
+        for action, successor in node.consequences.items():
+            if ins not in fixed_choices or fixed_choices[ins] == action:
+                for choices in _get_choices(successor, group, fixed_choices):
+                    choices[ins] = action
+                    yield choices
+    elif isinstance(node, InnerNode):
+        for combination in itertools.product(*(_get_choices(successor, group, fixed_choices)
+                                               for successor in node.successors)):
+            choices = {}
+            if all(update_consistently(choices, component) for component in combination):
+                yield choices
+    else:
+        yield {}
+
+def _get_filtered_product(node, group, fixed_choices):
+    """helper function: the strategies as enumerated before, i.e., by 
+    filtering the cartesian product of the partial strategies at all nodes of
+    node's information set for consistency"""
+    if isinstance(node, DecisionNode) and node.player in group:
+        ins = node.information_set
+        combinations = itertools.chain(*(itertools.product(*(
+                _get_choices(v, group, {**fixed_choices, ins: a})
+                for v in ins.nodes))
+            for a in ([fixed_choices[ins]] if ins in fixed_choices else ins.actions)))
+    else:
+        combinations = itertools.product(_get_choices(node, group, fixed_choices))
+    result = set()
+    for combination in combinations:
+        choices = {}
+        if all(update_consistently(choices, component) for component in combination):
+            result.add(frozenset(choices.items()))
+    return result
+
+def _get_cases():
+    """helper function: trees, nodes, groups, and fixed choices to test"""
+    for T in _get_random_trees():
+        groups = [Group("i", players={pl}) for pl in T.players] + [Group("all", players=T.players)]
+        for v in T.get_inner_nodes():
+            for G in groups:
+                yield T, v, G, {}
+                for ins in T.get_information_sets(G):
+                    for a in sorted(ins.actions, key=lambda a: a.name)[:1]:
+                        yield T, v, G, {ins: a}
+
+def test_strategies_match_filtered_product():
+    n = 0
+    for T, v, G, fixed_choices in _get_cases():
+        expected = _get_filtered_product(v, G, fixed_choices)
+        strategies = [frozenset(s.choices.items()) 
+                      for s in T.get_strategies(node=v, group=G, fixed_choices=fixed_choices)]
+        assert len(strategies) == len(set(strategies))
+        assert set(strategies) == expected
+        compact = [frozenset(s.transitions.items()) 
+                   for s in T.get_strategies(node=v, group=G, fixed_choices=fixed_choices, compact=True)]
+        assert set(compact) == expected and len(compact) == len(expected)
+        assert T.count_strategies(node=v, group=G, fixed_choices=fixed_choices) == len(expected)
+        n += len(expected)
+    assert n > 1000
+
+def test_constrained_strategies_match_post_filtering():
+    import random
+    rnd = random.Random(0)
+    n = 0
+    for T, v, G, unused in _get_cases():
+        strategies = [s.choices for s in T.get_strategies(node=v, group=G)]
+        inss = sorted(T.get_information_sets(G), key=lambda ins: ins.name)
+        for required in (False, True):
+            fixed = {ins: rnd.choice(sorted(ins.actions, key=lambda a: a.name)) 
+                     for ins in rnd.sample(inss, min(1, len(inss)))}
+            excluded = {ins: {rnd.choice(sorted(ins.actions, key=lambda a: a.name))}
+                        for ins in rnd.sample(inss, min(2, len(inss))) if ins not in fixed}
+            constraint = Constraint("c", fixed=fixed, excluded=excluded, required=required)
+            expected = {frozenset(choices.items()) for choices in strategies
+                        if all(choices.get(ins, a) == a and (ins in choices or not required)
+                               for ins, a in fixed.items())
+                        and all(choices.get(ins) not in acs for ins, acs in excluded.items())}
+            result = [frozenset(s.choices.items()) 
+                      for s in T.get_strategies(node=v, group=G, constraint=constraint)]
+            assert len(result) == len(set(result)) and set(result) == expected
+            assert T.count_strategies(node=v, group=G, constraint=constraint) == len(expected)
+            n += len(expected)
+    assert n > 100
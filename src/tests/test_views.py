@@ -0,0 +1,50 @@
+import pytest
+
+from responsibility import *
+
+"""
+Tests of TreeView (see views.py) against the clones it replaces.
+"""
+
+def _get_random_trees():
+    """helper function"""
+    import numpy as np
+    from responsibility.random import random_tree
+    for seed in range(10):
+        np.random.seed(seed)
+        yield random_tree(n_players=2, n_leafs=12)
+
+def test_repr_does_not_clone(monkeypatch):
+    def clone(self, **kwargs):
+        raise AssertionError("clone() called")
+    for T in _get_random_trees():
+        # an unconstrained view shows exactly the tree:
+        assert repr(TreeView(T.name, tree=T)) == repr(T)
+        for ins in T.get_information_sets():
+            V = T.view_constrained(information_set=ins)
+            shown = [Node.__repr__(v) for v in V.get_nodes()]
+            with monkeypatch.context() as m:
+                m.setattr(TreeView, "clone", clone)
+                lines = repr(V).split("\n")[1:]
+            assert sorted(line.split("╴")[-1].split(" ")[0].rstrip(":") for line in lines) == sorted(shown)
+
+def test_values_match_clone():
+    for T in _get_random_trees():
+        for ins in T.get_information_sets():
+            V = T.view_constrained(information_set=ins)
+            C = T.clone_constrained(information_set=ins)
+            s = C.subs
+            assert len(V.tree_index) == len(C.tree_index)
+            for v in V.get_decision_nodes():
+                G, H = Group("G", players={v.player}), Group("H", players={s[v.player]})
+                assert V.gamma(group=G, node=v) == C.gamma(group=H, node=s[v])
+                for a in V.get_actions(v):
+                    assert V.rho(group=G, node=v, action=a) == C.rho(group=H, node=s[v], action=s[a])
+                    assert V.cooperatively_achievable_worst_case_likelihood(
+                        node=v, fixed_choices={v.information_set: a}) == \
+                        C.cooperatively_achievable_worst_case_likelihood(
+                            node=s[v], fixed_choices={s[v.information_set]: s[a]})
+                for scenario in V.get_scenarios(node=v, group=G):
+                    clone_scenario = Scenario("", current_node=s[scenario.current_node], transitions={
+                        s[x]: s[y] for x, y in scenario.transitions.items()})
+                    assert V.omega(node=v, scenario=scenario) == C.omega(node=s[v], scenario=clone_scenario)